@@ -0,0 +1,110 @@
+from array import array
+
+
+def check_weights(weights):
+    if not len(weights) or sum(weights) <= 0 or min(weights) < 0:
+        raise ValueError("weights need at least one segment, no negative value and a positive sum")
+
+
+class AliasTable:
+    """Walker's alias table: O(n) to build, O(1) per weighted draw.
+
+    Each of the n columns holds its own segment with probability prob[i]
+    and its alias otherwise, so one uniform number picks a column and
+    decides between the two. With equal weights every prob is 1 and a draw
+    is exactly int(u * n), like the unweighted wheel.
+    """
+
+    def __init__(self, weights):
+        check_weights(weights)
+        n = len(weights)
+        total = sum(weights)
+
+        self.size = n
+        self.prob = array("d", [1.0]) * n
+        self.alias = array("l", range(n))
+
+        # Vose's variant: pair columns below the average with those above it
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        prob = self.prob
+        alias = self.alias
+        while small and large:
+            s = small.pop()
+            l = large[-1]
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+            if scaled[l] < 1:
+                small.append(large.pop())
+        # Whatever is left is 1 up to rounding error
+        for i in small + large:
+            prob[i] = 1.0
+            alias[i] = i
+
+    def pick(self, u):
+        """Segment for a uniform number u in [0, 1)."""
+        u *= self.size
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def sample(self, rng):
+        return self.pick(rng.random())
+
+
+class SegmentWeights:
+    """Prize weights of the wheel's segments, changeable between spins.
+
+    The alias table and the arc extents are rebuilt lazily, on the first
+    draw or layout after a change, so any number of updates between two
+    spins costs one O(n) rebuild.
+    """
+
+    def __init__(self, weights):
+        check_weights(weights)
+        self.weights = array("d", weights)
+        self.version = 0  # Bumped on every change
+        self._table = None
+        self._extents = None
+
+    def __len__(self):
+        return len(self.weights)
+
+    def set(self, segment, weight):
+        if weight < 0:
+            raise ValueError(f"negative weight {weight} for segment {segment}")
+        if self.weights[segment] != weight:
+            self.weights[segment] = weight
+            self.changed()
+
+    def update(self, weights):
+        """Set several weights at once from a {segment: weight} mapping.
+
+        Nothing changes if the result would not be valid weights (a zero sum
+        has no arc extents and no draw).
+        """
+        merged = array("d", self.weights)
+        for segment, weight in weights.items():
+            merged[segment] = weight
+        check_weights(merged)
+        for segment, weight in weights.items():
+            self.set(segment, weight)
+
+    def changed(self):
+        self.version += 1
+        self._table = None
+        self._extents = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = AliasTable(self.weights)
+        return self._table
+
+    def extents(self):
+        """Arc extent in degrees of every segment, proportional to its weight."""
+        if self._extents is None:
+            total = sum(self.weights)
+            self._extents = tuple(360 * w / total for w in self.weights)
+        return self._extents
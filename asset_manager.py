@@ -0,0 +1,159 @@
+import os
+import queue
+import threading
+import time
+import traceback
+
+
+def asset_path(base_dir, name):
+    """Absolute path of name relative to base_dir, whichever separator name uses.
+
+    Configs written on Windows say "assets\\logo.png"; backslashes are read
+    as separators too, so the same config works on Linux.
+    """
+    return os.path.normpath(os.path.join(base_dir, name.replace("\\", "/")))
+
+
+class AssetManager:
+    """Loads images on first use and keeps them for the whole run.
+
+    Image files are decoded once and resized once per requested size; the
+    Tk photo images are made on the Tk thread. With background=True the
+    decoding is done by a worker thread, so the first screen shows without
+    waiting for it: request_image() hands the photo to a callback once it
+    is ready. Sounds are loaded by the audio engine (see audio.py).
+    """
+
+    def __init__(self, master=None, background=True, poll_ms=15):
+        self.master = master
+        self.background = background
+        self.poll_ms = poll_ms
+
+        self.lock = threading.Lock()  # Guards the image caches against the worker
+        self.sources = {}  # Path -> decoded PIL image
+        self.variants = {}  # (path, size) -> resized PIL image
+        self.photos = {}  # (path, size) -> Tk photo image
+        self.load_times = {}  # Asset -> seconds spent loading it
+
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.decoded = queue.Queue()  # (key, error) of images ready for the Tk thread
+        self.waiting = {}  # (path, size) -> callbacks waiting for that photo
+        self.poll_job = None
+
+    def submit(self, job, *args):
+        if not self.background:
+            job(*args)
+            return
+        self.jobs.put((job, args))
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.work, name="assets", daemon=True)
+            self.thread.start()
+
+    def work(self):
+        while True:
+            job, args = self.jobs.get()
+            try:
+                job(*args)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self.jobs.task_done()
+
+    def wait(self):
+        """Block until every background load is done (for benchmarks)."""
+        if self.thread is not None:
+            self.jobs.join()
+
+    def resized(self, path, size=None):
+        """PIL image of path scaled to size (an int for a square, (width, height), or None)."""
+        key = (path, size)
+        with self.lock:
+            image = self.variants.get(key)
+            if image is None:
+                started = time.perf_counter()
+                source = self.sources.get(path)
+                if source is None:
+                    from PIL import Image  # Only imported once an image is needed
+
+                    source = Image.open(path)
+                    source.load()
+                    self.sources[path] = source
+                image = source
+                if size is not None:
+                    image = source.resize((size, size) if isinstance(size, int) else tuple(size))
+                self.variants[key] = image
+                self.load_times[f"{os.path.basename(path)}@{size}"] = time.perf_counter() - started
+        return image
+
+    def image(self, path, size=None):
+        """Tk photo image of path at size, made on first use; call from the Tk thread."""
+        key = (path, size)
+        photo = self.photos.get(key)
+        if photo is None:
+            from PIL import ImageTk
+
+            photo = self.photos[key] = ImageTk.PhotoImage(self.resized(path, size), master=self.master)
+        return photo
+
+    def request_image(self, path, size, callback):
+        """Call callback(photo) on the Tk thread once the image at path and size is ready.
+
+        A cached image is handed over right away; otherwise it is decoded on
+        the worker and picked up by polling with after(). An image that
+        cannot be read is reported and the callback is never called.
+        """
+        key = (path, size)
+        if key in self.photos or not self.background or self.master is None:
+            try:
+                photo = self.image(path, size)
+            except (OSError, ValueError, ImportError) as e:
+                print(f"image not loaded: {e}")
+                return
+            callback(photo)
+            return
+
+        callbacks = self.waiting.setdefault(key, [])
+        callbacks.append(callback)
+        if len(callbacks) == 1:
+            self.submit(self.decode, key)
+        if self.poll_job is None:
+            self.poll_job = self.master.after(self.poll_ms, self.poll)
+
+    def decode(self, key):
+        try:
+            self.resized(*key)
+        except (OSError, ValueError, ImportError) as e:  # Missing or broken file, or no PIL
+            self.decoded.put((key, e))
+            return
+        self.decoded.put((key, None))
+
+    def poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                key, error = self.decoded.get_nowait()
+            except queue.Empty:
+                break
+            callbacks = self.waiting.pop(key, ())
+            if error is not None:
+                print(f"image not loaded: {error}")
+                continue
+            photo = self.image(*key)
+            for callback in callbacks:
+                callback(photo)
+        if self.waiting:
+            self.poll_job = self.master.after(self.poll_ms, self.poll)
+
+    def cancel(self):
+        if self.poll_job is not None:
+            self.master.after_cancel(self.poll_job)
+            self.poll_job = None
+
+    def stats(self):
+        return {
+            "images": len(self.sources),
+            "variants": len(self.variants),
+            "photos": len(self.photos),
+            "load_ms": {name: round(seconds * 1000, 2) for name, seconds in self.load_times.items()},
+        }
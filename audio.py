@@ -0,0 +1,281 @@
+import math
+import os
+import queue
+import threading
+import time
+import traceback
+import wave
+from array import array
+from collections import deque, namedtuple
+
+# Playback speeds of the tick: faster is higher and shorter, so dense ticks overlap less
+PITCHES = (1.0, 1.19, 1.41, 1.68)
+
+# Spin ticks in seconds since the spin started, the PITCHES index of each,
+# and how many animation steps were merged into the ticks before them
+TickTimeline = namedtuple("TickTimeline", ["times", "pitches", "coalesced"])
+
+
+def tick_timeline(step_times, sample_seconds, min_gap=0.035, pitches=PITCHES):
+    """Ticks for the animation steps at step_times.
+
+    A step less than min_gap after the last tick is merged into it. Each
+    tick is played at the lowest pitch that lets it end before the next
+    one, or at the highest if none does.
+    """
+    times = []
+    for t in step_times:
+        if not times or t - times[-1] >= min_gap:
+            times.append(t)
+
+    levels = []
+    for i, t in enumerate(times):
+        gap = times[i + 1] - t if i + 1 < len(times) else math.inf
+        level = 0
+        while level + 1 < len(pitches) and sample_seconds / pitches[level] > gap:
+            level += 1
+        levels.append(level)
+    return TickTimeline(tuple(times), tuple(levels), len(step_times) - len(times))
+
+
+def resample(samples, channels, pitch):
+    """Interleaved samples played pitch times faster (nearest-neighbour, same typecode)."""
+    frames = len(samples) // channels
+    out_frames = int(frames / pitch)
+    out = array(samples.typecode, bytes(out_frames * channels * samples.itemsize))
+    for c in range(channels):
+        out[c::channels] = array(samples.typecode, [samples[int(i * pitch) * channels + c] for i in range(out_frames)])
+    return out
+
+
+def wav_seconds(path):
+    try:
+        with wave.open(path) as f:
+            return f.getnframes() / f.getframerate()
+    except (OSError, EOFError, wave.Error):
+        return 0.0
+
+
+class NullBackend:
+    """Plays nothing and remembers what it would have played.
+
+    Used headless, in benchmarks and wherever pygame or an audio device is
+    missing. plays holds (perf_counter time, pitch level, channel).
+    """
+
+    def __init__(self, channels=4, history=4096):
+        self.channels = channels
+        self.plays = deque(maxlen=history)
+
+    def load(self, path, pitches):
+        """Seconds the tick at path lasts at normal pitch."""
+        return wav_seconds(path)
+
+    def play(self, level, channel):
+        self.plays.append((time.perf_counter(), level, channel))
+
+    def stop(self):
+        pass
+
+
+class PygameBackend:
+    """pygame mixer with a small buffer and a fixed pool of reserved channels.
+
+    The tick is decoded once into memory, with one pre-resampled Sound per
+    pitch. Ticks go round robin over the reserved channels, so a new tick
+    replaces the oldest one still ringing instead of taking another channel.
+    """
+
+    def __init__(self, mixer, channels=4):
+        self.mixer = mixer
+        self.channels = channels
+        mixer.set_num_channels(max(mixer.get_num_channels(), channels))
+        mixer.set_reserved(channels)  # Other sounds never take these
+        self.pool = [mixer.Channel(i) for i in range(channels)]
+        self.variants = ()
+
+    def load(self, path, pitches):
+        sound = self.mixer.Sound(path)
+        _, size, channels = self.mixer.get_init()
+        variants = [sound]
+        if size == -16:  # Resampling only handles the usual signed 16-bit format
+            samples = array("h", sound.get_raw())
+            for pitch in pitches[1:]:
+                variants.append(self.mixer.Sound(buffer=resample(samples, channels, pitch).tobytes()))
+        self.variants = tuple(variants)
+        return sound.get_length()
+
+    def play(self, level, channel):
+        variants = self.variants
+        if variants:
+            self.pool[channel].play(variants[min(level, len(variants) - 1)])
+
+    def stop(self):
+        for channel in self.pool:
+            channel.stop()
+
+
+def open_backend(channels=4, buffer=256):
+    """pygame backend if pygame and an audio device are there, NullBackend otherwise."""
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    try:
+        import pygame
+
+        # A small buffer keeps the tick close to the frame it belongs to
+        pygame.mixer.pre_init(44100, -16, 2, buffer)
+        pygame.mixer.init()
+    except (ImportError, RuntimeError) as e:  # pygame.error is a RuntimeError
+        print(f"sound disabled: {e}")
+        return NullBackend(channels)
+    return PygameBackend(pygame.mixer, channels)
+
+
+class AudioEngine:
+    """Plays the ticks of a spin from a thread of its own.
+
+    The Tk thread hands over the whole spin plan once, with the time the
+    animation started; the audio thread turns it into a tick timeline
+    (steps closer than min_gap are coalesced, dense ticks are pitched up),
+    then sleeps until each tick is due and plays it on the next reserved
+    channel. A tick more than max_late behind is dropped rather than played
+    out of step with the wheel. Nothing is played from the frame loop, so
+    audio can neither block nor delay a frame. Spins started under
+    different keys (one per station) tick concurrently on the same channels.
+
+    The backend (pygame, or NullBackend without audio) is opened and the
+    tick decoded on the audio thread, off the startup path.
+    """
+
+    def __init__(self, backend=None, channels=4, buffer=256, min_gap=0.035, max_late=0.03, pitches=PITCHES):
+        self.backend = backend
+        self.channels = channels
+        self.buffer = buffer
+        self.min_gap = min_gap
+        self.max_late = max_late
+        self.pitches = pitches
+
+        self.sample_seconds = None  # Length of the loaded tick, None while there is none
+        self.sample_path = None
+        self.timelines = {}  # (segments, rounds, winner) -> TickTimeline
+        self.commands = queue.Queue()
+        self.thread = None
+        self.channel = 0
+
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.lateness = deque(maxlen=1024)  # Seconds each played tick came after its time
+
+    def send(self, *command):
+        self.commands.put(command)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="audio", daemon=True)
+            self.thread.start()
+
+    def load(self, path):
+        """Decode the tick sound at path (and its pitched variants) on the audio thread."""
+        self.send("load", path)
+
+    def spin(self, plan, started, key=None):
+        """Tick along plan, whose animation started at perf_counter time started.
+
+        A new spin replaces the running one of the same key only.
+        """
+        self.send("spin", plan, started, key)
+
+    def cancel(self, key=None):
+        """Stop the spin of key, or every spin and sound if key is None."""
+        self.send("cancel", key)
+
+    def wait(self):
+        """Block until the audio thread has handled every command sent so far."""
+        if self.thread is not None:
+            self.commands.join()
+
+    def close(self):
+        if self.thread is not None:
+            self.send("close")
+            self.thread.join(1)
+
+    def timeline(self, plan):
+        key = (plan.segments, plan.rounds, plan.winner)
+        timeline = self.timelines.get(key)
+        if timeline is None:
+            # The resting frame has no tick, it is the wheel stopping
+            timeline = tick_timeline(plan.times[:-1], self.sample_seconds, self.min_gap, self.pitches)
+            if len(self.timelines) >= 128:
+                self.timelines.clear()
+            self.timelines[key] = timeline
+        return timeline
+
+    def run(self):
+        if self.backend is None:
+            self.backend = open_backend(self.channels, self.buffer)
+        spins = {}  # Key -> deque of (due perf_counter time, pitch level) of its running spin
+        perf_counter = time.perf_counter
+
+        while True:
+            timeout = max(0.0, min(pending[0][0] for pending in spins.values()) - perf_counter()) if spins else None
+            try:
+                command = self.commands.get(timeout=timeout)
+            except queue.Empty:
+                command = None
+
+            if command is not None:
+                try:
+                    kind = command[0]
+                    if kind == "close":
+                        self.backend.stop()
+                        return
+                    elif kind == "load":
+                        self.load_tick(command[1])
+                    elif kind == "cancel":
+                        if command[1] is None:
+                            spins.clear()
+                            self.backend.stop()
+                        else:
+                            spins.pop(command[1], None)
+                    elif kind == "spin" and self.sample_seconds is not None:
+                        _, plan, started, key = command
+                        timeline = self.timeline(plan)
+                        spins[key] = deque(zip((started + t for t in timeline.times), timeline.pitches))
+                        self.coalesced += timeline.coalesced
+                except Exception:
+                    traceback.print_exc()
+                finally:
+                    self.commands.task_done()
+
+            now = perf_counter()
+            for key, pending in list(spins.items()):
+                while pending and pending[0][0] <= now:
+                    due, level = pending.popleft()
+                    if now - due > self.max_late:
+                        self.dropped += 1
+                        continue
+                    self.backend.play(level, self.channel)
+                    self.channel = (self.channel + 1) % self.channels
+                    self.played += 1
+                    self.lateness.append(now - due)
+                if not pending:
+                    del spins[key]
+
+    def load_tick(self, path):
+        if path == self.sample_path and self.sample_seconds is not None:
+            return  # Every station asks for it, it is decoded once
+        self.timelines.clear()
+        self.sample_path = path
+        try:
+            self.sample_seconds = self.backend.load(path, self.pitches)
+        except (OSError, RuntimeError) as e:  # pygame.error is a RuntimeError
+            print(f"sound not loaded: {e}")
+            self.sample_seconds = None
+
+    def stats(self):
+        lateness = sorted(self.lateness)
+        return {
+            "played": self.played,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "late_p50_ms": round(lateness[len(lateness) // 2] * 1000, 2) if lateness else None,
+            "late_max_ms": round(lateness[-1] * 1000, 2) if lateness else None,
+        }
@@ -0,0 +1,193 @@
+"""Vectorized winner draws for fairness audits and Monte Carlo runs.
+
+Applies the wheel's selection rules (presets by round index, then random
+segments, optionally weighted) to N spins at once with NumPy's Generator,
+streaming the winners in fixed-size chunks so memory stays bounded.
+
+    python batch_draw.py 100000000 --segments 20
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+
+class BatchDrawer:
+    """Draws the winners of many spins in one call.
+
+    presets maps a round index (counted from the first draw) to a forced
+    0-based segment; a sequence is taken as presets for rounds 0, 1, ...
+    """
+
+    def __init__(self, segments, weights=None, presets=None, seed=None):
+        self.segments = segments
+        self.probabilities = None
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != (segments,) or (weights < 0).any() or weights.sum() <= 0:
+                raise ValueError("weights need one non-negative value per segment and a positive sum")
+            self.probabilities = weights / weights.sum()
+
+        if presets is None:
+            presets = {}
+        elif not isinstance(presets, dict):
+            presets = dict(enumerate(presets))
+        self.presets = presets
+        self.generator = np.random.default_rng(seed)
+        self.drawn = 0  # Rounds drawn so far; preset indexes are relative to this
+
+    @classmethod
+    def from_engine(cls, engine, weights=None, seed=None):
+        """Drawer continuing from a WheelEngine's play count and wheel presets.
+
+        Only engines that draw with replacement can be continued; with
+        remove_winners every spin depends on the ones before it.
+        """
+        if engine.wrap_presets:
+            raise ValueError("an engine with wrap_presets never draws at random")
+        if engine.segment_pool is not None:
+            # Independent draws would not match a wheel whose winners leave the pool
+            raise ValueError("an engine that removes winners draws without replacement")
+        presets = {
+            index - engine.play_count: max(0, preset)
+            for index, preset in enumerate(engine.wheel_presets)
+            if index >= engine.play_count and preset is not None  # None: a random round left by push_presets
+        }
+        if weights is None and engine.weights is not None:
+            weights = engine.weights.weights
+        return cls(engine.segments, weights, presets, seed)
+
+    def draw(self, n):
+        """Winners of the next n spins as one array."""
+        return np.concatenate(list(self.stream(n, chunk_size=max(n, 1)))) if n else np.empty(0, np.int64)
+
+    def stream(self, n, chunk_size=1_000_000):
+        """Yield the winners of the next n spins in arrays of at most chunk_size."""
+        while n > 0:
+            size = min(n, chunk_size)
+            yield self.draw_chunk(size)
+            n -= size
+
+    def draw_chunk(self, size):
+        if self.probabilities is None:
+            winners = self.generator.integers(0, self.segments, size=size)
+        else:
+            winners = self.generator.choice(self.segments, size=size, p=self.probabilities)
+
+        start = self.drawn
+        for index, segment in self.presets.items():
+            if start <= index < start + size:
+                winners[index - start] = segment
+        self.drawn += size
+        return winners
+
+    def audit(self, n, chunk_size=1_000_000):
+        """Per-segment counts of n random draws, streamed; preset rounds are left out."""
+        counts = np.zeros(self.segments, dtype=np.int64)
+        presets = 0
+        for chunk in self.stream(n, chunk_size):
+            start = self.drawn - len(chunk)
+            forced = [index - start for index in self.presets if start <= index < start + len(chunk)]
+            if forced:
+                presets += len(forced)
+                chunk = np.delete(chunk, forced)
+            counts += np.bincount(chunk, minlength=self.segments)
+        return counts, presets
+
+    def expected_probabilities(self):
+        if self.probabilities is None:
+            return np.full(self.segments, 1 / self.segments)
+        return self.probabilities
+
+
+def chi_square_report(counts, probabilities):
+    """Chi-square goodness of fit of counts against the expected probabilities."""
+    counts = np.asarray(counts, dtype=np.float64)
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    total = counts.sum()
+
+    # Segments that can never win are left out of the test
+    possible = probabilities > 0
+    expected = total * probabilities[possible]
+    observed = counts[possible]
+    statistic = float(((observed - expected) ** 2 / expected).sum()) if total else 0.0
+    dof = int(possible.sum()) - 1
+
+    deviation = np.zeros_like(counts)
+    deviation[possible] = (observed - expected) / np.maximum(expected, 1)
+    return {
+        "draws": int(total),
+        "segments": len(counts),
+        "chi_square": statistic,
+        "dof": dof,
+        "p_value": chi_square_sf(statistic, dof) if dof > 0 else 1.0,
+        "max_relative_deviation": float(np.abs(deviation).max()) if len(counts) else 0.0,
+        "impossible_hits": int(counts[~possible].sum()),
+    }
+
+
+def chi_square_sf(statistic, dof):
+    """P(X >= statistic) for a chi-square distribution with dof degrees of freedom."""
+    return upper_gamma_q(dof / 2, statistic / 2)
+
+
+def upper_gamma_q(a, x):
+    """Regularized upper incomplete gamma function Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        # Series for P(a, x), then Q = 1 - P
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_prefix))
+
+    # Continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, h * math.exp(log_prefix))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fairness audit of the wheel's random draws")
+    parser.add_argument("draws", type=int)
+    parser.add_argument("--segments", type=int, default=20)
+    parser.add_argument("--weights", type=float, nargs="*", help="one weight per segment")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    drawer = BatchDrawer(args.segments, args.weights, seed=args.seed)
+    started = time.perf_counter()
+    counts, _ = drawer.audit(args.draws, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    report = chi_square_report(counts, drawer.expected_probabilities())
+    for key, value in report.items():
+        print(f"{key:>24}: {value}")
+    print(f"{'draws_per_second':>24}: {args.draws / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Weighted segment draws: random.choices vs the alias table.
+
+Also times the lazy rebuild after a weight change, the cost paid by the
+first spin after stock runs out on a segment.
+
+Run from the repository root:
+
+    python benchmarks/alias_bench.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alias_table import SegmentWeights
+
+
+def main():
+    rng = random.Random(1)
+    draws = 100_000
+    for segments in (20, 1_000, 10_000):
+        weights = [rng.randint(1, 100) for _ in range(segments)]
+        table = SegmentWeights(weights).table
+        population = range(segments)
+
+        choices = timeit.timeit(lambda: rng.choices(population, weights), number=draws // 10) * 10
+        alias = timeit.timeit(lambda: table.sample(rng), number=draws)
+
+        changing = SegmentWeights(weights)
+
+        def update_and_draw():
+            changing.set(rng.randrange(segments), rng.randint(0, 100))
+            changing.table.sample(rng)
+
+        rebuild = timeit.timeit(update_and_draw, number=100) / 100
+
+        print(f"{segments:>6} segments: choices {choices / draws * 1e6:8.2f} us/draw, "
+              f"alias {alias / draws * 1e6:6.3f} us/draw, "
+              f"update + rebuild + draw {rebuild * 1e3:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Spin ticks: one play() per animation step vs the audio engine's timeline.
+
+For wheels of a few sizes this counts the sounds a spin starts and the
+most that ring at once (the old way played one per drawn frame, at most
+60 a second, and each needs a mixer channel of its own), then plays one
+spin through AudioEngine with the NullBackend in real time and reports
+how late the ticks came.
+
+Run from the repository root:
+
+    python benchmarks/audio_bench.py
+"""
+import bisect
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio import PITCHES, AudioEngine, NullBackend, tick_timeline, wav_seconds
+from spin_plan import plan_spin
+
+SOUND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "spin_sound.wav")
+
+
+def most_at_once(starts, lengths):
+    """Largest number of sounds playing at the same moment."""
+    ends = []
+    most = 0
+    for start, length in zip(starts, lengths):
+        ends = ends[bisect.bisect_right(ends, start):]
+        bisect.insort(ends, start + length)
+        most = max(most, len(ends))
+    return most
+
+
+def main():
+    sample = wav_seconds(SOUND) or 0.257
+    print(f"tick sample: {sample * 1000:.0f} ms")
+    print(f"{'segments':>8} {'steps':>6} {'old plays':>10} {'old at once':>12} {'ticks':>6} {'new at once':>12}")
+    for segments in (20, 200, 2000):
+        plan = plan_spin(segments, 5, segments // 3)
+        steps = plan.times[:-1]
+        old = tick_timeline(steps, sample, min_gap=1 / 60).times  # Drawn frames of a 60 Hz loop
+        timeline = tick_timeline(steps, sample)
+        lengths = [sample / PITCHES[level] for level in timeline.pitches]
+        print(f"{segments:>8} {len(steps):>6} {len(old):>10} {most_at_once(old, [sample] * len(old)):>12} "
+              f"{len(timeline.times):>6} {most_at_once(timeline.times, lengths):>12}")
+    print("(the new ticks are also capped by the reserved channels, 4 by default)")
+
+    backend = NullBackend()
+    audio = AudioEngine(backend)
+    audio.load(SOUND)
+    audio.wait()
+    plan = plan_spin(20, 5, 7)
+    audio.spin(plan, time.perf_counter())
+    time.sleep(plan.duration + 0.1)
+    audio.wait()
+    print(f"real-time spin of {plan.duration:.2f} s on the audio thread: {audio.stats()}")
+    audio.close()
+
+
+if __name__ == "__main__":
+    main()
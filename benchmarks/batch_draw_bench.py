@@ -0,0 +1,47 @@
+"""Winner draws per second: WheelEngine.simulate vs BatchDrawer (NumPy).
+
+Both draw the same number of wheel-only rounds on a 20-segment wheel; the
+batch path also runs the streamed fairness audit.
+
+Run from the repository root:
+
+    python benchmarks/batch_draw_bench.py [draws]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_draw import BatchDrawer, chi_square_report
+from engine import WheelEngine
+
+
+def rate(draws, run):
+    started = time.perf_counter()
+    run()
+    return draws / (time.perf_counter() - started)
+
+
+def main():
+    draws = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    segments = 20
+
+    scalar = rate(draws, lambda: WheelEngine(segments, seed=1).simulate(draws))
+    batch = rate(draws, lambda: BatchDrawer(segments, seed=1).draw(draws))
+    weighted = rate(draws, lambda: BatchDrawer(segments, weights=range(1, segments + 1), seed=1).draw(draws))
+
+    drawer = BatchDrawer(segments, seed=1)
+    audited = rate(draws, lambda: drawer.audit(draws))
+    report = chi_square_report(drawer.audit(draws)[0], drawer.expected_probabilities())
+
+    print(f"{draws:,} draws, {segments} segments")
+    print(f"  engine.simulate    {scalar:>16,.0f} draws/s")
+    print(f"  batch uniform      {batch:>16,.0f} draws/s  ({batch / scalar:.1f}x)")
+    print(f"  batch weighted     {weighted:>16,.0f} draws/s")
+    print(f"  streamed audit     {audited:>16,.0f} draws/s")
+    print(f"  chi-square {report['chi_square']:.2f} (dof {report['dof']}), p = {report['p_value']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Cold start: time from process launch to the first frame of the app.
+
+Each run starts a fresh interpreter that builds the app, draws the first
+screen and prints a line; the time until that line arrives is the cold
+start. The same child then waits for the background assets (logo, and
+pygame with the tick sound) and reports when they were ready. A bare interpreter and a bare Tk
+window are timed too, as the floor no app code can go below.
+
+With --imports the slowest imports of one run are listed (python -X importtime).
+
+Needs a display. Run from the repository root:
+
+    python benchmarks/cold_start.py [config] [--runs 10] [--imports]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Target on the kiosk hardware, launch to first frame
+TARGET_MS = 150
+
+APP = """
+import sys, time
+sys.path.insert(0, {root!r})
+import tkinter as tk
+from main import LuckyWheelApp
+from wheel_config import load_plan
+root = tk.Tk()
+# No journal, so measuring leaves no draws behind
+app = LuckyWheelApp(root, load_plan({config!r})._replace(journal=None))
+root.update()
+print("first-frame", flush=True)
+started = time.perf_counter()
+app.assets.wait()
+app.audio.wait()
+root.update()
+print("assets-ready %.3f" % ((time.perf_counter() - started) * 1000), flush=True)
+print(app.assets.stats(), flush=True)
+app.close()
+root.destroy()
+"""
+
+BARE_TK = """
+import tkinter as tk
+root = tk.Tk()
+root.update()
+print("first-frame", flush=True)
+root.destroy()
+"""
+
+
+def launch(code, extra_args=()):
+    """Milliseconds until the child printed first-frame, and the rest of its output."""
+    started = time.perf_counter()
+    child = subprocess.Popen([sys.executable, *extra_args, "-c", code], cwd=ROOT,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    first_frame = None
+    lines = []
+    for line in child.stdout:
+        if line.startswith("first-frame") and first_frame is None:
+            first_frame = (time.perf_counter() - started) * 1000
+        else:
+            lines.append(line.rstrip())
+    stderr = child.stderr.read()
+    if child.wait() != 0 or first_frame is None:
+        raise RuntimeError(f"child failed:\n{stderr}")
+    return first_frame, lines, stderr
+
+
+def summary(times):
+    return f"median {statistics.median(times):7.1f} ms   min {min(times):7.1f} ms   max {max(times):7.1f} ms"
+
+
+def slowest_imports(stderr, count=12):
+    rows = []
+    for line in stderr.splitlines():
+        # "import time:  self_us | cumulative_us | module", after one header line
+        fields = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        self_us, cumulative_us, name = fields
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("config", nargs="?", default=os.path.join(ROOT, "wheel.json"))
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--imports", action="store_true", help="list the slowest imports of one run")
+    args = parser.parse_args()
+    config = os.path.abspath(args.config)
+
+    # The first launches warm the OS file cache; they are not counted
+    launch(APP.format(root=ROOT, config=config))
+
+    interpreter = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interpreter.append((time.perf_counter() - started) * 1000)
+    bare = [launch(BARE_TK)[0] for _ in range(args.runs)]
+    app, assets = [], []
+    for _ in range(args.runs):
+        first_frame, lines, _ = launch(APP.format(root=ROOT, config=config))
+        app.append(first_frame)
+        assets.append(next(float(line.split()[1]) for line in lines if line.startswith("assets-ready")))
+
+    print(f"interpreter only     {summary(interpreter)}")
+    print(f"bare Tk window       {summary(bare)}")
+    print(f"app first frame      {summary(app)}")
+    print(f"assets ready after   {summary(assets)}  (background, after the first frame)")
+    print(f"asset loads          {lines[-1]}")
+    verdict = "meets" if statistics.median(app) < TARGET_MS else "misses"
+    print(f"{verdict} the {TARGET_MS} ms target")
+
+    if args.imports:
+        _, _, stderr = launch(APP.format(root=ROOT, config=config), ("-X", "importtime"))
+        print()
+        print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+        for cumulative_us, self_us, name in slowest_imports(stderr):
+            print(f"{cumulative_us / 1000:>13.1f} {self_us / 1000:>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
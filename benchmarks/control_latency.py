@@ -0,0 +1,115 @@
+"""Control server: time from a spin command to the first frame of its spin.
+
+Starts the stations (headless canvas, real after() timing) with the
+control server on a free local port, then a ControlClient on another
+thread pushes presets, spins every station in turn and waits for each
+result event, like an operator console would. The latency is measured
+in the app, from the command's arrival on the server thread to the first
+drawn frame of the spin it started; the target is under 20 ms. The
+round trip the client sees is reported alongside.
+
+Run from the repository root:
+
+    python benchmarks/control_latency.py [--spins 20] [--stations 1] [--busy]
+
+--busy commands station 1 only and keeps the other stations spinning,
+so the spin joins a running frame loop instead of starting an idle one.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+import main
+from audio import AudioEngine, NullBackend
+from control import ControlClient
+from instrument import percentile
+from wheel_config import compile_plan
+
+TARGET_MS = 20
+
+
+def make_plan(port):
+    return compile_plan({
+        "wheel": {"segments": 20},
+        "rounds": {"shuffle_screen": False, "spin_rounds": 1, "journal": None},
+        "control": {"enabled": True, "port": port},
+    })
+
+
+def console(port, spins, stations, busy, report):
+    """The operator side: runs on its own thread, talks to the app over TCP only."""
+    client = ControlClient(port=port)
+    client.command("subscribe")
+    for station in range(1, stations + 1):
+        reply = client.command("presets", station=station, wheel=[(station * 3 + k) % 20 + 1 for k in range(spins)])
+        assert reply["ok"], reply
+    round_trips = []
+    for spin in range(spins):
+        # Busy: station 1 is commanded while the others are kept spinning
+        station = 1 if busy else spin % stations + 1
+        if busy:
+            for other in range(1, stations + 1):
+                if other != station:
+                    client.command("spin", station=other)  # Fails with "already spinning" while it is
+        started = time.perf_counter()
+        reply = client.command("spin", station=station)
+        round_trips.append((time.perf_counter() - started) * 1000)
+        assert reply["ok"], reply
+        while True:
+            event = client.next_event()
+            if event["event"] == "result" and event["station"] == station:
+                break
+    report["round_trips"] = round_trips
+    report["latency"] = client.command("latency")["latency_ms"]
+    report["results"] = client.command("results", since=0)["results"]
+    client.close()
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spins", type=int, default=20)
+    parser.add_argument("--stations", type=int, default=1)
+    parser.add_argument("--busy", action="store_true", help="keep the other stations spinning")
+    args = parser.parse_args()
+
+    headless.install(main)
+    root = headless.Root()
+    with contextlib.redirect_stdout(io.StringIO()):
+        plans = [make_plan(0)] * args.stations
+        app = main.MultiStationApp(root, plans, audio=AudioEngine(NullBackend()))
+        for station in app.stations:
+            station.wheel.on_resize(450, 450)
+    server = app.control.server
+
+    report = {}
+    thread = threading.Thread(target=console, args=(server.port, args.spins, args.stations, args.busy, report),
+                              daemon=True)
+    thread.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while thread.is_alive():
+            root.run_due()
+    if "latency" not in report:
+        sys.exit("the console failed, see above")
+
+    latency = report["latency"]
+    trips = sorted(report["round_trips"])
+    print(f"{args.spins} spins over {args.stations} station(s){', others spinning' if args.busy else ''}")
+    print(f"command -> first frame: p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} ms, "
+          f"max {latency['max']:.2f} ms (target < {TARGET_MS} ms)")
+    print(f"client round trip of the spin command: p50 {percentile(trips, 50):.2f} ms, max {trips[-1]:.2f} ms")
+    print(f"results read back: {len(report['results'])}, busy replies: {server.rejected}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.close()
+    if latency["p95"] >= TARGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_bench()
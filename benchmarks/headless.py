@@ -0,0 +1,221 @@
+"""Stand-ins for the tkinter widgets the app uses, to benchmark it without a display.
+
+The canvas keeps its items in a dict and counts the calls that would go
+to Tk; after() jobs only run when run_jobs() (delays ignored) or
+run_due() (delays kept, like Tk's event loop) is called. None of Tk's own
+rendering is included, so compare headless results with headless results
+only. install(main) points main's tk at these classes.
+"""
+import itertools
+import time
+import types
+
+BOTH = "both"
+
+
+class TclError(Exception):
+    pass
+
+
+class Widget:
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+        self.mapped = False
+        self.bindings = {}
+
+    def pack(self, **options):
+        self.mapped = True
+
+    def pack_forget(self):
+        self.mapped = False
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    bind_all = bind
+
+    def grid(self, **options):
+        self.mapped = True
+
+    def rowconfigure(self, index, **options):
+        pass
+
+    columnconfigure = rowconfigure
+
+    def winfo_toplevel(self):
+        widget = self
+        while widget.master is not None and not isinstance(widget, Toplevel):
+            widget = widget.master
+        return widget
+
+    def winfo_width(self):
+        return self.options.get("width", 600)
+
+    def winfo_height(self):
+        return self.options.get("height", 600)
+
+
+class Root(Widget):
+    def __init__(self):
+        super().__init__()
+        self.jobs = {}
+        self.due = {}  # Job -> perf_counter time it is due at
+        self.job_ids = itertools.count(1)
+
+    def title(self, text):
+        pass
+
+    def geometry(self, spec):
+        pass
+
+    def withdraw(self):
+        self.mapped = False
+
+    def minsize(self, width, height):
+        pass
+
+    def after(self, ms, func, *args):
+        job = next(self.job_ids)
+        self.jobs[job] = (func, args)
+        self.due[job] = time.perf_counter() + ms / 1000
+        return job
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+        self.due.pop(job, None)
+
+    def run_jobs(self, limit=1000):
+        """Run pending after() jobs in the order they were made, ignoring their delays."""
+        for _ in range(limit):
+            if not self.jobs:
+                return
+            job = min(self.jobs)
+            func, args = self.jobs.pop(job)
+            del self.due[job]
+            func(*args)
+
+    def run_due(self, max_wait=0.001):
+        """Wait up to max_wait for the next job to be due, then run the jobs that are."""
+        if self.due:
+            delay = min(self.due.values()) - time.perf_counter()
+            if delay > 0:
+                time.sleep(min(delay, max_wait))
+        now = time.perf_counter()
+        for job in sorted(job for job, due in self.due.items() if due <= now):
+            if job in self.jobs:
+                func, args = self.jobs.pop(job)
+                del self.due[job]
+                func(*args)
+
+    def update_idletasks(self):
+        pass
+
+    def update(self):
+        pass
+
+    def destroy(self):
+        self.jobs.clear()
+        self.due.clear()
+
+
+class Canvas(Widget):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = {}  # Item id -> [type, coords, options]
+        self.item_ids = itertools.count(1)
+        self.calls = 0  # Calls that would have gone to Tk
+
+    def create(self, kind, coords, options):
+        self.calls += 1
+        item = next(self.item_ids)
+        self.items[item] = [kind, coords, options]
+        return item
+
+    def create_arc(self, *coords, **options):
+        return self.create("arc", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self.create("image", coords, options)
+
+    def create_line(self, *coords, **options):
+        return self.create("line", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self.create("oval", coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self.create("polygon", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self.create("rectangle", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self.create("text", coords, options)
+
+    def itemconfig(self, item, **options):
+        self.calls += 1
+        self.items[item][2].update(options)
+
+    itemconfigure = itemconfig
+
+    def coords(self, item, *coords):
+        self.calls += 1
+        if coords:
+            self.items[item][1] = coords
+        return self.items[item][1]
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def find_withtag(self, tag):
+        if tag == "all":
+            return tuple(self.items)
+        if isinstance(tag, int):
+            return (tag,) if tag in self.items else ()
+        found = []
+        for item, (_, _, options) in self.items.items():
+            tags = options.get("tags", ())
+            if tags == tag or (not isinstance(tags, str) and tag in tags):
+                found.append(item)
+        return tuple(found)
+
+    def delete(self, *tags):
+        self.calls += 1
+        for tag in tags:
+            for item in self.find_withtag(tag):
+                del self.items[item]
+
+    def tag_raise(self, tag, above=None):
+        self.calls += 1
+
+
+class Toplevel(Widget):
+    def title(self, text):
+        pass
+
+    def geometry(self, spec):
+        pass
+
+    def protocol(self, name, func):
+        pass
+
+
+Label = Button = Frame = Widget
+Tk = Root
+
+
+def install(module):
+    """Make module (main) build its windows from these stand-ins."""
+    module.tk = types.SimpleNamespace(
+        Tk=Root, Toplevel=Toplevel, Canvas=Canvas, Label=Label, Button=Button, Frame=Frame,
+        TclError=TclError, BOTH=BOTH,
+    )
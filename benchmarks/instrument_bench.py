@@ -0,0 +1,77 @@
+"""Cost of the frame instrumentation per spin frame, disabled and enabled.
+
+A stand-in frame goes through the same probe checks as LuckyWheel.spin_frame:
+without a probe (disabled) it pays four None checks, with one it reads the
+clock five times and records into the ring buffer. Both are compared with
+the 16.7 ms budget of a 60 fps frame.
+
+Run from the repository root:
+
+    python benchmarks/instrument_bench.py
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrument import FrameTrace, Instrumentation, PerfHud
+
+
+class Canvas:
+    def create_text(self, *args, **kwargs):
+        return 1
+
+    def itemconfig(self, *args, **kwargs):
+        pass
+
+    def tag_raise(self, *args):
+        pass
+
+    def delete(self, *args):
+        pass
+
+    def find_withtag(self, tag):
+        return ()
+
+
+def frame(probe, elapsed=1.0):
+    """spin_frame with the work taken out, only the instrumentation left."""
+    if probe is not None:
+        started = time.perf_counter()
+    if probe is not None:
+        advanced = time.perf_counter()
+    if probe is not None:
+        collected = time.perf_counter()
+    if probe is not None:
+        drawn = time.perf_counter()
+    if probe is not None:
+        done = time.perf_counter()
+        probe.frame(elapsed, 0.0, advanced - started, collected - advanced, drawn - collected, done - drawn,
+                    done - started, 0)
+
+
+def main():
+    probe = Instrumentation(Canvas())
+    probe.enable()
+    number = 200_000
+    budget_us = 1_000_000 / 60
+    for name, target in (("disabled", None), ("enabled", probe)):
+        seconds = min(timeit.repeat(lambda: frame(target), number=number, repeat=5))
+        us = seconds / number * 1e6
+        print(f"{name:>9}: {us:6.3f} us per frame ({us / budget_us * 100:.4f}% of a 60 fps frame)")
+
+    trace = FrameTrace()
+    for i in range(trace.capacity):
+        trace.record((i,) * 10)
+    hud = PerfHud(Canvas(), probe)
+    probe.trace = trace
+    seconds = min(timeit.repeat(hud.text, number=20, repeat=5)) / 20
+    print(f"HUD text over {trace.capacity} frames: {seconds * 1000:.2f} ms, at most every {hud.interval} s")
+    seconds = min(timeit.repeat(trace.summary, number=20, repeat=5)) / 20
+    print(f"full summary of {trace.capacity} frames: {seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
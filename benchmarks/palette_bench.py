@@ -0,0 +1,51 @@
+"""Per-frame trail color cost: parsing hex on every frame vs the Palette table.
+
+Run from the repository root:
+
+    python benchmarks/palette_bench.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from palette import Palette, apply_dim, brighten_color, trail_dim_factor
+
+BASE_COLORS = ["#F5EEDC", "#ECB390"]
+HIGHLIGHT_COLOR = "#DD4A48"
+
+
+def frame_before(segments, brightened_colors):
+    """One frame of trail colors the way draw_wheel used to compute them."""
+    for i in range(segments):
+        trail_index = i
+        dim_factor = min(0.99, 1 - (0.99 ** (trail_index + 1)))
+        apply_dim(brightened_colors[i % len(brightened_colors)], dim_factor, highlight_color=HIGHLIGHT_COLOR)
+
+
+def frame_after(segments, palette):
+    """One frame of trail colors from the precomputed table."""
+    trail_colors = palette.trail_colors
+    for i in range(segments):
+        trail_colors[i % len(trail_colors)][i]
+
+
+def main():
+    print(f"{'segments':>9} {'before us':>10} {'after us':>9} {'speedup':>8}")
+    for segments in (20, 100, 1000):
+        # Worst case: every segment is in the trail
+        brightened_colors = [brighten_color(c, HIGHLIGHT_COLOR) for c in BASE_COLORS]
+        palette = Palette(BASE_COLORS, HIGHLIGHT_COLOR, segments)
+        assert palette.trail_colors[0][segments - 1] == apply_dim(
+            brightened_colors[0], trail_dim_factor(segments - 1), HIGHLIGHT_COLOR
+        )
+
+        number = max(1, 20000 // segments)
+        before = min(timeit.repeat(lambda: frame_before(segments, brightened_colors), number=number, repeat=5)) / number
+        after = min(timeit.repeat(lambda: frame_after(segments, palette), number=number, repeat=5)) / number
+        print(f"{segments:>9} {before * 1e6:>10.1f} {after * 1e6:>9.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
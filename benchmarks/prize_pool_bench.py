@@ -0,0 +1,53 @@
+"""Drawing a whole raffle without replacement: rebuilt lists vs the prize pools.
+
+The naive way picks from the list of remaining entries and removes the
+winner with list.remove (O(n) per draw); the pools draw in O(1) or
+O(log n).
+
+Run from the repository root:
+
+    python benchmarks/prize_pool_bench.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prize_pool import PrizePool, WeightedPrizePool
+
+
+def timed(run):
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def naive(entries, rng):
+    remaining = list(range(entries))
+    while remaining:
+        remaining.remove(rng.choice(remaining))
+
+
+def pooled(pool, rng):
+    while len(pool):
+        pool.draw(rng)
+
+
+def main():
+    rng = random.Random(1)
+    for entries in (1_000, 10_000, 100_000):
+        list_s = timed(lambda: naive(entries, rng)) if entries <= 10_000 else None
+        uniform_s = timed(lambda: pooled(PrizePool(range(entries)), rng))
+        weights = [rng.randint(1, 100) for _ in range(entries)]
+        weighted_s = timed(lambda: pooled(WeightedPrizePool(weights), rng))
+
+        naive_text = f"{list_s / entries * 1e6:8.2f}" if list_s is not None else "     n/a"
+        print(f"{entries:>7} entries: list.remove {naive_text} us/draw, "
+              f"PrizePool {uniform_s / entries * 1e6:6.2f} us/draw, "
+              f"WeightedPrizePool {weighted_s / entries * 1e6:6.2f} us/draw")
+
+
+if __name__ == "__main__":
+    main()
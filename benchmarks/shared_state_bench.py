@@ -0,0 +1,119 @@
+"""Shared wheel state: cost of a publish and consistency of concurrent reads.
+
+The publisher writes a synthetic spin (the trail always ends on the
+current segment and its length follows the frame number), first flat out
+and then at 60 Hz, while a reader in another process reads as fast as
+it can and checks every state it gets against those invariants. A torn
+read, one that mixes two updates, would break them; the seqlock must
+keep that count at zero. On a single core the two processes take turns,
+so a reader sees about one state per time slice of a flat-out publisher.
+
+Run from the repository root:
+
+    python benchmarks/shared_state_bench.py [--segments 200] [--seconds 2]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import IDLE, SPINNING
+from shared_state import StatePublisher, StateReader
+
+NAME = f"lucky_wheel_bench_{os.getpid()}"
+
+
+def fake_wheel(segments):
+    engine = types.SimpleNamespace(phase=IDLE, play_count=0, chosen_number=None, winning_segment=None,
+                                   segment_extents=lambda: None)
+    palette = types.SimpleNamespace(base_colors=("#F5EEDC", "#ECB390"), highlight_color="#DD4A48")
+    return types.SimpleNamespace(engine=engine, palette=palette, segments=segments, spinning=True,
+                                 labels=tuple(str(i + 1) for i in range(segments)),
+                                 current_segment=0, trail_segments=[])
+
+
+def step(wheel, k):
+    """Frame k of the synthetic spin."""
+    segments = wheel.segments
+    length = 1 + k % 50
+    wheel.current_segment = k % segments
+    wheel.trail_segments = [(k - j) % segments for j in reversed(range(length))]
+    wheel.engine.chosen_number = k
+    wheel.engine.phase = SPINNING
+
+
+def read_loop(name):
+    """The reader process: reads until a line arrives on stdin, then prints its counts."""
+    stop = threading.Event()
+    threading.Thread(target=lambda: (sys.stdin.readline(), stop.set()), daemon=True).start()
+    reader = StateReader(name)
+    print("attached", flush=True)
+    reads = torn = distinct = 0
+    last = None
+    while not stop.is_set():
+        state = reader.read()
+        reads += 1
+        if state.sequence != last:
+            distinct += 1
+            last = state.sequence
+        k = state.number
+        if k is None:
+            continue
+        length = 1 + k % 50
+        if (state.segment != k % len(reader.meta["labels"]) or state.trail_length != length
+                or len(state.trail) != length or state.trail[-1] != state.segment):
+            torn += 1
+    reader.close()
+    print(json.dumps([reads, distinct, torn]), flush=True)
+
+
+def run(segments, seconds, rate):
+    wheel = fake_wheel(segments)
+    publisher = StatePublisher(NAME)
+    publisher.attach(wheel)
+    # A separate program, like mirror.py, not a multiprocessing child sharing our resources
+    reader = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--read", NAME],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    reader.stdout.readline()  # Attached
+
+    publishes = 0
+    spent = 0.0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        step(wheel, publishes)
+        before = time.perf_counter()
+        publisher.on_frame(wheel, publishes, 0.0)
+        spent += time.perf_counter() - before
+        publishes += 1
+        if rate:
+            time.sleep(max(0.0, started + publishes / rate - time.perf_counter()))
+    output, _ = reader.communicate("stop\n", timeout=10)
+    reads, distinct, torn = json.loads(output)
+    publisher.close()
+    label = f"{rate} Hz" if rate else "flat out"
+    print(f"{label:>9} {publishes:>10} {spent / publishes * 1e6:>12.2f} {reads:>10} {distinct:>10} {torn:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--read", metavar="NAME", help=argparse.SUPPRESS)  # Runs the reader side
+    args = parser.parse_args()
+    if args.read:
+        read_loop(args.read)
+        return
+    print(f"{args.segments} segments, trails of 1-50")
+    print(f"{'publisher':>9} {'publishes':>10} {'us/publish':>12} {'reads':>10} {'states':>10} {'torn':>6}")
+    run(args.segments, args.seconds, None)
+    run(args.segments, args.seconds, 60)
+
+
+if __name__ == "__main__":
+    main()
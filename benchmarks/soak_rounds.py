@@ -0,0 +1,92 @@
+"""Soak test: thousands of shuffle -> wheel -> shuffle rounds in one window.
+
+Every round is played through the real app (without waiting for the
+animation) and every few hundred rounds the script samples the Python
+object count, traced memory, Tk widgets, canvas items and pending after()
+jobs. With screens built once all of them stay flat; anything that grows
+with the round count is a leak.
+
+Needs a display. Run from the repository root:
+
+    python benchmarks/soak_rounds.py [rounds]
+"""
+import contextlib
+import gc
+import io
+import os
+import sys
+import time
+import tkinter as tk
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import CONFIG_PATH, LuckyWheelApp
+from wheel_config import load_plan
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def sample(root, app):
+    gc.collect()
+    canvas_items = len(app.wheel.canvas.find_all()) + len(app.shuffler.canvas.find_all())
+    return (
+        len(gc.get_objects()),
+        tracemalloc.get_traced_memory()[0] / 1024,
+        count_widgets(root),
+        canvas_items,
+        len(root.tk.splitlist(root.tk.call("after", "info"))),
+    )
+
+
+def play_round(root, app):
+    app.shuffler.start()
+    app.shuffler.stop()
+    if app.plan.confirm_number:
+        app.shuffler.confirm()
+    app.on_space()
+    wheel = app.wheel
+    wheel.spin_frame(wheel.spin_plan.times[len(wheel.spin_plan.times) // 2])
+    wheel.spin_frame(wheel.spin_plan.duration)
+    root.update()
+
+
+def main(rounds=5000, every=500):
+    root = tk.Tk()
+    # No journal: the soak should not leave thousands of draws behind
+    app = LuckyWheelApp(root, load_plan(CONFIG_PATH)._replace(journal=None))
+    root.update()
+
+    tracemalloc.start()
+    header = f"{'round':>6} {'objects':>8} {'traced KiB':>10} {'widgets':>8} {'items':>6} {'afters':>7} {'round ms':>9} {'switch ms':>10}"
+    print(header)
+    print("-" * len(header))
+    rows = []
+    elapsed = 0.0
+    for i in range(1, rounds + 1):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # Mute the per-round play count
+            play_round(root, app)
+        elapsed += time.perf_counter() - started
+        if i % every == 0:
+            row = sample(root, app)
+            rows.append(row)
+            objects, traced, widgets, items, afters = row
+            print(f"{i:>6} {objects:>8} {traced:>10.0f} {widgets:>8} {items:>6} {afters:>7} "
+                  f"{elapsed / every * 1000:>9.2f} {app.screens.last_switch * 1000:>10.3f}")
+            elapsed = 0.0
+
+    # Judge on the second half, after caches (spin plans, fonts) have warmed up
+    first, last = rows[len(rows) // 2], rows[-1]
+    growing = [name for name, a, b in zip(("objects", "memory", "widgets", "items", "afters"), first, last)
+               if b > a * 1.05 + 10]
+    print("growing: " + ", ".join(growing) if growing else "flat")
+
+    app.close()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
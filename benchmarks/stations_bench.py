@@ -0,0 +1,120 @@
+"""Several stations spinning at once: cost of a tick of the shared scheduler.
+
+Builds a MultiStationApp of N wheels (8 by default), spins all of them
+together and plays the spins out in real time, on the shared 60 fps grid.
+Reports the time each tick took for all wheels together against the
+16.7 ms budget of a frame, the frames the grid dropped, and how many
+palettes and pitched ticks were built for the whole process.
+
+On the headless canvas (the default) Tk's own drawing is not included;
+--tk runs on a real window instead (on a Linux box without a display:
+xvfb-run python benchmarks/stations_bench.py --tk).
+
+Run from the repository root:
+
+    python benchmarks/stations_bench.py [--wheels 8] [--segments 20] [--spins 3] [--tk]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+import main
+from audio import AudioEngine, NullBackend
+from instrument import percentile
+from palette import shared_palette
+from wheel_config import compile_plan
+
+SIZE = 450  # Canvas size of one station
+
+
+def make_plans(wheels, segments):
+    """One plan per station, each with presets of its own and a seeded RNG."""
+    plans = []
+    for i in range(wheels):
+        config = {
+            "wheel": {"segments": segments, "presets": [(i * 7 + k * 3) % segments + 1 for k in range(5)],
+                      "wrap_presets": True},
+            "rounds": {"shuffle_screen": False, "seed": i},
+        }
+        plans.append(compile_plan(config, source_hash=None))
+    return plans
+
+
+def play(root, app, real_tk):
+    """Spin every station and run the ticks until all wheels stopped; returns the tick times."""
+    scheduler = app.scheduler
+    tick_times = []
+    tick = scheduler._tick
+
+    def timed_tick():
+        tick()
+        tick_times.append(scheduler.tick_time)
+
+    scheduler._tick = timed_tick
+    app.spin_all()
+    while scheduler.animations:
+        if real_tk:
+            root.update()
+            time.sleep(0.001)
+            continue
+        # The stand-in root ignores after() delays: wait for the next slot on the grid
+        delay = scheduler.start_time + scheduler.frame * scheduler.frame_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        root.run_jobs(limit=len(root.jobs))
+    del scheduler._tick
+    return tick_times
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wheels", type=int, default=8)
+    parser.add_argument("--segments", type=int, default=20)
+    parser.add_argument("--spins", type=int, default=3)
+    parser.add_argument("--tk", action="store_true", help="use a real Tk window instead of the headless canvas")
+    args = parser.parse_args()
+
+    if args.tk:
+        import tkinter
+
+        root = tkinter.Tk()
+    else:
+        headless.install(main)
+        root = headless.Root()
+    audio = AudioEngine(NullBackend())
+    with contextlib.redirect_stdout(io.StringIO()):  # Play counts and missing-image notes
+        app = main.MultiStationApp(root, make_plans(args.wheels, args.segments), audio=audio)
+        root.update()
+        for station in app.stations:
+            station.wheel.on_resize(SIZE, SIZE)
+
+    budget = app.scheduler.frame_time * 1000
+    print(f"{args.wheels} wheels of {args.segments} segments, {'Tk' if args.tk else 'headless'}, "
+          f"frame budget {budget:.1f} ms")
+    print(f"{'spin':>4} {'ticks':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'p95 load':>9} {'dropped':>8}")
+    for spin in range(1, args.spins + 1):
+        dropped = app.scheduler.dropped_frames
+        with contextlib.redirect_stdout(io.StringIO()):
+            ticks = sorted(t * 1000 for t in play(root, app, args.tk))
+        p95 = percentile(ticks, 95)
+        print(f"{spin:>4} {len(ticks):>6} {percentile(ticks, 50):>8.3f} {p95:>8.3f} {ticks[-1]:>8.3f} "
+              f"{p95 / budget:>8.0%} {app.scheduler.dropped_frames - dropped:>8}")
+
+    winners = [station.wheel.winning_segment + 1 for station in app.stations]
+    print(f"winners of the last spin: {winners}")
+    print(f"palettes built: {shared_palette.cache_info().currsize} for {args.wheels} wheels")
+    audio.wait()
+    print(f"ticks played by the shared audio engine: {audio.stats()['played']}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.close()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,368 @@
+"""Benchmark suite: frame draw cost, whole spins, round transitions and the palette.
+
+Runs the real LuckyWheel and NumberShuffler code, on the headless canvas
+stub (benchmarks/headless.py, the default) or on a real Tk window with
+--tk (on a Linux box without a display: xvfb-run python benchmarks/suite.py --tk).
+Cases:
+
+    draw.frame     one spin frame (trail step + draw_wheel) per segment count,
+                   canvas size and trail length
+    draw.relayout  draw_wheel after the geometry changed (items rebuilt)
+    spin           a whole spin, every frame of a 60 fps loop
+    round          one round without the animation: shuffle, stop, spin, result
+    shuffle.tick   one NumberShuffler.shuffle_numbers step
+    palette        apply_dim and building the trail color table
+    engine.rounds  1000 headless rounds of the WheelEngine
+
+Results go to a JSON file with the environment they were measured in.
+--compare checks them against a stored baseline and exits with 1 when a
+case got slower by more than --threshold. Cases are compared on their
+fastest sample, the one least disturbed by whatever else the machine was
+doing; the medians are shown alongside. Every run also times a fixed
+pure-Python reference loop: when that moved too, the machine itself was
+faster or slower, and --normalize divides it out.
+
+Run from the repository root:
+
+    python benchmarks/suite.py [--tk] [--quick] [--filter draw] [--output results.json]
+    python benchmarks/suite.py --compare baseline.json [--threshold 0.10]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import headless
+import main
+from audio import AudioEngine, NullBackend
+from palette import Palette, apply_dim
+from wheel_config import load_plan
+
+SEGMENTS = (20, 200, 2000)
+SIZES = (400, 800, 1600)
+TRAILS = (1, 8, 32)
+
+# Each sample runs the case at least this long, to get above the clock's resolution
+MIN_SAMPLE_SECONDS = 0.02
+
+
+def quiet():
+    """The app prints the play count of every spin; keep it out of the report."""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def make_plan(segments):
+    plan = load_plan(main.CONFIG_PATH)
+    return plan._replace(
+        segments=segments, labels=tuple(str(i + 1) for i in range(segments)), weights=None,
+        # Every spin lands on the same segment, so every spin has the same length
+        wheel_presets=(segments // 3 + 1,), wrap_presets=True, shuffle_presets=(), seed=1, remove_winners=False,
+        shuffle_screen=True, confirm_number=False, back_to_shuffle=True,
+        journal=None, plugins=(), instrument=False, hud=False,
+    )
+
+
+def stats(samples, number):
+    """Summary of per-call times in microseconds, one sample per repeat."""
+    samples = sorted(samples)
+    return {
+        "median_us": statistics.median(samples),
+        "min_us": samples[0],
+        "max_us": samples[-1],
+        "number": number,
+        "repeat": len(samples),
+    }
+
+
+def reference_loop():
+    """Fixed work that does not depend on the code under test, to gauge the machine."""
+    total = 0
+    for i in range(10_000):
+        total += i * i % 7
+    return total
+
+
+def measure(func, repeat):
+    """Time func, calibrating the calls per sample so a sample lasts MIN_SAMPLE_SECONDS."""
+    started = time.perf_counter()
+    func()
+    once = time.perf_counter() - started
+    number = max(1, int(MIN_SAMPLE_SECONDS / max(once, 1e-9)))
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number * 1e6)
+    return stats(samples, number)
+
+
+class Harness:
+    def __init__(self, real_tk, repeat, pattern=None):
+        self.real_tk = real_tk
+        self.repeat = repeat
+        self.pattern = pattern
+        self.results = {}
+        if not real_tk:
+            headless.install(main)
+
+    def wanted(self, name):
+        return self.pattern is None or self.pattern in name
+
+    def add(self, name, params, result):
+        result["params"] = params
+        self.results[name] = result
+        print(f"{name:<44} {result['median_us']:>12.1f} us  (min {result['min_us']:.1f}, n={result['number']}x{result['repeat']})")
+
+    @contextlib.contextmanager
+    def app(self, segments, size=600):
+        if self.real_tk:
+            import tkinter
+
+            root = tkinter.Tk()
+        else:
+            root = headless.Root()
+        with quiet():
+            app = main.LuckyWheelApp(root, make_plan(segments), audio=AudioEngine(NullBackend()))
+        root.update()
+        app.wheel.on_resize(size, size)
+        try:
+            yield root, app
+        finally:
+            with quiet():
+                app.close()
+            root.destroy()
+
+    def run(self):
+        self.draw()
+        self.spin()
+        self.rounds()
+        self.palette()
+        self.engine()
+        return self.results
+
+    def draw(self):
+        for segments in SEGMENTS:
+            for size in SIZES:
+                for trail in TRAILS:
+                    name = f"draw.frame/{segments}seg/{size}px/trail{trail}"
+                    if self.wanted(name):
+                        self.draw_frame(name, segments, size, min(trail, segments))
+                name = f"draw.relayout/{segments}seg/{size}px"
+                if self.wanted(name):
+                    self.draw_relayout(name, segments, size)
+
+    def draw_frame(self, name, segments, size, trail):
+        with self.app(segments, size) as (root, app):
+            wheel = app.wheel
+            app.screens.show("wheel")
+            wheel.spinning = True  # Spin label styles
+            step = [0]
+
+            def frame():
+                segment = step[0] = (step[0] + 1) % segments
+                wheel.trail_segments.push(segment)
+                wheel.trail_segments.expire(len(wheel.trail_segments) - trail)
+                wheel.current_segment = segment
+                wheel.draw_wheel()
+                root.update_idletasks()
+
+            self.add(name, {"segments": segments, "size": size, "trail": trail}, measure(frame, self.repeat))
+            wheel.spinning = False
+
+    def draw_relayout(self, name, segments, size):
+        with self.app(segments, size) as (root, app):
+            wheel = app.wheel
+            app.screens.show("wheel")
+
+            def relayout():
+                wheel.scene.invalidate()
+                wheel.draw_wheel()
+                root.update_idletasks()
+
+            self.add(name, {"segments": segments, "size": size}, measure(relayout, self.repeat))
+
+    def spin(self):
+        for segments in SEGMENTS:
+            name = f"spin/{segments}seg"
+            if not self.wanted(name):
+                continue
+            with self.app(segments) as (root, app), quiet():
+                wheel = app.wheel
+                samples = []
+                frames = 0
+                # The first spin plans the timeline (cached afterwards) and is not counted
+                for run in range(max(3, self.repeat // 3) + 1):
+                    app.shuffler.start()
+                    app.shuffler.stop()  # Wheel screen, ready to spin
+                    started = time.perf_counter()
+                    wheel.spin_wheel()
+                    frame = 0
+                    while wheel.spin_frame(frame / 60):
+                        root.update_idletasks()
+                        frame += 1
+                    if run:
+                        samples.append((time.perf_counter() - started) * 1e6)
+                    wheel.scheduler.cancel()
+                    frames = frame
+                result = stats(samples, 1)
+            self.add(name, {"segments": segments, "frames": frames}, result)
+
+    def rounds(self):
+        for segments in SEGMENTS:
+            name = f"round/{segments}seg"
+            if self.wanted(name):
+                with self.app(segments) as (root, app), quiet():
+                    wheel = app.wheel
+
+                    def round_():
+                        app.shuffler.start()
+                        app.shuffler.stop()
+                        wheel.spin_wheel()
+                        wheel.spin_frame(wheel.spin_plan.duration)  # Straight to the result
+                        wheel.scheduler.cancel()
+                        root.update_idletasks()
+
+                    result = measure(round_, self.repeat)
+                self.add(name, {"segments": segments}, result)
+
+        name = "shuffle.tick"
+        if self.wanted(name):
+            with self.app(20) as (root, app):
+                shuffler = app.shuffler
+                shuffler.start()
+
+                def tick():
+                    shuffler.shuffle_numbers()
+                    root.after_cancel(shuffler.job)
+
+                result = measure(tick, self.repeat)
+                with quiet():
+                    shuffler.stop()
+            self.add(name, {}, result)
+
+    def palette(self):
+        if self.wanted("palette.apply_dim"):
+            self.add("palette.apply_dim", {}, measure(lambda: apply_dim("#ECB390", 0.5, "#DD4A48"), self.repeat))
+        for segments in SEGMENTS:
+            name = f"palette.build/{segments}seg"
+            if self.wanted(name):
+                result = measure(lambda: Palette(["#F5EEDC", "#ECB390"], "#DD4A48", segments), self.repeat)
+                self.add(name, {"segments": segments}, result)
+
+    def engine(self):
+        name = "engine.rounds/1000"
+        if self.wanted(name):
+            plan = make_plan(20)
+            self.add(name, {"rounds": 1000}, measure(lambda: plan.create_engine().simulate(1000), self.repeat))
+
+
+def environment(real_tk):
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    tk_version = None
+    if real_tk:
+        import tkinter
+        tk_version = tkinter.TkVersion
+
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "canvas": "tk" if real_tk else "headless",
+        "tk": tk_version,
+        "numpy": numpy_version,
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "reference_us": measure(reference_loop, 15)["min_us"],
+    }
+
+
+def compare(results, baseline, threshold, normalize=False):
+    """Print new vs baseline times; returns the names of the cases that regressed."""
+    base_env, env = baseline["environment"], results["environment"]
+    for key in ("machine", "python", "canvas", "numpy"):
+        if base_env.get(key) != env.get(key):
+            print(f"warning: {key} differs from the baseline ({base_env.get(key)} vs {env.get(key)})")
+
+    speed = env["reference_us"] / base_env["reference_us"]
+    if abs(speed - 1) > threshold:
+        print(f"warning: the reference loop ran {speed - 1:+.1%} against the baseline, the machine "
+              f"{'was busier or slower' if speed > 1 else 'was faster'}"
+              f"{'; times are divided by that' if normalize else '; try --normalize'}")
+    if not normalize:
+        speed = 1.0
+
+    regressions = []
+    print(f"\n{'case (best sample)':<44} {'baseline us':>12} {'now us':>12} {'change':>8} {'median change':>14}")
+    for name, result in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        change = result["min_us"] / speed / base["min_us"] - 1
+        median_change = result["median_us"] / speed / base["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<44} {base['min_us']:>12.1f} {result['min_us']:>12.1f} {change:>+8.1%} {median_change:>+14.1%}{flag}")
+    missing = set(baseline["results"]) - set(results["results"])
+    if missing:
+        print(f"{len(missing)} baseline case(s) not run now")
+    return regressions
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tk", action="store_true", help="draw on a real Tk window (needs a display or Xvfb)")
+    parser.add_argument("--quick", action="store_true", help="fewer samples per case")
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression")
+    parser.add_argument("--normalize", action="store_true", help="divide out the machine speed (reference loop)")
+    args = parser.parse_args()
+
+    harness = Harness(args.tk, repeat=5 if args.quick else 15, pattern=args.filter)
+    results = {"environment": environment(args.tk), "results": harness.run()}
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=1)
+    print(f"results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.normalize)
+        if regressions:
+            print(f"{len(regressions)} case(s) more than {args.threshold:.0%} slower than the baseline")
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,59 @@
+"""Trail cost per frame: the old list (in / index / pop(0)) vs the Trail ring buffer.
+
+Each frame looks up the trail position of every segment, like draw_wheel
+does, then pushes one segment and expires a few, like a spin step.
+
+Run from the repository root:
+
+    python benchmarks/trail_bench.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trail import Trail
+
+
+def frame_list(segments, trail, step):
+    for i in range(segments):
+        if i in trail:
+            trail.index(i)
+    trail.append(step % segments)
+    if len(trail) > segments:
+        trail.pop(0)
+    for _ in range(2):
+        if trail:
+            trail.pop(0)
+    # Keep the trail full so every frame measures the worst case
+    trail.extend((step + k) % segments for k in range(1, 3))
+
+
+def frame_ring(segments, trail, step):
+    position = trail.position
+    for i in range(segments):
+        position(i)
+    trail.push(step % segments)
+    trail.expire(2)
+    for k in range(1, 3):
+        trail.push((step + k) % segments)
+
+
+def main():
+    print(f"{'segments':>9} {'list us':>11} {'ring us':>10} {'speedup':>8}")
+    for segments in (20, 100, 500, 1000, 2000, 5000):
+        full = list(range(segments))
+        old = list(full)
+        ring = Trail(segments)
+        ring.reset(full)
+
+        number = max(1, 4000 // segments)
+        steps = iter(range(10 ** 9))
+        before = min(timeit.repeat(lambda: frame_list(segments, old, next(steps)), number=number, repeat=3)) / number
+        after = min(timeit.repeat(lambda: frame_ring(segments, ring, next(steps)), number=number, repeat=3)) / number
+        print(f"{segments:>9} {before * 1e6:>11.1f} {after * 1e6:>10.1f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+import asyncio
+import itertools
+import json
+import queue
+import socket
+import threading
+import time
+from collections import deque, namedtuple
+
+from engine import WHEEL_READY, InvalidTransition
+from hooks import Plugin
+from instrument import percentile
+from prize_pool import PoolExhausted
+
+# The protocol is JSON lines over TCP, one object per line each way.
+# A command is {"cmd": name, "id": any, "station": n (1-based, default 1), ...}
+# and gets exactly one reply {"id": id, "ok": true, ...} or
+# {"id": id, "ok": false, "error": message}. Commands:
+#   auth {"token"}              first command when the server has a token
+#   ping                        answered by the server thread
+#   subscribe / unsubscribe     result events on this connection, see below
+#   status                      phase, screen and round of every station
+#   shuffle                     start the shuffle of a round (shuffle screen)
+#   stop                        stop the shuffle; the reply has the number
+#   confirm                     go on to the wheel when confirm_number is set
+#   spin                        spin the wheel (wheel screen)
+#   presets {"wheel", "numbers"} 1-based presets of the next rounds
+#   reset                       put every prize back in play (remove_winners)
+#   restore {"number", "segment"} put a won number and/or 1-based segment back
+#   results {"since"}           results with a sequence number above since
+#   latency                     command-to-first-frame times of the spins
+# Subscribers get {"event": "spin", "station"} when a wheel starts and
+# {"event": "result", "seq", "station", "segment", "label", "number", "time"}
+# when it stops.
+
+Command = namedtuple("Command", "client message received")
+
+
+class ControlError(ValueError):
+    """A command that cannot run; the message goes back to the client."""
+
+
+class Client:
+    """One connection, with a bounded outbox drained by its own writer task."""
+
+    def __init__(self, writer, backlog):
+        self.writer = writer
+        self.outbox = asyncio.Queue(backlog)
+        self.subscribed = False
+        self.authorized = False
+        self.closed = False
+        self.overflowed = False
+
+    def send(self, message):
+        """Queue message (loop thread only); a client that fell backlog messages behind is dropped."""
+        if self.closed:
+            return False
+        try:
+            self.outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.close()
+            return False
+        return True
+
+    async def write_loop(self):
+        while True:
+            message = await self.outbox.get()
+            self.writer.write(json.dumps(message).encode() + b"\n")
+            await self.writer.drain()
+
+    def close(self):
+        self.closed = True
+        self.writer.close()
+
+
+class ControlServer:
+    """JSON-lines TCP server on an asyncio loop in a background thread.
+
+    Commands that touch the wheels are put on the bounded commands queue,
+    stamped with the perf_counter time they arrived, for the Tk thread to
+    run (see ControlBridge); a full queue answers "busy" instead of
+    blocking. reply() and broadcast() may be called from any thread. Every
+    client has a bounded outbox, so a console that stops reading is
+    disconnected rather than growing memory.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, token=None, max_commands=64, max_clients=8,
+                 backlog=256, max_line=65536):
+        self.host = host
+        self.port = port  # 0 picks a free port, set to the real one by start()
+        self.token = token
+        self.max_clients = max_clients
+        self.backlog = backlog
+        self.max_line = max_line
+        self.commands = queue.Queue(max_commands)
+        self.clients = set()
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+        self.rejected = 0  # Commands answered "busy"
+        self.disconnected = 0  # Clients dropped for not reading
+
+    def start(self):
+        """Start the server thread; returns once the port is bound. Raises OSError if it cannot be."""
+        self.thread = threading.Thread(target=self.run, name="control", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self.serve, self.host, self.port, limit=self.max_line)
+            )
+        except OSError as e:
+            self.error = e
+            self.ready.set()
+            self.loop.close()
+            return
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            for client in list(self.clients):
+                client.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+
+    def stop(self):
+        if self.thread is not None and self.thread.is_alive() and self.error is None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(1)
+
+    async def serve(self, reader, writer):
+        if len(self.clients) >= self.max_clients:
+            writer.write(b'{"ok": false, "error": "too many clients"}\n')
+            writer.close()
+            return
+        client = Client(writer, self.backlog)
+        client.authorized = self.token is None
+        self.clients.add(client)
+        writer_task = self.loop.create_task(client.write_loop())
+        try:
+            while not client.closed:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):  # Line over max_line, or the client vanished
+                    break
+                if not line:
+                    break
+                self.receive(client, line, time.perf_counter())
+        finally:
+            self.clients.discard(client)
+            writer_task.cancel()
+            if not client.closed:
+                client.close()
+            if client.overflowed:
+                self.disconnected += 1
+
+    def receive(self, client, line, received):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            client.send({"ok": False, "error": "invalid JSON"})
+            return
+        if not isinstance(message, dict):
+            client.send({"ok": False, "error": "a command must be a JSON object"})
+            return
+        reply = {"id": message.get("id")}
+        name = message.get("cmd")
+        if not client.authorized:
+            client.authorized = name == "auth" and message.get("token") == self.token
+            client.send(dict(reply, ok=True) if client.authorized else dict(reply, ok=False, error="unauthorized"))
+            return
+        if name in ("auth", "ping"):
+            client.send(dict(reply, ok=True))
+        elif name in ("subscribe", "unsubscribe"):
+            client.subscribed = name == "subscribe"
+            client.send(dict(reply, ok=True))
+        else:
+            try:
+                self.commands.put_nowait(Command(client, message, received))
+            except queue.Full:
+                self.rejected += 1
+                client.send(dict(reply, ok=False, error="busy"))
+
+    def reply(self, command, message):
+        self.loop.call_soon_threadsafe(command.client.send, message)
+
+    def broadcast(self, event):
+        """Send event to every subscribed client."""
+        self.loop.call_soon_threadsafe(self.send_event, event)
+
+    def send_event(self, event):
+        for client in list(self.clients):
+            if client.subscribed:
+                client.send(event)
+
+
+class ControlPlugin(Plugin):
+    """Reports one station's spins and results to the bridge."""
+
+    name = "control"
+
+    def __init__(self, bridge, number):
+        self.bridge = bridge
+        self.number = number
+
+    def before_spin(self, wheel, winner):
+        self.bridge.server.broadcast({"event": "spin", "station": self.number})
+
+    def on_frame(self, wheel, cursor, elapsed):
+        if self.bridge.waiting:
+            self.bridge.first_frame(wheel)
+
+    def on_result(self, wheel, segment):
+        self.bridge.result(self.number, wheel, segment)
+
+
+class ControlBridge:
+    """Runs the commands of a ControlServer on the Tk thread and reports the results.
+
+    The commands queue is drained by an after() poll every poll_ms, so a
+    spin command starts its animation on the next tick of the shared frame
+    scheduler. The time from a spin command's arrival on the server thread
+    to the first frame of its spin is kept in latencies (ms).
+    """
+
+    def __init__(self, root, stations, server, poll_ms=4, max_results=1000):
+        self.root = root
+        self.stations = stations
+        self.server = server
+        self.poll_ms = poll_ms
+        self.results = deque(maxlen=max_results)
+        self.sequence = itertools.count(1)
+        self.latencies = deque(maxlen=256)
+        self.waiting = {}  # Wheel -> arrival time of the command that spun it
+        for number, station in enumerate(stations, 1):
+            station.hooks.register(ControlPlugin(self, number))
+        self.job = root.after(poll_ms, self.poll)
+
+    def poll(self):
+        self.job = self.root.after(self.poll_ms, self.poll)
+        commands = self.server.commands
+        while True:
+            try:
+                command = commands.get_nowait()
+            except queue.Empty:
+                return
+            self.run(command)
+
+    def run(self, command):
+        message = command.message
+        reply = {"id": message.get("id"), "ok": True}
+        try:
+            handler = getattr(self, f"cmd_{message.get('cmd')}", None)
+            if handler is None:
+                raise ControlError(f"unknown command {message.get('cmd')!r}")
+            reply.update(handler(self.station(message), message, command.received) or {})
+        except (ValueError, PoolExhausted, InvalidTransition) as e:  # ControlError is a ValueError
+            reply = {"id": message.get("id"), "ok": False, "error": str(e) or type(e).__name__}
+        self.server.reply(command, reply)
+
+    def station(self, message):
+        number = message.get("station", 1)
+        if isinstance(number, bool) or not isinstance(number, int) or not 1 <= number <= len(self.stations):
+            raise ControlError(f"no station {number!r}, there are {len(self.stations)}")
+        return self.stations[number - 1]
+
+    def status(self, number, station):
+        return {
+            "station": number,
+            "name": station.name,
+            "screen": station.screens.current,
+            "phase": station.engine.phase,
+            "round": station.engine.play_count,
+            "segments": station.engine.segments,
+        }
+
+    # Commands, run on the Tk thread
+
+    def cmd_status(self, station, message, received):
+        return {"stations": [self.status(n, s) for n, s in enumerate(self.stations, 1)]}
+
+    def cmd_shuffle(self, station, message, received):
+        if not station.screens.is_current(station.shuffler):
+            raise ControlError("not on the shuffle screen")
+        if station.engine.phase == WHEEL_READY:
+            raise ControlError("the number waits for confirmation")
+        if not station.shuffler.running and station.shuffler.start():
+            raise ControlError("no numbers left")
+
+    def cmd_stop(self, station, message, received):
+        if not station.shuffler.running:
+            raise ControlError("not shuffling")
+        if station.shuffler.stop():
+            raise ControlError("no numbers left")
+        return {"number": station.shuffler.chosen_number}
+
+    def cmd_confirm(self, station, message, received):
+        if not station.screens.is_current(station.shuffler) or station.engine.phase != WHEEL_READY:
+            raise ControlError("no number to confirm")
+        station.shuffler.confirm()
+
+    def cmd_spin(self, station, message, received):
+        wheel = station.wheel
+        if not station.screens.is_current(wheel):
+            raise ControlError("not on the wheel screen")
+        if wheel.spinning:
+            raise ControlError("already spinning")
+        if station.on_space():
+            raise ControlError("no prizes left")
+        self.waiting[wheel] = received
+
+    def cmd_presets(self, station, message, received):
+        for field in ("wheel", "numbers"):
+            if message.get(field) is not None and not isinstance(message[field], list):
+                raise ControlError(f"{field} must be a list")
+        station.engine.push_presets(message.get("wheel"), message.get("numbers"))
+
+    def cmd_reset(self, station, message, received):
+        if station.engine.number_pool is None:
+            raise ControlError("winners are not removed, there is nothing to reset")
+        if station.reset_prizes():
+            raise ControlError("prizes cannot be reset while a shuffle or spin runs")
+
+    def cmd_restore(self, station, message, received):
+        number = message.get("number")
+        segment = message.get("segment")
+        for field, value in (("number", number), ("segment", segment)):
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+                raise ControlError(f"{field} must be an integer, not {value!r}")
+        if segment is not None and not 1 <= segment <= station.engine.segments:
+            raise ControlError(f"segment {segment} is outside 1..{station.engine.segments}")
+        if station.restore_prize(number, None if segment is None else segment - 1):
+            raise ControlError("nothing to restore: not drawn, or a shuffle or spin is running")
+
+    def cmd_results(self, station, message, received):
+        since = message.get("since", 0)
+        if isinstance(since, bool) or not isinstance(since, (int, float)):
+            raise ControlError(f"since must be a sequence number, not {since!r}")
+        return {"results": [result for result in self.results if result["seq"] > since]}
+
+    def cmd_latency(self, station, message, received):
+        return {"latency_ms": self.latency()}
+
+    # Hooks
+
+    def first_frame(self, wheel):
+        received = self.waiting.pop(wheel, None)
+        if received is not None:
+            self.latencies.append((time.perf_counter() - received) * 1000)
+
+    def result(self, number, wheel, segment):
+        self.waiting.pop(wheel, None)
+        result = {
+            "event": "result",
+            "seq": next(self.sequence),
+            "station": number,
+            "segment": segment + 1,
+            "label": wheel.labels[segment],
+            "number": wheel.engine.chosen_number,
+            "time": time.time(),
+        }
+        self.results.append(result)
+        self.server.broadcast(result)
+
+    def latency(self):
+        values = sorted(self.latencies)
+        return {
+            "count": len(values),
+            "p50": round(percentile(values, 50), 2),
+            "p95": round(percentile(values, 95), 2),
+            "max": round(values[-1], 2) if values else 0.0,
+        }
+
+    def close(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.server.stop()
+
+
+def open_control(root, stations, plan):
+    """Start the control server of plan for stations; None if it cannot bind its port."""
+    server = ControlServer(plan.control_host, plan.control_port, plan.control_token)
+    try:
+        server.start()
+    except OSError as e:
+        print(f"control server not started: {e}")
+        return None
+    print(f"control server on {plan.control_host}:{server.port}")
+    return ControlBridge(root, stations, server)
+
+
+class ControlClient:
+    """Blocking client of the control server, for consoles, scripts and tests.
+
+    command() returns the reply to the command it sent; events that arrive
+    in between are kept for next_event().
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, timeout=5.0):
+        self.socket = socket.create_connection((host, port), timeout)
+        self.file = self.socket.makefile("rb")
+        self.ids = itertools.count(1)
+        self.events = deque()
+
+    def send(self, message):
+        self.socket.sendall(json.dumps(message).encode() + b"\n")
+
+    def receive(self):
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("the server closed the connection")
+        return json.loads(line)
+
+    def command(self, name, **fields):
+        ident = next(self.ids)
+        self.send(dict(fields, cmd=name, id=ident))
+        while True:
+            message = self.receive()
+            if "event" in message:
+                self.events.append(message)
+            elif message.get("id") == ident:
+                return message
+
+    def next_event(self):
+        if self.events:
+            return self.events.popleft()
+        while True:
+            message = self.receive()
+            if "event" in message:
+                return message
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
@@ -0,0 +1,327 @@
+from alias_table import SegmentWeights
+from prize_pool import PoolExhausted, PrizePool, WeightedPrizePool
+from rng_streams import DISPLAY, SELECTION, RngStreams
+
+# Phases of a round
+IDLE = "idle"  # Shuffler screen, waiting for START
+SHUFFLING = "shuffling"  # Numbers are flickering
+WHEEL_READY = "wheel_ready"  # Number picked, waiting for the spin
+SPINNING = "spinning"  # Wheel animation running
+
+# Which phases each event may be sent in; spin is also allowed from IDLE
+# for wheel-only setups that never shuffle
+TRANSITIONS = {
+    "start_shuffle": ((IDLE,), SHUFFLING),
+    "shuffle_tick": ((SHUFFLING,), SHUFFLING),
+    "stop_shuffle": ((SHUFFLING,), WHEEL_READY),
+    "spin": ((IDLE, WHEEL_READY), SPINNING),
+    "finish_spin": ((SPINNING,), IDLE),
+}
+
+
+class InvalidTransition(Exception):
+    """An event was sent in a phase that does not accept it."""
+
+
+class WheelEngine:
+    """Selection logic of the number shuffler and the wheel, without any UI.
+
+    The engine owns the play count, the preset queues and the RNG, and is
+    driven by explicit events (see TRANSITIONS). Presets are 1-based as
+    written in the config: round n uses the n-th preset while there is one,
+    and the RNG afterwards. With wrap_presets the presets restart once they
+    are used up instead.
+
+    With weights the random segment is drawn from an alias table instead of
+    uniformly; the weights can be changed between spins.
+
+    Randomness comes from named streams (see RngStreams): the numbers
+    flickering during the shuffle use the display stream, results use the
+    selection stream (self.rng), so the shuffle rate never changes a result.
+    rng replaces the selection stream.
+
+    With without_replacement every number and segment that wins (preset or
+    not) leaves its prize pool until it is restored; a preset that already
+    won draws from the pool instead, and drawing from an empty pool raises
+    PoolExhausted.
+    """
+
+    def __init__(self, segments=20, shuffle_pool=(), shuffle_presets=(), wheel_presets=(),
+                 wrap_presets=False, seed=None, rng=None, weights=None, without_replacement=False,
+                 streams=None):
+        self.segments = segments
+        self.shuffle_pool = list(shuffle_pool)
+        self.shuffle_presets = list(shuffle_presets)
+        self.wheel_presets = [preset - 1 for preset in wheel_presets]
+        self.wrap_presets = wrap_presets
+        self.streams = streams if streams is not None else RngStreams(seed)
+        if rng is not None:
+            self.streams.replace(SELECTION, rng)
+        self.rng = self.streams[SELECTION]
+        self.display_rng = self.streams[DISPLAY]
+
+        # Prizes still in play, only kept without replacement
+        self.number_pool = None
+        self.segment_pool = None
+        if without_replacement:
+            self.number_pool = PrizePool(self.shuffle_pool)
+            self.segment_pool = WeightedPrizePool([1.0] * segments)
+
+        self.weights = None
+        if weights is not None:
+            self.set_weights(weights)
+
+        self.phase = IDLE
+        self.play_count = 0
+        self.shuffle_number = None  # Number shown by the last shuffle tick
+        self.chosen_number = None  # Result of the last stop_shuffle
+        self.winning_segment = None  # Result of the last spin (0-based)
+
+    def transition(self, event):
+        allowed, target = TRANSITIONS[event]
+        if self.phase not in allowed:
+            raise InvalidTransition(f"{event} is not allowed while {self.phase}")
+        self.phase = target
+
+    def handle(self, event):
+        """Send an event by name; returns the event's result."""
+        if event not in TRANSITIONS:
+            raise InvalidTransition(f"unknown event {event!r}")
+        return getattr(self, event)()
+
+    # Events
+
+    def start_shuffle(self):
+        """Start a round; raises PoolExhausted (staying IDLE) if every number has won already."""
+        if self.number_pool is not None and self.shuffle_pool and not len(self.number_pool):
+            raise PoolExhausted("every number has been drawn")
+        self.transition("start_shuffle")
+
+    def shuffle_tick(self):
+        """Pick the number shown for one frame of the shuffle."""
+        self.transition("shuffle_tick")
+        self.shuffle_number = self.pick_number(self.display_rng)
+        return self.shuffle_number
+
+    def stop_shuffle(self):
+        """Settle on the number of this round."""
+        self.transition("stop_shuffle")
+        try:
+            self.chosen_number = self.round_number(self.play_count)
+        except PoolExhausted:
+            # Back to the start of the round, so the pool can be restored or reset
+            self.phase = IDLE
+            raise
+        return self.chosen_number
+
+    def spin(self):
+        """Choose the winning segment of this round."""
+        phase = self.phase
+        self.transition("spin")
+        try:
+            self.winning_segment = self.round_segment(self.play_count)
+        except PoolExhausted:
+            self.phase = phase
+            raise
+        return self.winning_segment
+
+    def finish_spin(self):
+        """The wheel stopped; the round is over."""
+        self.transition("finish_spin")
+        self.advance_round()
+        return self.play_count
+
+    def advance_round(self):
+        self.play_count += 1
+        if self.wrap_presets and self.play_count >= len(self.wheel_presets):
+            self.play_count = 0
+
+    # Selection rules
+
+    def set_weights(self, weights):
+        """Replace every segment weight, or change some with a {segment: weight} mapping."""
+        if isinstance(weights, dict):
+            current = self.weights if self.weights is not None else SegmentWeights([1.0] * self.segments)
+            current.update(weights)  # Raises before changing anything
+            self.weights = current
+            changed = weights
+        elif len(weights) != self.segments:
+            raise ValueError(f"{len(weights)} weights for {self.segments} segments")
+        else:
+            self.weights = SegmentWeights(weights)
+            changed = dict(enumerate(self.weights.weights))
+
+        if self.segment_pool is not None:
+            for segment, weight in changed.items():
+                self.segment_pool.set_weight(segment, weight)
+
+    def push_presets(self, wheel=None, numbers=None):
+        """Use these presets (1-based segments, shuffle numbers) from the next round that needs one.
+
+        The presets of rounds already played stay; later ones are replaced.
+        Rounds between the two lists draw at random. Pushed presets are not
+        journaled, a restart or a config reload goes back to the config's.
+        """
+        if wheel is not None:
+            for preset in wheel:
+                if isinstance(preset, bool) or not isinstance(preset, int) or not 1 <= preset <= self.segments:
+                    raise ValueError(f"wheel preset {preset!r} is outside 1..{self.segments}")
+            start = self.play_count + (self.phase == SPINNING)
+            kept = self.wheel_presets[:start]
+            self.wheel_presets = kept + [None] * (start - len(kept)) + [preset - 1 for preset in wheel]
+        if numbers is not None:
+            for number in numbers:
+                if isinstance(number, bool) or not isinstance(number, int):
+                    raise ValueError(f"shuffle preset {number!r} is not an integer")
+                if self.shuffle_pool and number not in self.shuffle_pool:
+                    raise ValueError(f"shuffle preset {number} is not in the pool")
+            start = self.play_count + (self.phase in (WHEEL_READY, SPINNING))
+            kept = self.shuffle_presets[:start]
+            self.shuffle_presets = kept + [None] * (start - len(kept)) + list(numbers)
+
+    def segment_extents(self):
+        """Arc extent of every segment for the scene, or None for equal arcs."""
+        if self.segment_pool is not None:
+            return self.segment_pool.extents()
+        if self.weights is not None:
+            return self.weights.extents()
+        return None
+
+    def restore(self, number=None, segment=None):
+        """Put a won number and/or segment back in play; returns False if neither was drawn."""
+        restored = False
+        if number is not None and self.number_pool is not None:
+            restored |= self.number_pool.restore(number)
+        if segment is not None and self.segment_pool is not None:
+            restored |= self.segment_pool.restore(segment)
+        return restored
+
+    def reset_pools(self, keep=None):
+        """Put every prize back in play, except the number keep (that of a round in progress)."""
+        if self.number_pool is not None:
+            self.number_pool.reset()
+            if keep is not None:
+                self.number_pool.remove(keep)
+        if self.segment_pool is not None:
+            self.segment_pool.reset()
+
+    def pick_number(self, rng=None):
+        rng = rng if rng is not None else self.rng
+        if self.number_pool is not None:
+            return self.number_pool.peek(rng)
+        return self.shuffle_pool[int(rng.random() * len(self.shuffle_pool))]
+
+    def pick_segment(self):
+        if self.segment_pool is not None:
+            return self.segment_pool.peek(self.rng)
+        if self.weights is not None:
+            return self.weights.table.pick(self.rng.random())
+        return int(self.rng.random() * self.segments)
+
+    def round_number(self, play_count):
+        # A None preset (left by push_presets) is a random round
+        if play_count < len(self.shuffle_presets) and self.shuffle_presets[play_count] is not None:
+            number = self.shuffle_presets[play_count]
+        elif not self.shuffle_pool:  # Wheel-only setup
+            return None
+        else:
+            number = self.pick_number()
+        if self.number_pool is not None and not self.number_pool.remove(number):
+            # A preset that won already: draw from the numbers left instead
+            number = self.pick_number()
+            self.number_pool.remove(number)
+        return number
+
+    def round_segment(self, play_count):
+        if play_count < len(self.wheel_presets) and self.wheel_presets[play_count] is not None:
+            # A preset of 1 or less lands on the first segment
+            segment = max(0, self.wheel_presets[play_count])
+        else:
+            segment = self.pick_segment()
+        if self.segment_pool is not None and not self.segment_pool.remove(segment):
+            segment = self.pick_segment()  # The preset won already
+            self.segment_pool.remove(segment)
+        return segment
+
+    # Persistence
+
+    def get_state(self):
+        """Everything a restarted engine needs to continue, as plain data (RNG excluded)."""
+        state = {
+            "play_count": self.play_count,
+            "chosen_number": self.chosen_number,
+            "winning_segment": self.winning_segment,
+        }
+        if self.number_pool is not None:
+            state["numbers_drawn"] = self.number_pool.items[self.number_pool.size:]
+            state["number_order"] = list(self.number_pool.items)  # Draws depend on it
+            state["segments_drawn"] = [i for i in range(self.segments) if i not in self.segment_pool]
+        return state
+
+    def set_state(self, state):
+        """Continue from a get_state() result; the phase goes back to IDLE."""
+        self.phase = IDLE
+        self.play_count = state["play_count"]
+        self.chosen_number = state["chosen_number"]
+        self.winning_segment = state["winning_segment"]
+        if self.number_pool is not None:
+            self.reset_pools()
+            drawn = state.get("numbers_drawn", ())
+            try:
+                self.number_pool.arrange(state["number_order"], len(self.number_pool) - len(drawn))
+            except (KeyError, ValueError):  # An older state, or a config with another pool
+                for number in reversed(drawn):  # The last drawn is first: draw order
+                    self.number_pool.remove(number)
+            for segment in state.get("segments_drawn", ()):
+                self.segment_pool.remove(segment)
+
+    # Batch simulation
+
+    def simulate(self, rounds):
+        """Play rounds full rounds without shuffle ticks.
+
+        Returns (numbers, segments) and leaves the engine as if every round
+        had been played through the events, including the selection stream
+        (shuffle ticks only draw from the display stream).
+        """
+        if self.phase != IDLE:
+            raise InvalidTransition(f"simulate needs an idle engine, not {self.phase}")
+
+        numbers = []
+        segments = []
+
+        # Rounds that still touch a preset or a prize pool go through the scalar rules
+        while rounds > 0 and (self.play_count < len(self.shuffle_presets)
+                              or self.play_count < len(self.wheel_presets)
+                              or self.segment_pool is not None):
+            numbers.append(self.round_number(self.play_count))
+            segments.append(self.round_segment(self.play_count))
+            self.advance_round()
+            rounds -= 1
+
+        if rounds > 0:
+            # Every remaining round takes one number draw (if there is a pool),
+            # then one segment draw, in the same order as the events do
+            rand = self.rng.random
+            if self.shuffle_pool:
+                draws = [rand() for _ in range(2 * rounds)]
+                pool = self.shuffle_pool
+                pool_size = len(pool)
+                numbers.extend([pool[int(r * pool_size)] for r in draws[0::2]])
+                segment_draws = draws[1::2]
+            else:
+                numbers.extend([None] * rounds)
+                segment_draws = [rand() for _ in range(rounds)]
+            if self.weights is not None:
+                pick = self.weights.table.pick
+                segments.extend([pick(r) for r in segment_draws])
+            else:
+                wheel_size = self.segments
+                segments.extend([int(r * wheel_size) for r in segment_draws])
+            if not self.wrap_presets:
+                self.play_count += rounds
+
+        if segments:
+            self.chosen_number = numbers[-1]
+            self.winning_segment = segments[-1]
+        return numbers, segments
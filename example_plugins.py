@@ -0,0 +1,37 @@
+"""Example plugins; enable one by listing it in wheel.json:
+
+    "plugins": {"load": ["example_plugins:ResultLog"]}
+"""
+from collections import Counter
+
+from hooks import Plugin
+
+
+class ResultLog(Plugin):
+    """Prints every result with a running tally of the winning labels."""
+
+    name = "result-log"
+
+    def __init__(self):
+        self.tally = Counter()
+
+    def on_result(self, wheel, segment):
+        label = wheel.labels[segment]
+        self.tally[label] += 1
+        print(f"result: {label} (won {self.tally[label]}x)")
+
+
+class PassCounter(Plugin):
+    """Counts how often the highlight passes every segment during spins."""
+
+    name = "pass-counter"
+
+    def __init__(self):
+        self.passes = Counter()
+
+    def on_segment_change(self, wheel, segment):
+        self.passes[segment] += 1
+
+    def on_result(self, wheel, segment):
+        busiest = ", ".join(f"{wheel.labels[s]}: {n}" for s, n in self.passes.most_common(3))
+        print(f"most passed: {busiest}")
@@ -0,0 +1,124 @@
+import importlib
+import time
+import traceback
+
+# Lifecycle events plugins can subscribe to, with the arguments they get:
+#   before_spin(wheel, winner)         the winner is chosen, the animation starts
+#   on_frame(wheel, cursor, elapsed)   a spin frame is drawn
+#   on_segment_change(wheel, segment)  the highlight moved to another segment
+#   on_result(wheel, segment)          the wheel stopped on segment
+#   on_shuffle_tick(shuffler, number)  the shuffle shows a new number
+#   on_number(shuffler, number)        the shuffle stopped on the number of the round
+#   on_reload(station, plan)           a reloaded config took effect, between two rounds
+HOOKS = ("before_spin", "on_frame", "on_segment_change", "on_result", "on_shuffle_tick", "on_number", "on_reload")
+
+
+class Plugin:
+    """Optional base class; a plugin is any object with methods named after HOOKS."""
+
+    name = None
+
+
+def plugin_name(plugin):
+    return getattr(plugin, "name", None) or type(plugin).__name__
+
+
+class HookStats:
+    """Call count and time spent of one plugin in one hook."""
+
+    __slots__ = ("calls", "seconds", "max_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+
+class HookRegistry:
+    """Registered plugins, compiled into one tuple of callables per hook.
+
+    Every hook is an attribute holding a plain tuple, rebuilt only when a
+    plugin is registered, removed or disabled, so the call site is just
+
+        for hook in hooks.on_frame:
+            hook(wheel, cursor, elapsed)
+
+    and costs one empty-tuple loop when nothing is attached. With timing
+    each callable is wrapped to measure the plugin; a plugin that raises,
+    or whose calls average more than max_ms, is disabled and reported.
+    """
+
+    def __init__(self, timing=True, max_ms=None):
+        self.timing = timing
+        self.max_ms = max_ms
+        self.plugins = []
+        self.disabled = {}  # Plugin -> reason
+        self.stats = {}  # (plugin name, hook) -> HookStats
+        self.compile()
+
+    def register(self, plugin):
+        self.plugins.append(plugin)
+        self.compile()
+        return plugin
+
+    def unregister(self, plugin):
+        self.plugins.remove(plugin)
+        self.disabled.pop(plugin, None)
+        self.compile()
+
+    def load(self, spec):
+        """Register a plugin given as "module:Class" (the class is created without arguments)."""
+        module_name, _, class_name = spec.partition(":")
+        module = importlib.import_module(module_name)
+        return self.register(getattr(module, class_name or "Plugin")())
+
+    def disable(self, plugin, reason="disabled"):
+        self.disabled[plugin] = reason
+        self.compile()
+        print(f"plugin {plugin_name(plugin)} {reason}")
+
+    def enable(self, plugin):
+        if self.disabled.pop(plugin, None) is not None:
+            self.compile()
+
+    def compile(self):
+        for hook in HOOKS:
+            callables = []
+            for plugin in self.plugins:
+                method = getattr(plugin, hook, None)
+                if method is None or plugin in self.disabled:
+                    continue
+                callables.append(self.timed(plugin, hook, method) if self.timing else method)
+            setattr(self, hook, tuple(callables))
+
+    def timed(self, plugin, hook, method):
+        stats = self.stats.setdefault((plugin_name(plugin), hook), HookStats())
+        max_seconds = self.max_ms / 1000 if self.max_ms is not None else None
+        perf_counter = time.perf_counter
+
+        def call(*args):
+            started = perf_counter()
+            try:
+                method(*args)
+            except Exception:
+                traceback.print_exc()
+                self.disable(plugin, f"raised in {hook}")
+                return
+            elapsed = perf_counter() - started
+            stats.calls += 1
+            stats.seconds += elapsed
+            if elapsed > stats.max_seconds:
+                stats.max_seconds = elapsed
+            # Judge on the average of a few calls, not on one hiccup
+            if max_seconds is not None and stats.calls >= 10 and stats.seconds / stats.calls > max_seconds:
+                self.disable(plugin, f"too slow in {hook} ({stats.seconds / stats.calls * 1000:.2f} ms per call)")
+
+        return call
+
+    def report(self):
+        """Per plugin and hook: calls, mean and max milliseconds, slowest first."""
+        rows = [
+            (name, hook, s.calls, s.seconds / s.calls * 1000, s.max_seconds * 1000)
+            for (name, hook), s in self.stats.items() if s.calls
+        ]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
@@ -0,0 +1,251 @@
+import csv
+import json
+import math
+import os
+import time
+from array import array
+
+# One record per drawn spin frame. Times are milliseconds:
+#   time     time into the spin
+#   lag      how late the event loop ran the frame after its slot on the grid
+#   advance  cursor, trail and on_segment_change hooks
+#   collect  pre-rendered frames taken from the pipeline (sprite renderer)
+#   draw     draw_wheel: layout and restyling of the canvas items
+#   hooks    on_frame hooks
+#   frame    the whole spin_frame call
+# and counts: canvas items created and deleted since the previous frame, and
+# the frames the scheduler dropped so far in this spin
+FIELDS = ("time", "lag", "advance", "collect", "draw", "hooks", "frame", "created", "deleted", "dropped")
+
+# Shown on the HUD, in this order
+HUD_FIELDS = ("frame", "draw", "advance", "hooks", "collect", "lag")
+
+# Canvas methods that make an item
+CREATE_METHODS = (
+    "create_arc", "create_bitmap", "create_image", "create_line", "create_oval",
+    "create_polygon", "create_rectangle", "create_text", "create_window",
+)
+
+
+def percentile(values, q):
+    """Nearest-rank q-th percentile of values sorted ascending (0.0 if there are none)."""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+class FrameTrace:
+    """Fixed-size ring buffer of frame records, one array('d') per field.
+
+    Recording overwrites the oldest record once capacity is reached, so
+    memory stays the same however long the app runs. Records are numbered
+    from 0; `since` arguments select the records from a number on, as far
+    as they are still in the buffer.
+    """
+
+    def __init__(self, capacity=2048):
+        self.capacity = capacity
+        self.columns = [array("d", bytes(8 * capacity)) for _ in FIELDS]
+        self.count = 0  # Records made, including the overwritten ones
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def record(self, values):
+        i = self.count % self.capacity
+        for column, value in zip(self.columns, values):
+            column[i] = value
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def span(self, since=0):
+        return range(max(since, self.count - self.capacity), self.count)
+
+    def column(self, name, since=0):
+        column = self.columns[FIELDS.index(name)]
+        capacity = self.capacity
+        return [column[n % capacity] for n in self.span(since)]
+
+    def rows(self, since=0):
+        capacity = self.capacity
+        return [tuple(column[n % capacity] for column in self.columns) for n in self.span(since)]
+
+    def summary(self, since=0, fields=FIELDS[1:]):
+        """p50, p95, p99 and max of every field over the selected records."""
+        summary = {}
+        for name in fields:
+            values = sorted(self.column(name, since))
+            summary[name] = {
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": values[-1] if values else 0.0,
+            }
+        return summary
+
+    def export(self, path, since=0):
+        """Write the selected records to path: JSON (with the summary) for .json, CSV otherwise."""
+        rows = self.rows(since)
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"fields": FIELDS, "frames": rows, "summary": self.summary(since)}, f)
+            return
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(rows)
+
+
+class ItemCounter:
+    """Counts the items created on and deleted from a canvas while installed.
+
+    install() shadows the canvas' create_* and delete methods with counting
+    wrappers on the instance; uninstall() removes them again, so the
+    canvas costs nothing extra while nobody is counting.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.created = 0
+        self.deleted = 0
+        self.installed = False
+
+    def install(self):
+        if self.installed:
+            return
+        canvas = self.canvas
+        for name in CREATE_METHODS:
+            create = getattr(canvas, name, None)
+            if create is not None:  # Stand-in canvases may only have some of them
+                setattr(canvas, name, self.counting(create))
+        delete = canvas.delete
+
+        def counting_delete(*tags):
+            for tag in tags:
+                self.deleted += len(canvas.find_withtag(tag))
+            delete(*tags)
+
+        canvas.delete = counting_delete
+        self.installed = True
+
+    def counting(self, create):
+        def call(*args, **kwargs):
+            self.created += 1
+            return create(*args, **kwargs)
+
+        return call
+
+    def uninstall(self):
+        for name in CREATE_METHODS + ("delete",):
+            self.canvas.__dict__.pop(name, None)
+        self.installed = False
+
+
+class Instrumentation:
+    """Frame timings of the spin loop, kept in a FrameTrace.
+
+    The wheel only holds an Instrumentation while it is enabled (its probe
+    is None otherwise), so a disabled layer costs one None check per
+    phase of a frame. With trace_dir set, the frames of every spin are
+    written there when it ends, as spin-00001.csv (or .json).
+    """
+
+    def __init__(self, canvas, capacity=2048, trace_dir=None, trace_format="csv"):
+        self.trace = FrameTrace(capacity)
+        self.items = ItemCounter(canvas)
+        self.trace_dir = trace_dir
+        self.trace_format = trace_format
+        self.enabled = False
+        self.spin_start = 0  # Record number of the first frame of the current spin
+        self.last_created = 0
+        self.last_deleted = 0
+
+    def enable(self):
+        self.items.install()
+        self.enabled = True
+
+    def disable(self):
+        self.items.uninstall()
+        self.enabled = False
+
+    def begin_spin(self):
+        self.spin_start = self.trace.count
+        self.last_created = self.items.created
+        self.last_deleted = self.items.deleted
+
+    def frame(self, elapsed, lag, advance, collect, draw, hooks, total, dropped):
+        """Record one frame; times in seconds."""
+        items = self.items
+        self.trace.record((
+            elapsed * 1000, lag * 1000, advance * 1000, collect * 1000, draw * 1000, hooks * 1000, total * 1000,
+            items.created - self.last_created, items.deleted - self.last_deleted, dropped,
+        ))
+        self.last_created = items.created
+        self.last_deleted = items.deleted
+
+    def end_spin(self, number):
+        """Write the trace of spin number, if traces are wanted. Returns the path or None."""
+        if self.trace_dir is None:
+            return None
+        os.makedirs(self.trace_dir, exist_ok=True)
+        path = os.path.join(self.trace_dir, f"spin-{number:05d}.{self.trace_format}")
+        self.trace.export(path, self.spin_start)
+        return path
+
+
+class PerfHud:
+    """Overlay in the corner of a canvas with the percentiles of the recent frames.
+
+    The text is one canvas item, rewritten at most every interval seconds,
+    so the HUD does not cost a frame what it measures.
+    """
+
+    TAG = "hud"
+
+    def __init__(self, canvas, instrumentation, interval=0.25):
+        self.canvas = canvas
+        self.instrumentation = instrumentation
+        self.interval = interval
+        self.text_id = None
+        self.visible = False
+        self.refreshed = 0.0
+
+    def show(self):
+        if self.text_id is None:
+            self.text_id = self.canvas.create_text(
+                8, 8, anchor="nw", font=("Courier", 10), fill="#7CFC00", tags=self.TAG
+            )
+        self.canvas.itemconfig(self.text_id, state="normal")
+        self.visible = True
+        self.refresh(force=True)
+
+    def hide(self):
+        if self.text_id is not None:
+            self.canvas.itemconfig(self.text_id, state="hidden")
+        self.visible = False
+
+    def refresh(self, force=False):
+        if not self.visible:
+            return
+        now = time.perf_counter()
+        if not force and now - self.refreshed < self.interval:
+            return
+        self.refreshed = now
+        self.canvas.itemconfig(self.text_id, text=self.text())
+        self.canvas.tag_raise(self.TAG)  # A rebuilt scene would cover it
+
+    def text(self):
+        trace = self.instrumentation.trace
+        if not len(trace):
+            return "no frames yet"
+        summary = trace.summary(fields=HUD_FIELDS + ("created", "deleted"))
+        lines = [f"{'ms':<8}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}"]
+        for name in HUD_FIELDS:
+            s = summary[name]
+            lines.append(f"{name:<8}{s['p50']:>7.2f}{s['p95']:>7.2f}{s['p99']:>7.2f}{s['max']:>7.2f}")
+        dropped = trace.column("dropped", trace.count - 1)[0]
+        lines.append(f"items +{summary['created']['max']:.0f} -{summary['deleted']['max']:.0f} max/frame")
+        lines.append(f"frames {len(trace)}  dropped {dropped:.0f}")
+        return "\n".join(lines)
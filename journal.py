@@ -0,0 +1,233 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from engine import IDLE
+from rng_streams import pack_rng_state, unpack_rng_state
+
+# Events written to the journal
+NUMBER = "number"  # stop_shuffle settled on a number
+SEGMENT = "segment"  # spin chose the winning segment; the round counts as played
+RESTORE = "restore"  # won prizes back in play, result {"number": n, "segment": s} (either may be null)
+RESET = "reset"  # every prize back in play, result the number of the round in progress or null
+
+
+def write_atomic(path, data):
+    """Replace path with data so a crash leaves either the old or the new file."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    # The rename itself is only durable once the directory is synced (POSIX;
+    # Windows cannot open a directory)
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class DrawJournal:
+    """Append-only JSON-lines journal of every draw, safe against crashes.
+
+    Every number and segment result, and every restore or reset of the
+    prize pools, is appended with its timestamp, round and selection
+    stream state. Every snapshot_every records the full engine state is
+    written next to the journal together with the byte offset it covers,
+    so a restart reads the snapshot and replays at most snapshot_every
+    lines, however long the history is. A line torn by a crash is cut off.
+
+    With background=True the lines go through a queue to a writer thread
+    that commits them in groups: it waits up to group_delay seconds for up
+    to group_size lines, then writes them with a single fsync. record()
+    never blocks the Tk thread; close() commits whatever is left.
+    """
+
+    def __init__(self, path, snapshot_every=1000, background=True, group_size=64, group_delay=0.05):
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self.snapshot_every = snapshot_every
+        self.background = background
+        self.group_size = group_size
+        self.group_delay = group_delay
+
+        self.seq = 0  # Sequence number of the last record
+        self.since_snapshot = 0
+        self.file = None
+        self.queue = queue.Queue()
+        self.thread = None
+
+        self.commits = 0
+        self.committed = 0
+        self.replayed = 0
+
+    def restore(self, engine):
+        """Bring engine back to where the journal ends, then open it for appending."""
+        offset = 0
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = json.loads(f.read())
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if size < snapshot["offset"]:
+                # The journal was replaced or cut short since: replay all of it instead
+                os.remove(self.snapshot_path)
+                snapshot = None
+        if snapshot is not None:
+            engine.set_state(snapshot["engine"])
+            engine.streams.unpack(snapshot["streams"])
+            self.seq = snapshot["seq"]
+            offset = snapshot["offset"]
+
+        self.replayed = 0
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:  # Torn by a crash mid-write
+                        break
+                    self.apply(engine, record)
+                    offset += len(line)
+                    self.replayed += 1
+
+            # Drop anything after the last complete record
+            if os.path.getsize(self.path) != offset:
+                with open(self.path, "r+b") as f:
+                    f.truncate(offset)
+
+        self.since_snapshot = self.replayed
+        self.open()
+        return self.replayed
+
+    def apply(self, engine, record):
+        self.seq = record["seq"]
+        unpack_rng_state(engine.rng, record["rng"])
+        engine.phase = IDLE
+        if record["event"] == NUMBER:
+            engine.play_count = record["round"]
+            engine.chosen_number = record["result"]
+            if engine.number_pool is not None:
+                engine.number_pool.remove(record["result"])
+        elif record["event"] == RESTORE:
+            engine.restore(record["result"]["number"], record["result"]["segment"])
+        elif record["event"] == RESET:
+            engine.reset_pools(keep=record["result"])
+        else:
+            engine.play_count = record["round"]
+            engine.winning_segment = record["result"]
+            if engine.segment_pool is not None:
+                engine.segment_pool.remove(record["result"])
+            engine.advance_round()
+
+    def open(self):
+        if self.file is not None:
+            return
+        self.file = open(self.path, "ab")
+        if self.background:
+            self.thread = threading.Thread(target=self.commit_groups, daemon=True)
+            self.thread.start()
+
+    def record(self, event, engine, result):
+        """Journal a NUMBER, SEGMENT, RESTORE or RESET, right after the engine did it."""
+        if self.file is None:
+            self.open()
+        self.seq += 1
+        line = json.dumps({
+            "seq": self.seq,
+            "time": time.time(),
+            "event": event,
+            "round": engine.play_count,
+            "result": result,
+            "rng": pack_rng_state(engine.rng),
+        }, separators=(",", ":")).encode() + b"\n"
+
+        # The snapshot is taken now, so it matches the engine after this record
+        snapshot = None
+        self.since_snapshot += 1
+        if self.since_snapshot >= self.snapshot_every:
+            self.since_snapshot = 0
+            state = engine.get_state()
+            if event == SEGMENT:
+                state["play_count"] = self.next_round(engine)
+            snapshot = {"seq": self.seq, "engine": state, "streams": engine.streams.pack()}
+
+        if self.background:
+            self.queue.put((line, snapshot))
+        else:
+            self.commit([(line, snapshot)])
+
+    @staticmethod
+    def next_round(engine):
+        """play_count once the current round is over (the spin counts as played)."""
+        play_count = engine.play_count + 1
+        if engine.wrap_presets and play_count >= len(engine.wheel_presets):
+            play_count = 0
+        return play_count
+
+    def commit(self, group):
+        """Write a group of lines with one fsync, then any snapshot they carry."""
+        for line, _ in group:
+            self.file.write(line)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.commits += 1
+        self.committed += len(group)
+
+        offset = self.file.tell()
+        for line, snapshot in reversed(group):
+            if snapshot is not None:
+                snapshot["offset"] = offset
+                write_atomic(self.snapshot_path, json.dumps(snapshot).encode())
+                break
+            offset -= len(line)
+
+    def commit_groups(self):
+        """Writer thread: commit queued lines in groups until close()."""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            group = [item]
+            deadline = time.monotonic() + self.group_delay
+            closing = False
+            while len(group) < self.group_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                group.append(item)
+            self.commit(group)
+            if closing:
+                return
+
+    def close(self):
+        """Commit every queued record and close the file."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def stats(self):
+        return {
+            "seq": self.seq,
+            "queued": self.queue.qsize(),
+            "committed": self.committed,
+            "commits": self.commits,
+            "replayed": self.replayed,
+        }
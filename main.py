@@ -1,251 +1,314 @@
 import tkinter as tk
-import random
-import pygame
 import math
-import time
+import os
 import sys
-from PIL import ImageTk, Image
-
-root = tk.Tk()
-root.geometry("600x600")
-root.minsize(400, 400)
-root.config(bg="black")  # Set background color of the main window
-
-
-
-pygame.mixer.init()
-spin_sound = pygame.mixer.Sound("assets\\spin_sound.wav")
-img = Image.open("assets\\logo.png")
-r = 100
-img = img.resize([r, r])
-logo_image = ImageTk.PhotoImage(img)
-
-canvas = tk.Canvas(root, bg="black")
+import time
+from asset_manager import AssetManager
+from audio import AudioEngine
+from engine import IDLE, WHEEL_READY
+from hooks import HookRegistry
+from instrument import FrameTrace, Instrumentation, PerfHud
+from journal import NUMBER, RESET, RESTORE, SEGMENT, DrawJournal
+from palette import shared_palette
+from prize_pool import PoolExhausted
+from resize import ResizeDebouncer, wheel_geometry
+from scheduler import SharedScheduler
+from screens import ScreenManager
+from spin_plan import plan_spin
+from trail import Trail
+from wheel_config import ConfigWatcher, load_plan
+from wheel_lod import create_scene
+
+# Segments, presets, theme and round flow come from the config (see wheel_config.py)
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wheel.json")
 
 
 class LuckyWheel:
-    def __init__(self, master, win_list, canvas):
-
-        
-        # Original colors for segments
-        self.base_colors = ["#F5EEDC", "#ECB390"]
-        self.highlight_color = "#DD4A48"  # Light color for highlighting
-
-        # Brightened version of the original colors
-        self.brightened_colors = [self.brighten_color(c, self.highlight_color) for c in self.base_colors]
+    def __init__(self, app, canvas):
 
-        self.delay = 0
+        self.app = app
+        self.master = app.root
+        self.hooks = app.hooks
 
         # Canvas to draw the wheel
         self.canvas = canvas  # Set background color of the canvas
 
         # Winner label
-        self.winner_label = tk.Label(self.canvas, text="Press [space]", font=("Arial", 35), bg="black", fg=self.highlight_color)
+        self.winner_label = tk.Label(self.canvas, text="Press [space]", font=("Arial", 35), bg="black", fg=app.plan.highlight_color)
         self.winner_label.pack(pady=10)  # Add some padding to position it nicely
-        self.canvas.pack(fill=tk.BOTH, expand=True)
 
-        self.segments = 20
-        self.angle_per_segment = 360 / self.segments
-        self.current_angle = 0
-        self.trail_segments = []  # Store the previous highlighted segments for trail effect
-        self.master = master
+        self.scene = None
+        self.configure(app.engine, app.plan)
 
-        # Bind the resizing event
-        self.master.bind("<Configure>", self.on_resize)
+        # Resize events are filtered to the canvas and coalesced to one per frame
+        self.canvas_size = None
+        self.resizer = ResizeDebouncer(app.window, self.canvas, self.on_resize)
 
-        # Bind the spacebar key to the spin function
-        self.master.bind("<space>", self.spin_wheel)
+        # Spin frames run from the event loop on the scheduler every wheel of the process shares
+        self.scheduler = app.scheduler.animation()
+        self.probe = None  # Instrumentation while it is enabled, see Station.configure_instrumentation
 
         # Metadata
 
+        self.current_angle = 0
         self.current_segment = 0
         self.spinning = False
         self.first_spin = True
 
-        # Preset list
-        self.winner_preset_list = win_list
-        for i in range(len(self.winner_preset_list)):
-            self.winner_preset_list[i] -= 1
-        
-
-        #self.hide()
+    def configure(self, engine, plan):
+        """Use engine and plan from now on; the scene is only rebuilt if the segments changed."""
+        self.engine = engine
+        self.spin_rounds = plan.spin_rounds
+        self.margin = plan.wheel_margin
+
+        rebuild = (self.scene is None or engine.segments != self.segments
+                   or plan.labels != self.labels or plan.sprites != self.sprites)
+        self.segments = engine.segments
+        self.labels = plan.labels
+        self.sprites = plan.sprites
+        if rebuild:
+            if self.scene is not None:
+                self.canvas.delete(self.scene.TAG)
+            self.angle_per_segment = 360 / self.segments
+
+            # Colors for segments
+            self.base_colors = list(plan.base_colors)
+            self.highlight_color = plan.highlight_color  # Light color for highlighting
+
+            # Dimmed trail colors for every (base color, trail position), shared by the wheels with the same theme
+            self.palette = shared_palette(tuple(self.base_colors), self.highlight_color, self.segments)
+            self.trail_segments = Trail(self.segments)  # Store the previous highlighted segments for trail effect
+
+            # Retained scene: items are built once per geometry and restyled in place.
+            # Large wheels get a level-of-detail scene that merges narrow segments,
+            # sprites=True renders whole frames off-screen with PIL instead
+            self.scene = create_scene(self.canvas, self.segments, self.app.logo_image, sprites=plan.sprites, labels=self.labels)
+
+            # Sprite frames of a spin are rendered ahead on a worker thread
+            self.pipeline = None
+            if plan.sprites:
+                from prerender import FramePipeline  # Needs PIL, which the Tk scenes do not
+
+                self.pipeline = FramePipeline()
+        elif (list(plan.base_colors), plan.highlight_color) != (self.base_colors, self.highlight_color):
+            self.base_colors = list(plan.base_colors)
+            self.highlight_color = plan.highlight_color
+            self.palette = shared_palette(tuple(self.base_colors), self.highlight_color, self.segments)
+        self.winner_label.config(fg=self.highlight_color)
+
+        # Weighted prizes get proportional arcs, prizes already drawn none
+        self.scene.set_extents(engine.segment_extents())
+
+    def start_round(self):
+        """Reset the wheel for a new round; the items are kept."""
+        self.trail_segments.clear()
+        self.current_segment = 0
+        self.first_spin = True
+        self.winner_label.config(text="Press [space]")
+        self.scene.set_extents(self.engine.segment_extents())
+        if self.canvas_size is not None:
+            self.draw_wheel()
 
-    def on_resize(self, event):
-        """Adjust the wheel when the window is resized."""
-        self.canvas.config(width=event.width, height=event.height)
+    def on_resize(self, width, height):
+        """Redraw the wheel for a new canvas size."""
+        self.canvas_size = (width, height)
+        geometry = self.scene.geometry
         self.draw_wheel()
 
-    def draw_wheel(self):
-        try:
-            self.canvas.delete("all")
-        except:
-            sys.exit()
-
-        # Calculate radius and center based on current canvas size
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        self.radius = min(canvas_width, canvas_height) // 2 - 130
-        self.center_x = canvas_width // 2
-        self.center_y = int(canvas_height * 0.5)
-
-        for i in range(self.segments):
-            start_angle = i * self.angle_per_segment + self.current_angle
-            original_color = self.base_colors[i % len(self.base_colors)]
-
-            # Apply the trail effect: previous segments use the dimmed brightened color
-            if i in self.trail_segments:
-                trail_index = self.trail_segments.index(i)
-                dim_factor = min(0.99, 1 - (0.99 ** (trail_index + 1)))
-                color = self.apply_dim(self.brightened_colors[i % len(self.base_colors)], dim_factor, highlight_color=self.highlight_color)
-            else:
-                color = original_color
-
-            if len(self.trail_segments) > 0 and i == self.trail_segments[-1]:  # Highlight the current segment
-                color = self.highlight_color
+        # Frames rendered ahead for the old size are useless now
+        if self.spinning and self.scene.geometry != geometry:
+            self.start_pipeline(self.spin_cursor + 1)
 
-            self.canvas.create_arc(
-                self.center_x - self.radius, self.center_y - self.radius,
-                self.center_x + self.radius, self.center_y + self.radius,
-                start=start_angle, extent=self.angle_per_segment, fill=color
-            )
-
-            # Calculate position for number
-            text_angle = start_angle + self.angle_per_segment / 2
-            x = self.center_x + (self.radius + 30) * math.cos(math.radians(text_angle))
-            y = self.center_y - (self.radius + 30) * math.sin(math.radians(text_angle))
-
-            text_size = 0
-
-            if i == self.current_segment and self.spinning:
-                text_size = int(self.radius * 0.05 * 2)
-                text_color = self.highlight_color
-                self.winner_label.config(text=str(self.current_segment + 1))  # Clear the winner label
-            else:
-                text_color = "gray"
-                text_size = int(self.radius * 0.05 * 1.5)
-
-            if i == self.current_segment and not self.first_spin:
-                text_color = self.highlight_color
-                text_size = int(self.radius * 0.05 * 3)
-
-            self.canvas.create_image(self.center_x, self.center_y, image=logo_image)
-            self.canvas.create_text(x, y, text=str(i + 1), font=("Arial", text_size), fill=text_color)
-
-    def brighten_color(self, color, highlight_color):
-        """Brighten the color."""
-        color = color.lstrip('#')
-        highlight_color = highlight_color.lstrip("#")
-
-        r = (int(color[0:2], 16) + int(highlight_color[0:2], 16)) // 2
-        g = (int(color[2:4], 16) + int(highlight_color[2:4], 16)) // 2
-        b = (int(color[4:6], 16) + int(highlight_color[4:6], 16)) // 2
-
-        return f'#{r:02x}{g:02x}{b:02x}'
-
-    def apply_dim(self, color, dim_factor, highlight_color):
-        """Dim the color by the given factor."""
-        color = color.lstrip('#')
-        highlight_color = highlight_color.lstrip("#")
+    def draw_wheel(self):
+        # Radius and center for the canvas size, which only the resize events update
+        if self.canvas_size is None:
+            try:
+                self.canvas_size = (self.canvas.winfo_width(), self.canvas.winfo_height())
+            except tk.TclError:
+                sys.exit()
+        self.radius, self.center_x, self.center_y = wheel_geometry(*self.canvas_size, self.margin)
+
+        if self.spinning:
+            self.winner_label.config(text=self.labels[self.current_segment])
+
+        # Only rebuilds the items when the geometry changed, then restyles the segments that changed
+        self.scene.layout(self.center_x, self.center_y, self.radius, self.current_angle)
+        self.scene.draw(self.palette, self.trail_segments, self.current_segment, *self.label_styles())
+
+    def label_styles(self):
+        """(font, color) of the labels, and of the current segment's label."""
+        # Every label but the current one is small and gray
+        label_style = (("Arial", int(self.radius * 0.05 * 1.5)), "gray")
+        current_label_style = label_style
+        if self.spinning:
+            current_label_style = (("Arial", int(self.radius * 0.05 * 2)), self.highlight_color)
+        if not self.first_spin:
+            current_label_style = (("Arial", int(self.radius * 0.05 * 3)), self.highlight_color)
+        return label_style, current_label_style
+
+    def set_theme(self, base_colors, highlight_color):
+        """Change the wheel colors, switching to the trail color table of the new theme."""
+        self.base_colors = list(base_colors)
+        self.highlight_color = highlight_color
+        palette = shared_palette(tuple(self.base_colors), self.highlight_color, self.segments)
+        if palette is not self.palette:
+            self.palette = palette
+            self.draw_wheel()
 
-        r = int((int(color[0:2], 16) + int(highlight_color[0:2], 16)) * dim_factor / 2 + 30)
-        g = int((int(color[2:4], 16) + int(highlight_color[2:4], 16)) * dim_factor / 2 + 30)
-        b = int((int(color[4:6], 16) + int(highlight_color[4:6], 16)) * dim_factor / 2 + 30)
+    def set_weights(self, weights):
+        """Change the prize weights (all, or a {segment: weight} mapping) and resize the arcs."""
+        self.engine.set_weights(weights)
+        self.scene.set_extents(self.engine.segment_extents())
+        self.draw_wheel()
 
-        return f'#{r:02x}{g:02x}{b:02x}'
+        # Frames rendered ahead with the old arcs are useless now
+        if self.spinning:
+            self.start_pipeline(self.spin_cursor + 1)
 
     def spin_wheel(self, event=None):
-        global play_count, canvas
         if not self.spinning:
-            self.spinning = True
-            self.winner_label.config(text=str(self.current_segment + 1))  # Clear the winner label
-
-            # Determine the winning segment
-            self.winning_segment = 0
-            if play_count < len(self.winner_preset_list):
-                if self.winner_preset_list[play_count] > 0:
-                    self.winning_segment = self.winner_preset_list[play_count]
-            else:
-                self.winning_segment = random.randint(0, self.segments - 1)
+            # Determine the winning segment (preset or random, see WheelEngine)
+            try:
+                self.winning_segment = self.engine.spin()
+            except PoolExhausted:  # Every segment has won already
+                self.winner_label.config(text="No prizes left - F5 resets")
+                return 1
+            self.app.record(SEGMENT, self.winning_segment)
+            for hook in self.hooks.before_spin:
+                hook(self, self.winning_segment)
 
-            spin_count = 0
-            rounds = 5  # Number of initial fast rounds
-            self.delay = 0.01  # Initial delay for fast speed
-            total_spins = self.segments * rounds  # Total spins for the initial fast rounds
-            total_spins += self.winning_segment  # Add spins to reach winning segment
+            self.spinning = True
+            self.winner_label.config(text=self.labels[self.current_segment])  # Clear the winner label
 
-            while spin_count < total_spins:
-                self.current_segment = (spin_count % self.segments)
-                self.trail_segments.append(self.current_segment)
+            rounds = self.spin_rounds  # Number of initial fast rounds
 
-                if len(self.trail_segments) > self.segments:  # Limit the trail length
-                    self.trail_segments.pop(0)
+            # The whole timeline is planned (and cached) up front; playback is a cursor over it
+            self.spin_plan = plan_spin(self.segments, rounds, self.winning_segment)
+            self.spin_cursor = -1
+            self.start_pipeline(0)
 
-                self.draw_wheel()
-                self.master.update()
-                time.sleep(self.delay)
+            # Frames run from the Tk event loop, so input and resizing stay responsive
+            self.scheduler.start(self.spin_frame)
 
-                # Gradually slow down the spin after the fast rounds
-                self.delay = 1 / ((total_spins - spin_count) ** 1.5) + (1 / 60)
+            # The ticks follow the same timeline on the audio thread
+            self.app.audio.spin(self.spin_plan, self.scheduler.start_time, key=self.app.name)
+            if self.probe is not None:
+                self.probe.begin_spin()
+            return 0
 
-                trail_remove = min(5, (self.delay / 0.02))
-                for i in range(int(trail_remove)):
-                    if self.trail_segments:
-                        self.trail_segments.pop(0)
+        self.first_spin = False
 
-                spin_count += 1
-                spin_sound.play()
+        #confirmation here
 
-            # Finalize by highlighting the winning segment
-            self.trail_segments = [self.winning_segment]  # Eliminate all trails
-            self.current_segment = self.winning_segment
-            self.draw_wheel()
-            
-            play_count += 1
-            print(f"playcount : {play_count}")
+        #hide, go back to number shuffling
 
-            # Update the winner label with the winning segment
-            self.winner_label.config(text=f"Item: {self.winning_segment + 1}")
-            self.spinning = False
+    def start_pipeline(self, first):
+        """Pre-render the spin from cursor first onwards (sprite renderer only)."""
+        if self.pipeline is not None and self.scene.geometry is not None:
+            self.pipeline.start(self.spin_plan, self.scene, self.palette, *self.label_styles(), first=first)
+
+    def spin_frame(self, elapsed):
+        """Show the last frame of the spin plan that is due at `elapsed` seconds."""
+        probe = self.probe  # Instrumentation, None unless enabled
+        if probe is not None:
+            started = time.perf_counter()
+        times = self.spin_plan.times
+        cursor = self.spin_cursor
+        while cursor + 1 < len(times) and times[cursor + 1] <= elapsed:
+            cursor += 1
+
+        # Frames that fell behind are skipped, only the latest one is drawn
+        if cursor == self.spin_cursor:
+            return True
+
+        if cursor == len(times) - 1:
+            self.spin_cursor = cursor
+            self.finish_spin()
+            return False
+
+        # Push the segments passed since the last drawn frame (older ones would
+        # expire right away), then trim the trail to the planned length
+        frames = self.spin_plan.frames
+        frame = frames[cursor]
+        for step in range(max(self.spin_cursor + 1, cursor + 1 - frame.trail_length), cursor + 1):
+            self.trail_segments.push(frames[step].segment)
+        self.trail_segments.expire(len(self.trail_segments) - frame.trail_length)
+        self.spin_cursor = cursor
+
+        if frame.segment != self.current_segment:
+            for hook in self.hooks.on_segment_change:
+                hook(self, frame.segment)
+        self.current_segment = frame.segment
+        if probe is not None:
+            advanced = time.perf_counter()
+        if self.pipeline is not None:
+            self.pipeline.collect(self.scene, cursor)
+        if probe is not None:
+            collected = time.perf_counter()
+        self.draw_wheel()
+        if probe is not None:
+            drawn = time.perf_counter()
+        for hook in self.hooks.on_frame:
+            hook(self, cursor, elapsed)
+        if probe is not None:
+            done = time.perf_counter()
+            probe.frame(elapsed, self.scheduler.lag, advanced - started, collected - advanced,
+                        drawn - collected, done - drawn, done - started, self.scheduler.dropped_frames)
+            self.app.hud.refresh()
+        return True
+
+    def finish_spin(self):
+        if self.pipeline is not None:
+            self.pipeline.cancel()
+
+        # Finalize by highlighting the winning segment
+        self.trail_segments.reset([self.winning_segment])  # Eliminate all trails
+        self.current_segment = self.winning_segment
+        self.draw_wheel()
 
+        self.engine.finish_spin()
+        print(f"playcount : {self.engine.play_count}")
+        if self.probe is not None:
+            self.probe.end_spin(self.engine.play_count)
+            self.app.hud.refresh(force=True)
 
+        # Update the winner label with the winning segment
+        self.winner_label.config(text=f"Item: {self.labels[self.winning_segment]}")
+        self.spinning = False
+        for hook in self.hooks.on_result:
+            hook(self, self.winning_segment)
 
-            self.canvas.pack_forget()
-            NumberShuffler(root, number_shuffler_win_list, canvas)
-            return 0
+        self.app.round_finished()
 
-        self.first_spin = False
 
-        #confirmation here
+    def set_logo(self, image):
+        self.scene.set_image(image)
+        if self.canvas_size is not None and not self.spinning:
+            self.draw_wheel()
 
-        #hide, go back to number shuffling
-        
-    
     def hide(self):
         self.canvas.pack_forget()
 
-    
+
     def show(self):
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
 
 class NumberShuffler:
 
-    def __init__(self, master, win_list, canvas):
+    def __init__(self, app, canvas):
 
-        self.master = master
-        self.master.title("Lucky Wheel")
+        self.app = app
+        self.master = app.root
+        self.hooks = app.hooks
 
-        # Make the window resizable
-
-        # Canvas to draw the wheel
+        # Canvas holding the shuffler's widgets
         self.canvas = canvas
-        self.canvas.pack(padx=60, pady=60)
 
-        
-        self.preset_list = win_list
         self.chosen_number = None
         self.running = False
-        self.delay = 1 / 30  # 30Hz -> 1/30 seconds
+        self.job = None
+        self.configure(app.engine, app.plan)
 
         self.label = tk.Label(self.canvas, text="0", font=("Arial", 100), bg="black", fg="white", borderwidth=0)
         self.label.pack()
@@ -253,71 +316,415 @@ class NumberShuffler:
         self.prompt_start_stop = tk.Label(self.canvas, text="START", font=("Arial", 25), bg="black", fg="white", borderwidth=0)
         self.prompt_start_stop.pack()
 
-        self.button = tk.Button(self.canvas, image=logo_image, command=self.start, borderwidth=0, activebackground="black", bg="black")
+        # Shows "Start" until the logo is loaded
+        self.button = tk.Button(self.canvas, text="Start", font=("Arial", 20), command=self.start, borderwidth=0, activebackground="black", bg="black", fg="white")
         self.button.pack(pady=10)
 
-        # metadata
-        self.play_count = play_count
-        self.win_list = win_list
+        # Only shown while a stopped number waits for confirmation
+        self.confirm_button = tk.Button(self.canvas, text="Confirm", font=("Arial", 20), command=self.confirm)
 
+    def configure(self, engine, plan):
+        self.engine = engine
+        self.delay = 1 / plan.shuffle_rate  # 30Hz -> 1/30 seconds
+        self.confirm_number = plan.confirm_number
 
     def start(self):
+        if self.engine.phase == WHEEL_READY:  # The stopped number waits for confirmation
+            return 1
         if not self.running:
+            try:
+                self.engine.start_shuffle()
+            except PoolExhausted:  # Restore or reset the pool (F5), then START again
+                self.prompt_start_stop.config(text="NO NUMBERS LEFT - F5 RESETS")
+                return 1
             self.running = True
+            self.confirm_button.pack_forget()
             self.button.config(command=self.stop)
             self.prompt_start_stop.config(text="STOP")
             self.shuffle_numbers()
-        else:
-            self.stop()
+            return 0
+        return self.stop()
 
     def shuffle_numbers(self):
+        self.job = None
         if self.running:
-            self.chosen_number = random.choice(self.win_list)
+            self.chosen_number = self.engine.shuffle_tick()
             self.label.config(text=str(self.chosen_number))
-            self.master.after(int(self.delay * 1000), self.shuffle_numbers)
+            for hook in self.hooks.on_shuffle_tick:
+                hook(self, self.chosen_number)
+            self.job = self.master.after(int(self.delay * 1000), self.shuffle_numbers)
 
     def stop(self):
-        global play_count
         self.running = False
-        self.label.config(text=self.win_list[play_count])
+        if self.job is not None:
+            self.master.after_cancel(self.job)
+            self.job = None
+        try:
+            self.chosen_number = self.engine.stop_shuffle()
+        except PoolExhausted:  # Every number has won already
+            self.button.config(command=self.start)
+            self.prompt_start_stop.config(text="NO NUMBERS LEFT - F5 RESETS")
+            return 1
+        self.app.record(NUMBER, self.chosen_number)
+        for hook in self.hooks.on_number:
+            hook(self, self.chosen_number)
+        self.label.config(text=self.chosen_number)
         self.button.config(text="Start", command=self.start)
         self.prompt_start_stop.config(text="START")
 
-
-        clear_screen()
-        canvas = tk.Canvas(root, bg="black")
-        LuckyWheel(root, lucky_wheel_win_list, canvas)
+        if self.confirm_number:
+            # The wheel comes once the number is confirmed; the round has its number, no START until then
+            self.button.pack_forget()
+            self.prompt_start_stop.config(text="CONFIRM")
+            self.confirm_button.pack(pady=20)
+            return 0
+        self.confirm()
         return 0
-    
 
-def clear_screen():
-    global canvas
-    canvas.destroy()
-    canvas = None
-    canvas = tk.Canvas(root, bg="black")
-        
-#setup
-play_count = 0
+    def confirm(self):
+        self.confirm_button.pack_forget()
+        self.button.pack(pady=10)
+        self.prompt_start_stop.config(text="START")
+        self.app.number_chosen()
 
-# winners setup
-number_shuffler_win_list = [1,2,3,4,5]
-lucky_wheel_win_list     = [6,7,8,9,1]
+    def set_logo(self, image):
+        self.button.config(image=image)
 
+    def hide(self):
+        self.canvas.pack_forget()
+
+    def show(self):
+        self.canvas.pack(padx=60, pady=60)
 
 
+class Station:
+    """The shuffle and wheel screens of one prize station, built once and reused every round.
+
+    A station owns its engine (presets, prize pool and RNG streams), hooks,
+    journal and config watcher, and draws into parent. The image cache, the
+    audio engine and the frame scheduler are shared with the other
+    stations of the process. Screens are switched by showing and hiding
+    them, so a round creates no widgets, canvas items or bindings.
+    """
+
+    def __init__(self, root, parent, plan, assets, audio, scheduler, config_path=None, name="wheel"):
+        self.root = root
+        self.window = parent.winfo_toplevel()  # Gets the resize events of the canvases
+        self.name = name
+
+        self.plan = plan
+        self.pending_plan = None  # Reloaded config waiting for the next round
+
+        self.assets = assets
+        self.audio = audio
+        self.scheduler = scheduler
+        self.logo_image = None
+
+        # Play count, presets and RNG of every round live in the engine
+        self.engine = plan.create_engine()
+
+        # Plugins named in the config ("module:Class") subscribe to the spin lifecycle
+        self.hooks = HookRegistry(max_ms=plan.plugin_max_ms)
+        for spec in plan.plugins:
+            self.hooks.load(spec)
+
+        # Every result is journaled; a restart continues at the same round and RNG state
+        self.journal = None
+        if plan.journal is not None:
+            self.journal = DrawJournal(plan.journal)
+            self.journal.restore(self.engine)
+
+        self.screens = ScreenManager()
+        self.shuffler = self.screens.add("shuffler", NumberShuffler(self, tk.Canvas(parent, bg="black")))
+        self.wheel = self.screens.add("wheel", LuckyWheel(self, tk.Canvas(parent, bg="black")))
+
+        # Frame timings of the spin loop; F3 toggles the HUD, and the timings with it
+        self.instrument = Instrumentation(self.wheel.canvas, plan.trace_frames)
+        self.hud = PerfHud(self.wheel.canvas, self.instrument)
+        self.configure_instrumentation(plan)
+
+        self.watcher = ConfigWatcher(root, config_path, self.on_config_change) if config_path else None
+        self.screens.show("shuffler" if plan.shuffle_screen else "wheel")
+        self.audio.load(plan.spin_sound)
+        self.assets.request_image(plan.logo, plan.logo_size, self.set_logo)
+
+    def set_logo(self, image):
+        self.logo_image = image
+        self.shuffler.set_logo(image)
+        self.wheel.set_logo(image)
+
+    def configure_instrumentation(self, plan):
+        if self.instrument.trace.capacity != plan.trace_frames:
+            self.instrument.trace = FrameTrace(plan.trace_frames)
+        self.instrument.trace_dir = plan.trace_dir
+        self.instrument.trace_format = plan.trace_format
+        self.set_instrumentation(plan.instrument or plan.hud, plan.hud)
+
+    def set_instrumentation(self, enabled, hud):
+        if enabled:
+            self.instrument.enable()
+            self.wheel.probe = self.instrument
+        else:
+            self.instrument.disable()
+            self.wheel.probe = None
+        if hud:
+            self.hud.show()
+        else:
+            self.hud.hide()
 
-NumberShuffler(root, number_shuffler_win_list, canvas)
-    
+    def toggle_hud(self, event=None):
+        if self.hud.visible:
+            self.set_instrumentation(self.plan.instrument, False)
+        else:
+            self.set_instrumentation(True, True)
+
+    def on_space(self, event=None):
+        if self.screens.is_current(self.wheel):
+            return self.wheel.spin_wheel(event)
+
+    def record(self, event, result):
+        if self.journal is not None:
+            self.journal.record(event, self.engine, result)
+
+    def reset_prizes(self, event=None):
+        """Put every prize back in play (F5); returns 1 while a shuffle or spin runs."""
+        engine = self.engine
+        if self.shuffler.running or self.wheel.spinning or engine.number_pool is None:
+            return 1
+        # A number already stopped on stays the number of its round
+        keep = engine.chosen_number if engine.phase == WHEEL_READY else None
+        engine.reset_pools(keep)
+        self.record(RESET, keep)
+        self.prizes_changed()
+        return 0
 
-if __name__ == "__main__":
+    def restore_prize(self, number=None, segment=None):
+        """Put a won number and/or 0-based segment back in play; returns 1 if there was none to."""
+        engine = self.engine
+        if self.shuffler.running or self.wheel.spinning:
+            return 1
+        if engine.phase == WHEEL_READY and number == engine.chosen_number:
+            number = None  # Still the number of the round in progress
+        if not engine.restore(number, segment):
+            return 1
+        self.record(RESTORE, {"number": number, "segment": segment})
+        self.prizes_changed()
+        return 0
+
+    def prizes_changed(self):
+        if self.screens.is_current(self.wheel):
+            self.wheel.start_round()  # New arcs, and "Press [space]" again
+        else:
+            self.wheel.scene.set_extents(self.engine.segment_extents())
+        if self.screens.is_current(self.shuffler) and self.engine.phase == IDLE:
+            self.shuffler.prompt_start_stop.config(text="START")
+
+    def number_chosen(self):
+        self.wheel.start_round()
+        self.screens.show("wheel")
+
+    def round_finished(self):
+        self.next_round()
+        if self.plan.shuffle_screen and self.plan.back_to_shuffle:
+            self.screens.show("shuffler")
+
+    def on_config_change(self, new_plan):
+        """Hot reload: the new config takes over when the next round starts."""
+        self.pending_plan = new_plan
+        if not self.wheel.spinning and not self.shuffler.running and self.engine.phase == IDLE:
+            self.next_round()
+
+    def next_round(self):
+        """Switch to a reloaded config, if there is one, between two rounds."""
+        if self.pending_plan is None:
+            return
+        # Round count, drawn prizes and RNG streams carry over to the new config
+        state = self.engine.get_state()
+        self.engine = self.pending_plan.create_engine(streams=self.engine.streams)
+        self.engine.set_state(state)
+        old_plan = self.plan
+        self.plan, self.pending_plan = self.pending_plan, None
+        if self.plan.spin_sound != old_plan.spin_sound:
+            self.audio.load(self.plan.spin_sound)
+        self.shuffler.configure(self.engine, self.plan)
+        self.wheel.configure(self.engine, self.plan)
+        self.configure_instrumentation(self.plan)
+        if self.screens.is_current(self.wheel) and self.wheel.canvas_size is not None:
+            self.wheel.draw_wheel()
+        if (self.plan.logo, self.plan.logo_size) != (old_plan.logo, old_plan.logo_size):
+            self.assets.request_image(self.plan.logo, self.plan.logo_size, self.set_logo)
+        for hook in self.hooks.on_reload:
+            hook(self, self.plan)
+        print(f"{self.name}: config reloaded")
+
+    def close(self):
+        """Stop this station's timers and journal; the shared services stay up."""
+        self.wheel.scheduler.cancel()
+        self.audio.cancel(key=self.name)
+        if self.watcher is not None:
+            self.watcher.cancel()
+        if self.journal is not None:
+            self.journal.close()
+
+
+class LuckyWheelApp(Station):
+    """A single station filling the window, with <space>, <F3> and <F5> bound to it."""
+
+    def __init__(self, root, plan, config_path=None, audio=None):
+        root.title("Lucky Wheel")
+        root.geometry("600x600")
+        root.minsize(400, 400)
+        root.config(bg="black")  # Set background color of the main window
+
+        # The logo and the tick load on worker threads while the first screen is showing
+        super().__init__(
+            root, root, plan, AssetManager(root), audio if audio is not None else AudioEngine(),
+            SharedScheduler(root), config_path,
+        )
+
+        # Bind the spacebar key to the spin function
+        self.root.bind("<space>", self.on_space)
+        self.root.bind("<F3>", self.toggle_hud)
+        self.root.bind("<F5>", self.reset_prizes)
+
+        # An operator console can drive the station over the network (see control.py)
+        self.control = None
+        if plan.control:
+            from control import open_control  # asyncio is only imported when it is used
+
+            self.control = open_control(root, [self], plan)
+
+        # Mirror displays in other processes read the wheel state from shared memory
+        self.publisher = None
+        if plan.publish:
+            from shared_state import open_publisher
+
+            self.publisher = open_publisher(self, plan)
+
+    def close(self):
+        super().close()
+        if self.control is not None:
+            self.control.close()
+        if self.publisher is not None:
+            self.publisher.close()
+        self.assets.cancel()
+        self.audio.close()
+
+
+class MultiStationApp:
+    """Several independent stations in one process, in a grid of one window or in a window each.
+
+    Decoded images, palettes, the audio engine and one frame scheduler are
+    shared; each station keeps its own engine, presets and RNG streams.
+    Keys 1-9 spin the station with that number. In the grid, <space> spins
+    every station showing its wheel, <F3> toggles every HUD and <F5> puts
+    the prizes of every idle station back in play; with toplevels=True
+    they act on the station of the focused window.
+    """
+
+    def __init__(self, root, plans, config_paths=None, audio=None, columns=None, toplevels=False):
+        self.root = root
+        self.root.title("Lucky Wheel")
+        self.root.config(bg="black")
+
+        self.assets = AssetManager(root)
+        self.audio = audio if audio is not None else AudioEngine()
+        self.scheduler = SharedScheduler(root)
+
+        count = len(plans)
+        columns = columns or math.ceil(math.sqrt(count))
+        rows = math.ceil(count / columns)
+        if toplevels:
+            self.root.withdraw()  # Every station has a window of its own
+        else:
+            self.root.geometry(f"{min(1800, 450 * columns)}x{min(1000, 450 * rows)}")
+            self.root.minsize(200 * columns, 200 * rows)
+
+        self.stations = []
+        for i, plan in enumerate(plans):
+            name = f"station {i + 1}"
+            if toplevels:
+                parent = tk.Toplevel(root, bg="black")
+                parent.title(f"Lucky Wheel - {name}")
+                parent.geometry("600x600")
+                parent.protocol("WM_DELETE_WINDOW", self.root.destroy)
+            else:
+                parent = tk.Frame(root, bg="black")
+                parent.grid(row=i // columns, column=i % columns, sticky="nsew")
+            config_path = config_paths[i] if config_paths else None
+            station = Station(root, parent, plan, self.assets, self.audio, self.scheduler, config_path, name)
+            if toplevels:
+                parent.bind("<space>", station.on_space)
+                parent.bind("<F3>", station.toggle_hud)
+                parent.bind("<F5>", station.reset_prizes)
+            self.stations.append(station)
+        if not toplevels:
+            for row in range(rows):
+                self.root.rowconfigure(row, weight=1)
+            for column in range(columns):
+                self.root.columnconfigure(column, weight=1)
+            self.root.bind("<space>", self.spin_all)
+            self.root.bind("<F3>", self.toggle_huds)
+            self.root.bind("<F5>", self.reset_all)
+        for i, station in enumerate(self.stations[:9]):
+            self.root.bind_all(str(i + 1), station.on_space)
+
+        # One control server for all stations, configured by the first station's config
+        self.control = None
+        if plans[0].control:
+            from control import open_control
+
+            self.control = open_control(root, self.stations, plans[0])
+
+        # Each station publishes to a region of its own, named after its number
+        self.publishers = []
+        for i, (station, plan) in enumerate(zip(self.stations, plans)):
+            if plan.publish:
+                from shared_state import open_publisher
+
+                publisher = open_publisher(station, plan, f"_{i + 1}")
+                if publisher is not None:
+                    self.publishers.append(publisher)
+
+    def spin_all(self, event=None):
+        for station in self.stations:
+            station.on_space(event)
+
+    def toggle_huds(self, event=None):
+        for station in self.stations:
+            station.toggle_hud(event)
+
+    def reset_all(self, event=None):
+        for station in self.stations:
+            station.reset_prizes(event)
+
+    def close(self):
+        for station in self.stations:
+            station.close()
+        if self.control is not None:
+            self.control.close()
+        for publisher in self.publishers:
+            publisher.close()
+        self.assets.cancel()
+        self.audio.close()
+
+
+def main(config_path=CONFIG_PATH):
+    root = tk.Tk()
+    app = LuckyWheelApp(root, load_plan(config_path), config_path)
     root.mainloop()
+    app.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else CONFIG_PATH)
 
 
 """
-A callback is a function that is passed as an 
-argument to another function or object, which 
-is then called at a later time when a specific 
-event or condition occurs. It essentially allows 
+A callback is a function that is passed as an
+argument to another function or object, which
+is then called at a later time when a specific
+event or condition occurs. It essentially allows
 you to specify a sequence of actions that should
  be performed in response to an event.
- """
\ No newline at end of file
+ """
@@ -0,0 +1,141 @@
+"""Mirror display: shows the wheel of a running app from another process.
+
+The app publishes its wheel state to shared memory when its config says
+"publish": {"enabled": true}; this window reads it at frame rate with
+StateReader and draws the same wheel, trail and winner. It only reads,
+so any number of mirrors can run, and they can start before or after the
+app; they attach again when the app restarts. Stations of a multi-station
+app publish as lucky_wheel_1, _2, ...
+
+    python mirror.py [name]         (default lucky_wheel)
+    python mirror.py --file PATH    (for "publish": {"file": PATH})
+"""
+import argparse
+import tkinter as tk
+
+from palette import shared_palette
+from resize import wheel_geometry
+from scheduler import FrameScheduler
+from shared_state import SHUFFLING, SPINNING, StateReader
+from trail import Trail
+from wheel_lod import create_scene
+
+
+class Mirror:
+    def __init__(self, root, name, path=None, margin=60):
+        self.root = root
+        self.name = name
+        self.path = path
+        self.margin = margin
+        self.canvas = tk.Canvas(root, bg="black", highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.title_id = self.canvas.create_text(0, 20, text="waiting for the wheel...", fill="white",
+                                                font=("Arial", 28), anchor="n")
+
+        self.reader = None
+        self.meta_generation = 0
+        self.scene = None
+        self.palette = None
+        self.trail = None
+        self.size = None
+
+        # Polls on the frame grid; only a changed sequence costs more than one read
+        self.scheduler = FrameScheduler(root)
+        self.scheduler.start(self.frame)
+
+    def attach(self):
+        try:
+            self.reader = StateReader(self.name, self.path)
+        except (FileNotFoundError, ValueError):  # The app is not publishing yet
+            self.reader = None
+
+    def detach(self):
+        """Drop a region its publisher left, and wait for the next one."""
+        self.reader.close()
+        self.reader = None
+        self.meta_generation = 0
+        self.canvas.itemconfig(self.title_id, text="waiting for the wheel...", fill="white")
+
+    def frame(self, elapsed):
+        # About twice a second: attach, or check the app did not close or restart
+        check = self.scheduler.frame % 30 == 0
+        if self.reader is None:
+            if check:
+                self.attach()
+            return True
+        if check and self.reader.replaced():
+            self.detach()
+            return True
+        size = (self.canvas.winfo_width(), self.canvas.winfo_height())
+        if not self.reader.changed() and size == self.size:
+            return True
+        self.draw(self.reader.read(), size)
+        return True
+
+    def configure(self, meta):
+        """Rebuild the scene for new labels, colors or arcs."""
+        segments = meta["segments"]
+        if self.scene is None or self.scene.segments != segments or self.scene.texts != meta["labels"]:
+            self.canvas.delete("wheel")
+            self.scene = create_scene(self.canvas, segments, labels=tuple(meta["labels"]))
+            self.trail = Trail(segments)
+            self.size = None
+        self.palette = shared_palette(tuple(meta["base_colors"]), meta["highlight_color"], segments)
+        self.scene.set_extents(meta["extents"])
+
+    def draw(self, state, size):
+        reader = self.reader
+        if reader.meta is None:
+            return
+        if state.meta_generation != self.meta_generation:
+            self.configure(reader.meta)
+            self.meta_generation = state.meta_generation
+        self.size = size
+
+        labels = reader.meta["labels"]
+        highlight = reader.meta["highlight_color"]
+        segments = len(labels)
+        trail = state.trail
+        if not 0 <= state.segment < segments or (trail and not 0 <= min(trail) <= max(trail) < segments):
+            return  # The meta is of another wheel (the publisher could not fit the new one)
+        radius, center_x, center_y = wheel_geometry(*size, self.margin)
+        self.trail.reset(state.trail)
+        if state.phase == SPINNING or state.winner is None:
+            title = labels[state.segment]
+        elif state.winner < segments:
+            title = f"Item: {labels[state.winner]}"
+        else:
+            title = ""
+        if state.phase == SHUFFLING and state.number is not None:
+            title = str(state.number)
+        self.canvas.coords(self.title_id, center_x, 10)
+        self.canvas.itemconfig(self.title_id, text=title, fill=highlight)
+
+        label_style = (("Arial", int(radius * 0.075)), "gray")
+        current_label_style = (("Arial", int(radius * 0.1)), highlight)
+        self.scene.layout(center_x, center_y, radius)
+        self.scene.draw(self.palette, self.trail, state.segment, label_style, current_label_style)
+
+    def close(self):
+        self.scheduler.cancel()
+        if self.reader is not None:
+            self.reader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name", nargs="?", default="lucky_wheel", help="shared memory block of the wheel")
+    parser.add_argument("--file", help="mapped file the wheel publishes to instead")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.title(f"Lucky Wheel mirror - {args.file or args.name}")
+    root.geometry("600x600")
+    root.config(bg="black")
+    mirror = Mirror(root, args.name, args.file)
+    root.mainloop()
+    mirror.close()
+
+
+if __name__ == "__main__":
+    main()
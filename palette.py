@@ -0,0 +1,88 @@
+from functools import lru_cache
+
+
+def brighten_color(color, highlight_color):
+    """Brighten the color."""
+    color = color.lstrip('#')
+    highlight_color = highlight_color.lstrip("#")
+
+    r = (int(color[0:2], 16) + int(highlight_color[0:2], 16)) // 2
+    g = (int(color[2:4], 16) + int(highlight_color[2:4], 16)) // 2
+    b = (int(color[4:6], 16) + int(highlight_color[4:6], 16)) // 2
+
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def apply_dim(color, dim_factor, highlight_color):
+    """Dim the color by the given factor."""
+    color = color.lstrip('#')
+    highlight_color = highlight_color.lstrip("#")
+
+    r = int((int(color[0:2], 16) + int(highlight_color[0:2], 16)) * dim_factor / 2 + 30)
+    g = int((int(color[2:4], 16) + int(highlight_color[2:4], 16)) * dim_factor / 2 + 30)
+    b = int((int(color[4:6], 16) + int(highlight_color[4:6], 16)) * dim_factor / 2 + 30)
+
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def trail_dim_factor(trail_index):
+    """Dim factor of the segment at trail_index (0 is the oldest)."""
+    return min(0.99, 1 - (0.99 ** (trail_index + 1)))
+
+
+class Palette:
+    """Precomputed segment colors for one theme.
+
+    trail_colors[k][trail_index] holds the dimmed color of a segment using
+    base color k at that trail position, so the render loop only does table
+    lookups. The table is rebuilt only when the theme or the trail length
+    changes.
+    """
+
+    def __init__(self, base_colors, highlight_color, trail_length):
+        self.base_colors = None
+        self.highlight_color = None
+        self.trail_length = 0
+        self.set_theme(base_colors, highlight_color, trail_length)
+
+    def set_theme(self, base_colors, highlight_color, trail_length=None):
+        """Rebuild the tables if the theme changed. Returns True if it did."""
+        base_colors = tuple(base_colors)
+        if trail_length is None:
+            trail_length = self.trail_length
+        if (base_colors, highlight_color, trail_length) == (self.base_colors, self.highlight_color, self.trail_length):
+            return False
+
+        self.base_colors = base_colors
+        self.highlight_color = highlight_color
+        self.trail_length = trail_length
+
+        # Brightened version of the original colors
+        self.brightened_colors = tuple(brighten_color(c, highlight_color) for c in base_colors)
+
+        # The dim factor saturates at 0.99 after a few hundred positions, so long
+        # trails only compute the distinct part and repeat the saturated color
+        dim_factors = []
+        for trail_index in range(trail_length):
+            dim_factor = trail_dim_factor(trail_index)
+            dim_factors.append(dim_factor)
+            if dim_factor >= 0.99:
+                break
+        saturated = trail_length - len(dim_factors)
+
+        trail_colors = []
+        for c in self.brightened_colors:
+            row = [apply_dim(c, f, highlight_color) for f in dim_factors]
+            trail_colors.append(tuple(row + row[-1:] * saturated))
+        self.trail_colors = tuple(trail_colors)
+        return True
+
+
+@lru_cache(maxsize=32)
+def shared_palette(base_colors, highlight_color, trail_length):
+    """Palette for a theme, built once and shared by every wheel that uses it.
+
+    base_colors must be a tuple. Shared palettes are read-only: a wheel that
+    changes its theme asks for another one instead of calling set_theme.
+    """
+    return Palette(base_colors, highlight_color, trail_length)
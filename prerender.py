@@ -0,0 +1,142 @@
+import bisect
+import queue
+import threading
+import time
+from collections import deque
+
+from PIL import ImageTk
+
+
+def displayed_cursors(plan, fps=60, first=0):
+    """Plan frames that a fps frame grid will actually show, in order.
+
+    The resting frame is left out, it is drawn by finish_spin.
+    """
+    cursors = []
+    last = len(plan.times) - 1
+    slot = 0
+    while True:
+        cursor = bisect.bisect_right(plan.times, slot / fps) - 1
+        if cursor >= last:
+            return cursors
+        if cursor >= first and (not cursors or cursor != cursors[-1]):
+            cursors.append(cursor)
+        slot += 1
+
+
+class FramePipeline:
+    """Renders the upcoming frames of a spin on a worker thread.
+
+    The worker rasterizes frames with the scene's SpriteWheelRenderer into a
+    bounded queue and blocks when it is full, so it never runs more than
+    `depth` frames ahead. The Tk thread calls collect() from its after()
+    callback to move finished frames into the scene's sprite cache; the
+    normal draw then finds them there. Starting a new spin or cancel()
+    (on resize) bumps the generation, and the worker and stale queue
+    entries of the old one are dropped.
+    """
+
+    def __init__(self, depth=8, fps=60):
+        self.queue = queue.Queue(depth)
+        self.fps = fps
+        self.generation = 0
+        self.cancelled = threading.Event()
+        self.thread = None
+        self.pending = None  # Frame taken from the queue ahead of the cursor
+
+        self.rendered = 0
+        self.collected = 0
+        self.discarded = 0
+        self.latencies = deque(maxlen=240)
+
+    def start(self, plan, scene, palette, label_style, current_label_style, first=0):
+        """Start rendering the frames of plan from cursor first onwards."""
+        self.cancel()
+        self.cancelled = threading.Event()
+
+        # Everything the worker needs is captured here, on the Tk thread
+        renderer = scene.renderer_for(palette)
+        prefix = scene.key_prefix(palette)
+        jobs = displayed_cursors(plan, self.fps, first)
+
+        self.thread = threading.Thread(
+            target=self.produce,
+            args=(self.generation, self.cancelled, plan, jobs, renderer, prefix,
+                  palette.trail_colors, label_style, current_label_style),
+            daemon=True,
+        )
+        self.thread.start()
+
+    def cancel(self):
+        """Stop the worker and drop every queued frame."""
+        self.generation += 1
+        self.cancelled.set()
+        self.pending = None
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.discarded += 1
+
+    def produce(self, generation, cancelled, plan, jobs, renderer, prefix, trail_colors,
+                label_style, current_label_style):
+        for cursor in jobs:
+            if cancelled.is_set():
+                return
+            frame = plan.frames[cursor]
+            trail = plan.trail(frame)
+
+            started = time.perf_counter()
+            image = renderer.render(trail, frame.segment, trail_colors, label_style, current_label_style)
+            self.latencies.append(time.perf_counter() - started)
+            self.rendered += 1
+
+            key = prefix + (trail, frame.segment, label_style, current_label_style)
+            item = (generation, cursor, key, image, renderer.nbytes)
+
+            # Backpressure: wait for the Tk thread to make room, unless cancelled
+            while not cancelled.is_set():
+                try:
+                    self.queue.put(item, timeout=0.05)
+                    break
+                except queue.Full:
+                    continue
+
+    def collect(self, scene, cursor):
+        """Move the frame for cursor into the scene's cache. Tk thread only.
+
+        Frames for earlier cursors are dropped; returns True if the frame for
+        cursor was ready.
+        """
+        while True:
+            item = self.pending
+            self.pending = None
+            if item is None:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    return False
+
+            generation, frame_cursor, key, image, nbytes = item
+            if generation != self.generation or frame_cursor < cursor:
+                self.discarded += 1
+                continue
+            if frame_cursor > cursor:
+                self.pending = item
+                return False
+
+            scene.cache.put(key, ImageTk.PhotoImage(image), nbytes)
+            self.collected += 1
+            return True
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            "queue_depth": self.queue.qsize() + (self.pending is not None),
+            "rendered": self.rendered,
+            "collected": self.collected,
+            "discarded": self.discarded,
+            "render_ms_mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            "render_ms_max": latencies[-1] * 1000 if latencies else 0.0,
+        }
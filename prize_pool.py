@@ -0,0 +1,211 @@
+from array import array
+
+
+class PoolExhausted(Exception):
+    """Every prize of a pool has been drawn."""
+
+
+class PrizePool:
+    """Equally likely prizes drawn without replacement.
+
+    The prizes live in one array: the first `size` are still in play, the
+    rest were drawn. Drawing or removing swaps a prize to the end of the
+    live part and restoring swaps it back, so each is O(1).
+    """
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        if len(self.index) != len(self.items):
+            raise ValueError("prizes of a pool must be unique")
+        self.size = len(self.items)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item):
+        i = self.index.get(item)
+        return i is not None and i < self.size
+
+    def __iter__(self):
+        return iter(self.items[:self.size])
+
+    def swap(self, i, j):
+        items = self.items
+        items[i], items[j] = items[j], items[i]
+        self.index[items[i]] = i
+        self.index[items[j]] = j
+
+    def peek(self, rng):
+        """A random prize still in play, left in the pool."""
+        if not self.size:
+            raise PoolExhausted("the prize pool is empty")
+        return self.items[int(rng.random() * self.size)]
+
+    def draw(self, rng):
+        item = self.peek(rng)
+        self.remove(item)
+        return item
+
+    def remove(self, item):
+        """Take item out of play; returns False if it already was."""
+        if item not in self:
+            return False
+        self.size -= 1
+        self.swap(self.index[item], self.size)
+        return True
+
+    def restore(self, item):
+        """Put a drawn item back in play; returns False if it was not drawn."""
+        i = self.index.get(item)
+        if i is None or i < self.size:
+            return False
+        self.swap(i, self.size)
+        self.size += 1
+        return True
+
+    def reset(self):
+        self.size = len(self.items)
+
+    def arrange(self, items, size):
+        """Take over the order and live count of a pool of the same prizes.
+
+        Which prize a draw picks depends on that order, so a restored pool
+        draws like the original only with it.
+        """
+        if len(items) != len(self.items) or set(items) != set(self.index):
+            raise ValueError("an arrangement must hold the prizes of the pool")
+        self.items = list(items)
+        self.index = {item: i for i, item in enumerate(self.items)}
+        self.size = size
+
+
+class WeightedPrizePool:
+    """Weighted prizes 0..n-1 drawn without replacement.
+
+    The weights of the prizes in play are kept in a Fenwick tree, so a
+    draw (a descent through the tree), a removal and a restore are each
+    O(log n). A removed prize keeps its weight for the restore.
+    """
+
+    def __init__(self, weights):
+        self.weights = array("d", weights)  # Weight of every prize, in play or not
+        self.live = bytearray(b"\x01") * len(self.weights)
+        self.size = len(self.weights)
+        self.tree = array("d", [0.0]) * (len(self.weights) + 1)
+        self.rebuild()
+        self._extents = None
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, item):
+        return 0 <= item < len(self.live) and bool(self.live[item])
+
+    def __iter__(self):
+        return (i for i, live in enumerate(self.live) if live)
+
+    def rebuild(self):
+        """Fill the tree from the weights of the prizes in play, in O(n)."""
+        n = len(self.weights)
+        tree = self.tree
+        for i in range(n):
+            tree[i + 1] = self.weights[i] if self.live[i] else 0.0
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+
+    def add(self, item, delta):
+        tree = self.tree
+        i = item + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+        self._extents = None
+
+    def total(self):
+        tree = self.tree
+        i = len(tree) - 1
+        total = 0.0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, target):
+        """First prize whose cumulative weight exceeds target."""
+        tree = self.tree
+        n = len(tree) - 1
+        pos = 0
+        step = 1 << n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        # Rounding can land past the last prize in play, or on one out of play
+        # when the total is only a float residual
+        pos = min(pos, n - 1)
+        if self.drawable(pos):
+            return pos
+        for distance in range(1, n):
+            for nearby in (pos - distance, pos + distance):
+                if 0 <= nearby < n and self.drawable(nearby):
+                    return nearby
+        raise PoolExhausted("no prize with a weight is left in play")
+
+    def drawable(self, item):
+        return self.live[item] and self.weights[item] > 0
+
+    def peek(self, rng):
+        """A random prize still in play, by weight, left in the pool."""
+        total = self.total()
+        if not self.size or total <= 0:
+            raise PoolExhausted("the prize pool is empty")
+        return self.find(rng.random() * total)
+
+    def draw(self, rng):
+        item = self.peek(rng)
+        self.remove(item)
+        return item
+
+    def remove(self, item):
+        if item not in self:
+            return False
+        self.live[item] = 0
+        self.size -= 1
+        self.add(item, -self.weights[item])
+        return True
+
+    def restore(self, item):
+        if not 0 <= item < len(self.live) or self.live[item]:
+            return False
+        self.live[item] = 1
+        self.size += 1
+        self.add(item, self.weights[item])
+        return True
+
+    def set_weight(self, item, weight):
+        if weight < 0:
+            raise ValueError(f"negative weight {weight} for prize {item}")
+        old, self.weights[item] = self.weights[item], weight
+        if self.live[item]:
+            self.add(item, weight - old)
+
+    def reset(self):
+        self.live = bytearray(b"\x01") * len(self.weights)
+        self.size = len(self.weights)
+        self.rebuild()
+        self._extents = None
+
+    def extents(self):
+        """Arc extent in degrees of every prize, 0 for the ones drawn."""
+        if self._extents is None:
+            total = self.total()
+            self._extents = tuple(
+                360 * w / total if live and total > 0 else 0.0
+                for w, live in zip(self.weights, self.live)
+            )
+        return self._extents
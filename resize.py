@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=64)
+def wheel_geometry(width, height, margin, center_y_ratio=0.5):
+    """(radius, center_x, center_y) of the wheel for a canvas size."""
+    radius = min(width, height) // 2 - margin
+    return radius, width // 2, int(height * center_y_ratio)
+
+
+class ResizeDebouncer:
+    """Turns the root's <Configure> events into one resize call per frame.
+
+    Tk sends <Configure> to the root's binding for every child widget as
+    well, so events of any widget other than the watched one are ignored.
+    The sizes reported within one frame window are coalesced, and the
+    callback only runs when the size actually changed.
+    """
+
+    def __init__(self, master, widget, callback, delay=1 / 60):
+        self.master = master
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = max(1, round(delay * 1000))
+        self.size = None  # Last size handed to the callback
+        self.pending = None
+        self.job = None
+        self.coalesced = 0
+        self.ignored = 0
+
+        self.master.bind("<Configure>", self.configure, add="+")  # Other wheels may share the window
+
+    def configure(self, event):
+        if event.widget is not self.widget:
+            self.ignored += 1
+            return
+        self.pending = (event.width, event.height)
+        if self.job is None:
+            self.job = self.master.after(self.delay_ms, self.flush)
+        else:
+            self.coalesced += 1
+
+    def flush(self):
+        self.job = None
+        size, self.pending = self.pending, None
+        if size is None or size == self.size:
+            return
+        self.size = size
+        self.callback(*size)
+
+    def cancel(self):
+        if self.job is not None:
+            self.master.after_cancel(self.job)
+        self.job = None
+        self.pending = None
@@ -0,0 +1,70 @@
+import base64
+import random
+import sys
+from array import array
+
+# Streams of a wheel: the shuffle's flicker, the results, animation noise
+DISPLAY = "display"
+SELECTION = "selection"
+JITTER = "jitter"
+STREAMS = (DISPLAY, SELECTION, JITTER)
+
+
+def pack_rng_state(rng):
+    """random.Random state as JSON-friendly data (about 3.3 kB)."""
+    version, internal, gauss_next = rng.getstate()
+    words = array("I", internal)
+    if sys.byteorder == "big":
+        words.byteswap()
+    return {"version": version, "words": base64.b64encode(words.tobytes()).decode("ascii"), "gauss": gauss_next}
+
+
+def unpack_rng_state(rng, packed):
+    words = array("I")
+    words.frombytes(base64.b64decode(packed["words"]))
+    if sys.byteorder == "big":
+        words.byteswap()
+    rng.setstate((packed["version"], tuple(words), packed["gauss"]))
+
+
+class RngStreams:
+    """Independent, named random streams derived from one seed.
+
+    Every stream is its own random.Random seeded from (seed, name), so
+    drawing from one never changes what another produces: the shuffle can
+    flicker at any rate without touching the results. With seed=None the
+    streams are seeded from the OS.
+    """
+
+    def __init__(self, seed=None, names=STREAMS):
+        self.seed = seed
+        self.streams = {}
+        for name in names:
+            self.streams[name] = random.Random(None if seed is None else f"{seed}:{name}")
+
+    def __getitem__(self, name):
+        return self.streams[name]
+
+    def __contains__(self, name):
+        return name in self.streams
+
+    def replace(self, name, rng):
+        """Use rng (anything with the random.Random interface) as stream name."""
+        self.streams[name] = rng
+
+    def checkpoint(self):
+        """In-memory state of every stream, cheap enough to take every frame."""
+        return {name: rng.getstate() for name, rng in self.streams.items()}
+
+    def restore(self, checkpoint):
+        for name, state in checkpoint.items():
+            self.streams[name].setstate(state)
+
+    def pack(self):
+        """State of every stream as JSON-friendly data."""
+        return {name: pack_rng_state(rng) for name, rng in self.streams.items()}
+
+    def unpack(self, packed):
+        for name, state in packed.items():
+            if name in self.streams:
+                unpack_rng_state(self.streams[name], state)
@@ -0,0 +1,191 @@
+import math
+import time
+import traceback
+
+
+class FrameScheduler:
+    """Runs an animation from the Tk event loop with root.after.
+
+    Frames are laid on a fixed grid of frame_time seconds measured with
+    time.perf_counter, so timer rounding and slow frames do not accumulate
+    drift. When a frame takes longer than its budget, the grid slots it
+    overran are dropped instead of being played late.
+
+    The callback gets the seconds elapsed since start() and returns False
+    when the animation is over.
+    """
+
+    def __init__(self, master, fps=60):
+        self.master = master
+        self.frame_time = 1 / fps
+        self.callback = None
+        self.job = None
+        self.start_time = 0
+        self.frame = 0
+        self.dropped_frames = 0
+        self.lag = 0.0  # Seconds the event loop ran the last frame after its slot
+
+    @property
+    def running(self):
+        return self.callback is not None
+
+    def start(self, callback):
+        """Start calling callback once per frame, replacing any running animation."""
+        self.cancel()
+        self.callback = callback
+        self.start_time = time.perf_counter()
+        self.frame = 0
+        self.dropped_frames = 0
+        self.job = self.master.after_idle(self._tick)
+
+    def cancel(self):
+        if self.job is not None:
+            self.master.after_cancel(self.job)
+        self.job = None
+        self.callback = None
+
+    def _tick(self):
+        self.job = None
+        self.lag = time.perf_counter() - self.start_time - self.frame * self.frame_time
+        callback = self.callback
+        if callback is None:
+            return
+
+        if not callback(time.perf_counter() - self.start_time):
+            # The callback may have started a new animation on this scheduler
+            if self.callback is callback:
+                self.callback = None
+            return
+        if self.callback is not callback:
+            return
+
+        # Next slot on the fixed grid; slots we are already past are dropped
+        elapsed = time.perf_counter() - self.start_time
+        frame = max(self.frame + 1, int(elapsed / self.frame_time) + 1)
+        self.dropped_frames += max(0, frame - self.frame - 1)
+        self.frame = frame
+
+        delay = self.start_time + frame * self.frame_time - time.perf_counter()
+        self.job = self.master.after(max(0, math.ceil(delay * 1000)), self._tick)
+
+
+class SharedScheduler:
+    """One after() loop on a fixed frame grid that drives the animations of several wheels.
+
+    Every wheel gets its own Animation from animation(), which behaves like
+    a FrameScheduler. A tick calls each running animation once, so N wheels
+    cost one timer job per frame instead of N and draw in the same slot. An
+    animation joining a running loop gets its first frame right away, then
+    follows the grid. An animation that finishes, is cancelled or raises is
+    taken out without disturbing the others; the loop stops when none is left.
+    """
+
+    def __init__(self, master, fps=60):
+        self.master = master
+        self.frame_time = 1 / fps
+        self.animations = []  # Running animations, in the order they started
+        self.job = None
+        self.ticking = False
+        self.start_time = 0  # Origin of the grid, set when the loop (re)starts
+        self.frame = 0
+        self.dropped_frames = 0
+        self.lag = 0.0
+        self.tick_time = 0.0  # Seconds the last tick took, all animations together
+
+    def animation(self):
+        return Animation(self)
+
+    def add(self, animation):
+        if animation not in self.animations:
+            self.animations.append(animation)
+        if self.job is None and not self.ticking:
+            self.start_time = time.perf_counter()
+            self.frame = 0
+            self.job = self.master.after_idle(self._tick)
+        else:
+            self.master.after_idle(self._first, animation, animation.callback)
+
+    def remove(self, animation):
+        if animation in self.animations:
+            self.animations.remove(animation)
+        if not self.animations and self.job is not None:
+            self.master.after_cancel(self.job)
+            self.job = None
+
+    def _run(self, animation):
+        callback = animation.callback
+        animation.frames += 1
+        try:
+            more = callback(time.perf_counter() - animation.start_time)
+        except Exception:  # One broken wheel must not stop the others
+            traceback.print_exc()
+            more = False
+        # The callback may have started a new animation on its channel
+        if not more and animation.callback is callback:
+            animation.cancel()
+
+    def _first(self, animation, callback):
+        if animation.callback is callback and animation.frames == 0:
+            animation.lag = 0.0
+            self._run(animation)
+
+    def _tick(self):
+        self.job = None
+        started = time.perf_counter()
+        self.lag = started - self.start_time - self.frame * self.frame_time
+        self.ticking = True
+        try:
+            for animation in tuple(self.animations):
+                if animation.callback is not None:
+                    animation.lag = self.lag
+                    self._run(animation)
+        finally:
+            self.ticking = False
+        self.tick_time = time.perf_counter() - started
+        if not self.animations:
+            return
+
+        # Next slot on the fixed grid; slots we are already past are dropped for everyone
+        elapsed = time.perf_counter() - self.start_time
+        frame = max(self.frame + 1, int(elapsed / self.frame_time) + 1)
+        dropped = frame - self.frame - 1
+        if dropped:
+            self.dropped_frames += dropped
+            for animation in self.animations:
+                animation.dropped_frames += dropped
+        self.frame = frame
+
+        delay = self.start_time + frame * self.frame_time - time.perf_counter()
+        self.job = self.master.after(max(0, math.ceil(delay * 1000)), self._tick)
+
+
+class Animation:
+    """One animation of a SharedScheduler, with the interface of FrameScheduler.
+
+    The callback gets the seconds elapsed since its own start() and returns
+    False when the animation is over.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.callback = None
+        self.start_time = 0
+        self.frames = 0  # Callback calls since start()
+        self.dropped_frames = 0
+        self.lag = 0.0
+
+    @property
+    def running(self):
+        return self.callback is not None
+
+    def start(self, callback):
+        """Start calling callback once per frame, replacing any running animation."""
+        self.callback = callback
+        self.start_time = time.perf_counter()
+        self.frames = 0
+        self.dropped_frames = 0
+        self.scheduler.add(self)
+
+    def cancel(self):
+        self.callback = None
+        self.scheduler.remove(self)
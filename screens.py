@@ -0,0 +1,36 @@
+import time
+
+
+class ScreenManager:
+    """Switches between screens that are built once and only shown or hidden.
+
+    A screen is any object with show() and hide(). Switching hides the
+    current screen and shows the next one; nothing is destroyed, so the
+    widgets, canvas items and bindings of every screen live as long as
+    the app. The duration of the last switch is kept for monitoring.
+    """
+
+    def __init__(self):
+        self.screens = {}
+        self.current = None  # Name of the screen on display
+        self.switches = 0
+        self.last_switch = 0.0  # Seconds the last show() took
+
+    def add(self, name, screen):
+        self.screens[name] = screen
+        return screen
+
+    def __getitem__(self, name):
+        return self.screens[name]
+
+    def show(self, name):
+        started = time.perf_counter()
+        if self.current is not None and self.current != name:
+            self.screens[self.current].hide()
+        self.current = name
+        self.screens[name].show()
+        self.switches += 1
+        self.last_switch = time.perf_counter() - started
+
+    def is_current(self, screen):
+        return self.current is not None and self.screens[self.current] is screen
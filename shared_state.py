@@ -0,0 +1,338 @@
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections import namedtuple
+
+from engine import IDLE, SHUFFLING, SPINNING, WHEEL_READY
+from hooks import Plugin
+
+# Layout of the region, all little-endian:
+#   header   magic, layout version, trail capacity, meta capacity, sequence
+#   state    see STATE_FIELDS; winner is that of the last finished spin
+#   trail    int32 segments of the trail, oldest first (trail capacity of them)
+#   meta     UTF-8 JSON of what changes rarely: labels, colors, arc extents
+# The sequence is a seqlock: the writer makes it odd before changing
+# anything and even again after, so a reader that saw the same even
+# sequence before and after its copy has a consistent state.
+MAGIC = b"LWS1"
+LAYOUT_VERSION = 1
+HEADER = struct.Struct("<4sIII")
+SEQUENCE = struct.Struct("<Q")
+SEQUENCE_OFFSET = HEADER.size  # 16, aligned for the 8-byte sequence
+
+STATE = struct.Struct("<BxxxIiiqdIII")
+STATE_FIELDS = (
+    "phase", "round", "segment", "winner", "number", "time", "trail_length", "meta_generation", "meta_length",
+)
+STATE_OFFSET = SEQUENCE_OFFSET + SEQUENCE.size
+TRAIL_OFFSET = STATE_OFFSET + STATE.size
+
+PHASES = (IDLE, SHUFFLING, WHEEL_READY, SPINNING)
+NO_NUMBER = -(2 ** 63)  # number of a round without one (wheel-only setups)
+
+WheelState = namedtuple("WheelState", ("sequence",) + STATE_FIELDS + ("trail",))
+
+
+def region_size(trail_capacity, meta_capacity):
+    return TRAIL_OFFSET + 4 * trail_capacity + meta_capacity
+
+
+def mapped(region):
+    """Memoryview of an mmap (slicing the mmap itself would copy) and its release function."""
+    view = memoryview(region)
+
+    def release():
+        view.release()
+        region.close()
+
+    return view, release
+
+
+def create_region(name=None, path=None, size=0):
+    """Writable buffer of size bytes and a function to release it.
+
+    With path, a file of that size is mapped (readers map the same file).
+    It is made under another name and renamed into place, so a reader of a
+    previous publisher keeps its old mapping and can tell it was replaced;
+    otherwise a multiprocessing.shared_memory block called name is made.
+    An existing block of that name is never taken over, it may belong to a
+    running publisher: FileExistsError says so instead.
+    """
+    if path is not None:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w+b") as f:
+            f.truncate(size)
+            region = mmap.mmap(f.fileno(), size)
+        os.replace(tmp, path)
+        return mapped(region)
+
+    from multiprocessing import shared_memory
+
+    try:
+        block = shared_memory.SharedMemory(name, create=True, size=size)
+    except FileExistsError:
+        raise FileExistsError(f"shared memory {name!r} is published by another app already "
+                              f"(if that app was killed, remove /dev/shm/{name})") from None
+
+    def release():
+        block.close()
+        block.unlink()
+
+    return block.buf, release
+
+
+def region_identity(name=None, path=None):
+    """(device, inode) of the region called name or path now, None if there is none.
+
+    Shared memory blocks only have one on POSIX; elsewhere this is None.
+    """
+    try:
+        if path is not None:
+            stat = os.stat(path)
+        else:
+            import _posixshmem
+
+            fd = _posixshmem.shm_open("/" + name, os.O_RDONLY)
+            try:
+                stat = os.fstat(fd)
+            finally:
+                os.close(fd)
+    except (ImportError, OSError):
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def attach_region(name=None, path=None):
+    """Read-only view of an existing region, a function to release it and its identity."""
+    if path is not None:
+        with open(path, "rb") as f:
+            region = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+        return (*mapped(region), (stat.st_dev, stat.st_ino))
+
+    from multiprocessing import resource_tracker, shared_memory
+
+    try:
+        block = shared_memory.SharedMemory(name, track=False)  # Python 3.13+
+    except TypeError:
+        block = shared_memory.SharedMemory(name)
+        # Before 3.13 the tracker would unlink the publisher's block when this reader
+        # exits; readers are separate processes (not forks) with a tracker of their own
+        resource_tracker.unregister(block._name, "shared_memory")
+    identity = None
+    if getattr(block, "_fd", -1) >= 0:  # POSIX
+        stat = os.fstat(block._fd)
+        identity = stat.st_dev, stat.st_ino
+    return block.buf, block.close, identity
+
+
+class StatePublisher(Plugin):
+    """Writes the state of one wheel to a shared-memory region on every change.
+
+    Registered as a plugin, it publishes on every drawn spin frame, shuffle
+    tick, stopped number and result, so other processes can mirror the
+    wheel at frame rate with StateReader, without sockets or serialization
+    on the frame path. A publish is a few pack_into calls under the
+    sequence lock; the JSON meta is only rewritten when the labels, colors
+    or arcs changed. A meta that outgrows meta_capacity (large wheels) gets
+    a new region twice its size; readers see the old one closed and attach
+    again.
+    """
+
+    name = "shared-state"
+
+    def __init__(self, name="lucky_wheel", path=None, trail_capacity=4096, meta_capacity=65536):
+        self.region_name = name
+        self.path = path
+        self.trail_capacity = trail_capacity
+        self.sequence = 0
+        self.meta_generation = 0
+        self.meta_length = 0
+        self.described = None  # What the meta was written from
+        self.wheel = None
+        self.allocate(meta_capacity)
+
+    def allocate(self, meta_capacity):
+        trail_capacity = self.trail_capacity
+        self.meta_capacity = meta_capacity
+        self.buffer, self.release = create_region(
+            self.region_name, self.path, region_size(trail_capacity, meta_capacity))
+        HEADER.pack_into(self.buffer, 0, MAGIC, LAYOUT_VERSION, trail_capacity, meta_capacity)
+        self.trail_view = self.buffer[TRAIL_OFFSET:TRAIL_OFFSET + 4 * trail_capacity].cast("i")
+        self.meta_offset = TRAIL_OFFSET + 4 * trail_capacity
+        SEQUENCE.pack_into(self.buffer, SEQUENCE_OFFSET, self.sequence)
+
+    def attach(self, wheel):
+        """Publish wheel from now on, starting with its current state."""
+        self.wheel = wheel
+        self.describe(wheel)
+        self.publish(wheel)
+
+    def describe(self, wheel):
+        extents = wheel.engine.segment_extents()
+        described = (wheel.labels, wheel.palette.base_colors, wheel.palette.highlight_color, extents)
+        if described == self.described:
+            return
+        meta = json.dumps({
+            "segments": wheel.segments,
+            "labels": wheel.labels,
+            "base_colors": wheel.palette.base_colors,
+            "highlight_color": wheel.palette.highlight_color,
+            "extents": extents,
+        }).encode()
+        if len(meta) > self.meta_capacity:
+            self.close()
+            self.allocate(2 * len(meta))
+        self.begin()
+        self.buffer[self.meta_offset:self.meta_offset + len(meta)] = meta
+        self.meta_length = len(meta)
+        self.meta_generation += 1
+        self.described = described
+        # The state carries the generation, write it in the same update
+        self.write(wheel, None)
+        self.end()
+
+    def publish(self, wheel, number=None):
+        self.begin()
+        self.write(wheel, number)
+        self.end()
+
+    def begin(self):
+        self.sequence += 1  # Odd: readers retry
+        SEQUENCE.pack_into(self.buffer, SEQUENCE_OFFSET, self.sequence)
+
+    def end(self):
+        self.sequence += 1
+        SEQUENCE.pack_into(self.buffer, SEQUENCE_OFFSET, self.sequence)
+
+    def write(self, wheel, number):
+        engine = wheel.engine
+        trail = wheel.trail_segments
+        length = min(len(trail), self.trail_capacity)
+        if length:
+            segments = array("i", trail)
+            self.trail_view[:length] = segments[len(segments) - length:]
+        if number is None:
+            number = engine.chosen_number
+        winner = engine.winning_segment if engine.phase != SPINNING and not wheel.spinning else None
+        STATE.pack_into(
+            self.buffer, STATE_OFFSET,
+            PHASES.index(engine.phase), engine.play_count, wheel.current_segment,
+            -1 if winner is None else winner, NO_NUMBER if number is None else number,
+            time.time(), length, self.meta_generation, self.meta_length,
+        )
+
+    # Hooks
+
+    def before_spin(self, wheel, winner):
+        self.describe(wheel)  # Prizes drawn or changed weights change the arcs
+        self.publish(wheel)
+
+    def on_frame(self, wheel, cursor, elapsed):
+        self.publish(wheel)
+
+    def on_result(self, wheel, segment):
+        self.publish(wheel)
+
+    def on_shuffle_tick(self, shuffler, number):
+        if self.wheel is not None:
+            self.publish(self.wheel, number)
+
+    def on_number(self, shuffler, number):
+        if self.wheel is not None:
+            self.publish(self.wheel, number)
+
+    def on_reload(self, station, plan):
+        self.describe(station.wheel)  # New labels or colors show before the next spin
+        self.publish(station.wheel)
+
+    def close(self):
+        self.buffer[:len(MAGIC)] = bytes(len(MAGIC))  # Readers see the publisher is gone
+        self.trail_view.release()
+        self.release()
+
+
+class StateReader:
+    """Reads the state a StatePublisher writes, from any process.
+
+    read() copies the fixed-size state and the trail straight out of the
+    shared buffer and retries while the publisher is in the middle of an
+    update. The meta (labels, colors, arcs) is decoded only when its
+    generation changed. changed() is a single 8-byte read, for readers
+    that poll faster than the wheel updates. A reader stays on the region
+    it attached to; replaced() tells when its publisher closed or another
+    one took the name, so a new reader should be made.
+    """
+
+    def __init__(self, name="lucky_wheel", path=None):
+        self.name = name
+        self.path = path
+        self.buffer, self.release, self.identity = attach_region(name, path)
+        magic, version, self.trail_capacity, self.meta_capacity = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self.release()
+            raise ValueError(f"not a wheel state region (magic {magic!r}, version {version})")
+        self.trail_view = self.buffer[TRAIL_OFFSET:TRAIL_OFFSET + 4 * self.trail_capacity].cast("i")
+        self.meta_offset = TRAIL_OFFSET + 4 * self.trail_capacity
+        self.meta = None
+        self.meta_generation = 0
+        self.sequence = 0  # Sequence of the last state read
+
+    def changed(self):
+        return SEQUENCE.unpack_from(self.buffer, SEQUENCE_OFFSET)[0] != self.sequence
+
+    def replaced(self):
+        """Whether the publisher closed the region or the name now refers to another one."""
+        if bytes(self.buffer[:len(MAGIC)]) != MAGIC:
+            return True
+        return self.identity is not None and region_identity(self.name, self.path) != self.identity
+
+    def read(self, retries=10000):
+        """The latest consistent WheelState; raises TimeoutError if the publisher never settles."""
+        buffer = self.buffer
+        for attempt in range(retries):
+            before = SEQUENCE.unpack_from(buffer, SEQUENCE_OFFSET)[0]
+            if before & 1:
+                if attempt > 100:
+                    time.sleep(0)  # Let the publisher finish
+                continue
+            state = STATE.unpack_from(buffer, STATE_OFFSET)
+            trail = tuple(self.trail_view[:min(state[6], self.trail_capacity)])
+            meta = None
+            if state[7] != self.meta_generation:
+                meta = bytes(buffer[self.meta_offset:self.meta_offset + min(state[8], self.meta_capacity)])
+            if SEQUENCE.unpack_from(buffer, SEQUENCE_OFFSET)[0] != before:
+                continue
+            if meta is not None:
+                self.meta = json.loads(meta) if meta else None
+                self.meta_generation = state[7]
+            self.sequence = before
+            phase, round_, segment, winner, number, updated, length, generation, meta_length = state
+            return WheelState(
+                before, PHASES[phase], round_, segment, None if winner < 0 else winner,
+                None if number == NO_NUMBER else number, updated, length, generation, meta_length, trail,
+            )
+        raise TimeoutError("the publisher kept the state locked")
+
+    def close(self):
+        self.trail_view.release()
+        self.release()
+
+
+def open_publisher(station, plan, suffix=""):
+    """Publish station's wheel as the config says; None if the region cannot be made."""
+    path = plan.publish_file
+    if path is not None and suffix:
+        root, ext = os.path.splitext(path)
+        path = f"{root}{suffix}{ext}"
+    try:
+        publisher = StatePublisher(plan.publish_name + suffix, path)
+    except (OSError, ValueError) as e:
+        print(f"shared state not published: {e}")
+        return None
+    station.hooks.register(publisher)
+    publisher.attach(station.wheel)
+    return publisher
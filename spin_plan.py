@@ -0,0 +1,72 @@
+from collections import namedtuple
+from functools import lru_cache
+
+# Wheels with more segments than this shorten the constant part of the step
+# delay, so a spin lasts about as long as it does on the 20-segment wheel
+REFERENCE_SEGMENTS = 20
+
+# One animation step: seconds since the spin started, highlighted segment,
+# and how many segments (ending at this one) the trail holds
+SpinFrame = namedtuple("SpinFrame", ["time", "segment", "trail_length"])
+
+
+class SpinPlan(namedtuple("SpinPlan", ["segments", "rounds", "winner", "frames", "times"])):
+    """Complete, immutable timeline of one spin.
+
+    The last frame is the resting frame on the winning segment. Segments are
+    visited in order, so the trail is always the run of trail_length
+    segments ending at the current one and does not need to be stored.
+    """
+
+    __slots__ = ()
+
+    @property
+    def duration(self):
+        return self.times[-1]
+
+    def trail(self, frame):
+        """Trail segments of frame, oldest first."""
+        first = frame.segment - frame.trail_length + 1
+        return tuple((first + k) % self.segments for k in range(frame.trail_length))
+
+
+def compute_spin_plan(segments, rounds, winner):
+    """Build the timeline of a spin that lands on the winner segment.
+
+    Matches the original loop: the first step waits 0.01s, later steps slow
+    down as 1 / remaining**1.5 + 1/60 and each one trims up to 5 trail
+    segments as the wheel gets slower. On wheels larger than
+    REFERENCE_SEGMENTS the constant parts are scaled down, so the spin keeps
+    its length and its slow final steps.
+    """
+    total_spins = segments * rounds + winner
+    scale = min(1, REFERENCE_SEGMENTS / segments)
+
+    frames = []
+    time = 0
+    delay = 0.01 * scale  # Initial delay for fast speed
+    trail_length = 0
+    trail_remove = 0
+
+    for spin_count in range(total_spins):
+        trail_length = max(0, trail_length - int(trail_remove))
+        trail_length = min(trail_length + 1, segments)  # Limit the trail length
+        frames.append(SpinFrame(time, spin_count % segments, trail_length))
+
+        time += delay
+
+        # Gradually slow down the spin after the fast rounds
+        delay = 1 / ((total_spins - spin_count) ** 1.5) + (1 / 60) * scale
+        trail_remove = min(5, (delay / 0.02))
+
+    # Finalize by highlighting the winning segment
+    frames.append(SpinFrame(time, winner, 1))
+
+    frames = tuple(frames)
+    return SpinPlan(segments, rounds, winner, frames, tuple(frame.time for frame in frames))
+
+
+@lru_cache(maxsize=128)
+def plan_spin(segments, rounds, winner):
+    """Cached compute_spin_plan, keyed by (segments, rounds, winner)."""
+    return compute_spin_plan(segments, rounds, winner)
@@ -0,0 +1,247 @@
+import math
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+from wheel_scene import arc_boundaries
+
+# Above this many segments only the current label is rasterized
+MAX_SPRITE_LABELS = 120
+
+
+class SpriteCache:
+    """LRU cache of rendered frames with a memory cap in bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, nbytes):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.entries[key] = (value, nbytes)
+        self.bytes += nbytes
+
+        # Evict the least recently used frames, but always keep the newest one
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def load_font(family, size):
+    """PIL font for a Tk font tuple, falling back to the default bitmap font."""
+    try:
+        return ImageFont.truetype(f"{family.lower()}.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+class SpriteWheelRenderer:
+    """Rasterizes wheel frames off-screen with PIL.
+
+    The segments without a trail color are rendered once into a base image;
+    a frame is a copy of it with the trail slices and labels drawn on top.
+    Only PIL is used here, so frames can be rendered from any thread.
+    """
+
+    def __init__(self, segments, radius, base_colors, highlight_color, label_offset=30, angle_offset=0, margin=40,
+                 extents=None, labels=None):
+        self.segments = segments
+        self.radius = radius
+        self.angle_offset = angle_offset
+        self.label_offset = label_offset
+        self.half_size = max(radius, 0) + label_offset + margin
+        self.size = (2 * self.half_size, 2 * self.half_size)
+        self.base_colors = tuple(base_colors)
+        self.highlight_color = highlight_color
+        self.fonts = {}
+
+        self.boundaries = arc_boundaries(segments, extents)
+        self.texts = list(labels) if labels is not None else [str(i + 1) for i in range(segments)]
+        self.base = Image.new("RGB", self.size, "black")
+        draw = ImageDraw.Draw(self.base)
+        for i in range(segments):
+            self.draw_slice(draw, i, self.base_colors[i % len(self.base_colors)])
+
+    @property
+    def nbytes(self):
+        """Memory of one rendered frame once handed to Tk (32 bits per pixel)."""
+        return self.size[0] * self.size[1] * 4
+
+    def font(self, font):
+        if font not in self.fonts:
+            self.fonts[font] = load_font(*font)
+        return self.fonts[font]
+
+    def draw_slice(self, draw, i, fill):
+        if self.radius <= 0:
+            return
+        c = self.half_size
+        bbox = (c - self.radius, c - self.radius, c + self.radius, c + self.radius)
+        # Tk angles run counterclockwise, PIL angles clockwise
+        start = self.boundaries[i] + self.angle_offset
+        end = self.boundaries[i + 1] + self.angle_offset
+        draw.pieslice(bbox, -end, -start, fill=fill, outline="black")
+
+    def render(self, trail, current_segment, trail_colors, label_style, current_label_style):
+        """Frame for the given trail (oldest first) and current segment."""
+        image = self.base.copy()
+        draw = ImageDraw.Draw(image)
+
+        for trail_index, i in enumerate(trail):
+            self.draw_slice(draw, i, trail_colors[i % len(trail_colors)][trail_index])
+        if trail:
+            self.draw_slice(draw, trail[-1], self.highlight_color)  # Highlight the current segment
+
+        if self.segments <= MAX_SPRITE_LABELS:
+            labels = range(self.segments)
+        else:
+            labels = (current_segment,)
+        c = self.half_size
+        for i in labels:
+            font, text_color = current_label_style if i == current_segment else label_style
+            text_angle = math.radians((self.boundaries[i] + self.boundaries[i + 1]) / 2 + self.angle_offset)
+            x = c + (self.radius + self.label_offset) * math.cos(text_angle)
+            y = c - (self.radius + self.label_offset) * math.sin(text_angle)
+            draw.text((x, y), self.texts[i], font=self.font(font), fill=text_color, anchor="mm")
+        return image
+
+
+class SpriteWheelScene:
+    """Draws the wheel as a single canvas image swapped once per frame.
+
+    Has the same layout/draw interface as WheelScene. Rendered frames are
+    kept in a SpriteCache keyed by geometry, theme and frame state, so a
+    repeated spin only swaps cached PhotoImages. Changing the geometry
+    (on_resize) drops the cache.
+    """
+
+    TAG = "wheel"
+
+    def __init__(self, canvas, segments, image=None, label_offset=30, cache_bytes=64 * 1024 * 1024, labels=None):
+        self.canvas = canvas
+        self.segments = segments
+        self.image = image
+        self.label_offset = label_offset
+        self.texts = list(labels) if labels is not None else [str(i + 1) for i in range(segments)]
+        self.extents = None  # Per-segment arc extents of a weighted wheel
+        self.cache = SpriteCache(cache_bytes)
+
+        self.geometry = None
+        self.renderer = None
+        self.frame_id = None
+        self.image_id = None
+        self.photo = None  # Keeps the displayed frame alive if it gets evicted
+        self.drawn_key = None
+
+    def layout(self, center_x, center_y, radius, angle_offset=0):
+        geometry = (center_x, center_y, radius, angle_offset)
+        if geometry == self.geometry:
+            return False
+
+        self.canvas.delete(self.TAG)
+        self.cache.clear()
+        self.geometry = geometry
+        self.renderer = None
+        self.drawn_key = None
+        self.frame_id = self.canvas.create_image(center_x, center_y, tags=self.TAG)
+        if self.image is not None:
+            self.image_id = self.canvas.create_image(center_x, center_y, image=self.image, tags=self.TAG)
+        return True
+
+    def key_prefix(self, palette):
+        """Part of the frame key shared by every frame of this geometry and theme."""
+        return (self.geometry, palette.base_colors, palette.highlight_color)
+
+    def frame_key(self, palette, trail, current_segment, label_style, current_label_style):
+        return self.key_prefix(palette) + (tuple(trail), current_segment, label_style, current_label_style)
+
+    def draw(self, palette, trail, current_segment, label_style, current_label_style):
+        if self.geometry is None:
+            return 0
+
+        key = self.frame_key(palette, trail, current_segment, label_style, current_label_style)
+        if key == self.drawn_key:
+            return 0
+
+        photo = self.cache.get(key)
+        if photo is None:
+            renderer = self.renderer_for(palette)
+            frame = renderer.render(key[3], current_segment, palette.trail_colors, label_style, current_label_style)
+            photo = ImageTk.PhotoImage(frame)
+            self.cache.put(key, photo, renderer.nbytes)
+
+        self.canvas.itemconfig(self.frame_id, image=photo)
+        self.photo = photo
+        self.drawn_key = key
+        return 1
+
+    def renderer_for(self, palette):
+        """Renderer for the current geometry and theme, rebuilt when either changes."""
+        radius, angle_offset = self.geometry[2:]
+        renderer = self.renderer
+        if (renderer is None or renderer.base_colors != palette.base_colors
+                or renderer.highlight_color != palette.highlight_color):
+            renderer = SpriteWheelRenderer(
+                self.segments, radius, palette.base_colors, palette.highlight_color,
+                self.label_offset, angle_offset, extents=self.extents, labels=self.texts,
+            )
+            self.renderer = renderer
+        return renderer
+
+    def set_extents(self, extents):
+        """Use new per-segment arc extents (None for equal arcs); drops every cached frame."""
+        extents = tuple(extents) if extents is not None else None
+        if extents != self.extents:
+            self.extents = extents
+            self.invalidate()
+        return 0
+
+    def set_image(self, image):
+        """Show image (the logo) on top of the frames; it may arrive after the first layout."""
+        self.image = image
+        if self.image_id is not None:
+            self.canvas.itemconfig(self.image_id, image=image)
+        elif self.geometry is not None:
+            center_x, center_y = self.geometry[:2]
+            self.image_id = self.canvas.create_image(center_x, center_y, image=image, tags=self.TAG)
+
+    def invalidate(self):
+        """Forget the current geometry and every cached frame."""
+        self.geometry = None
+        self.cache.clear()
+
+    def stats(self):
+        return self.cache.stats()
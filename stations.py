@@ -0,0 +1,27 @@
+"""Multi-station variant: several prize wheels in one process, listed in stations.json.
+
+Every station runs its own config (presets, prize pool, RNG), while the
+images, palettes, audio and frame scheduler are shared. Keys 1-9 spin a
+station, <space> spins them all.
+"""
+import os
+import sys
+import tkinter as tk
+
+from main import MultiStationApp
+from wheel_config import load_stations
+
+STATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stations.json")
+
+
+def main(path=STATIONS_PATH):
+    stations = load_stations(path)
+    root = tk.Tk()
+    app = MultiStationApp(root, stations.plans, stations.configs, columns=stations.columns,
+                          toplevels=stations.toplevels)
+    root.mainloop()
+    app.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else STATIONS_PATH)
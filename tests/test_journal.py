@@ -0,0 +1,39 @@
+from engine import WheelEngine
+from journal import NUMBER, SEGMENT, DrawJournal
+
+
+def make_engine():
+    return WheelEngine(segments=200, shuffle_pool=range(1, 201), without_replacement=True, seed=7)
+
+
+def play(engine, journal, rounds):
+    """Play rounds through the events, journaling like the app; returns the draws."""
+    draws = []
+    for _ in range(rounds):
+        engine.start_shuffle()
+        engine.shuffle_tick()
+        number = engine.stop_shuffle()
+        journal.record(NUMBER, engine, number)
+        segment = engine.spin()
+        journal.record(SEGMENT, engine, segment)
+        engine.finish_spin()
+        draws.append((number, segment))
+    return draws
+
+
+def test_restored_draws_match_an_uninterrupted_run(tmp_path):
+    engine = make_engine()
+    journal = DrawJournal(str(tmp_path / "straight.jsonl"), snapshot_every=5, background=False)
+    journal.restore(engine)
+    expected = play(engine, journal, 150)
+    journal.close()
+
+    path = str(tmp_path / "restarted.jsonl")
+    draws = []
+    for rounds in (40, 33, 50, 27):  # Restart from the snapshot and the lines after it each time
+        engine = make_engine()
+        journal = DrawJournal(path, snapshot_every=5, background=False)
+        journal.restore(engine)
+        draws += play(engine, journal, rounds)
+        journal.close()
+    assert draws == expected
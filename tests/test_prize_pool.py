@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+from prize_pool import PoolExhausted, WeightedPrizePool
+
+
+def test_residual_total_does_not_draw_a_drawn_prize():
+    pool = WeightedPrizePool([0.1, 0.2, 0.3, 0.0])
+    for prize in range(3):
+        pool.remove(prize)
+    assert pool.total() > 0  # Float residual of the removed weights
+    with pytest.raises(PoolExhausted):
+        pool.peek(random.Random(1))
+
+
+def test_draws_only_live_prizes_with_weight():
+    rng = random.Random(5)
+    weights = [0.1, 0.7, 0.2, 0.0, 0.3, 0.1]
+    for _ in range(200):
+        pool = WeightedPrizePool(weights)
+        drawn = [pool.draw(rng) for _ in range(5)]
+        assert sorted(drawn) == [0, 1, 2, 4, 5]
+        with pytest.raises(PoolExhausted):
+            pool.draw(rng)
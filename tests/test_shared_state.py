@@ -0,0 +1,25 @@
+from shared_state_bench import fake_wheel
+
+from shared_state import StatePublisher, StateReader
+
+
+def test_meta_of_a_large_wheel(tmp_path):
+    path = str(tmp_path / "state.bin")
+    publisher = StatePublisher(path=path)
+    publisher.attach(fake_wheel(10))
+    reader = StateReader(path=path)
+    reader.read()
+    assert len(reader.meta["labels"]) == 10
+
+    # 10,000 segments do not fit the default meta capacity: the region grows
+    wheel = fake_wheel(10000)
+    publisher.attach(wheel)
+    assert publisher.meta_capacity > 65536
+    assert reader.replaced()
+    reader.close()
+
+    reader = StateReader(path=path)
+    state = reader.read()
+    assert reader.meta["labels"] == list(wheel.labels) and state.meta_generation == publisher.meta_generation
+    reader.close()
+    publisher.close()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+
+import headless
+import main
+from audio import AudioEngine, NullBackend
+from engine import IDLE, SPINNING, WHEEL_READY
+from wheel_config import compile_plan
+
+
+def make_app(**rounds):
+    headless.install(main)
+    plan = compile_plan({"shuffle": {"pool": [1, 2, 3]}, "rounds": dict({"journal": None}, **rounds)})
+    with contextlib.redirect_stdout(io.StringIO()):
+        return main.LuckyWheelApp(headless.Root(), plan, audio=AudioEngine(NullBackend()))
+
+
+def test_start_waits_for_confirmation():
+    app = make_app(confirm_number=True)
+    shuffler = app.shuffler
+    shuffler.start()
+    shuffler.start()  # The same button stops
+    number = shuffler.chosen_number
+    assert app.engine.phase == WHEEL_READY
+    assert not shuffler.button.mapped and shuffler.confirm_button.mapped
+
+    assert shuffler.start() == 1  # Start again before confirming: ignored
+    assert app.engine.phase == WHEEL_READY and shuffler.chosen_number == number
+
+    shuffler.confirm()
+    assert shuffler.button.mapped and not shuffler.confirm_button.mapped
+    assert app.screens.is_current(app.wheel)
+    app.on_space()
+    assert app.engine.phase == SPINNING
+
+
+def test_start_without_confirmation():
+    app = make_app()
+    app.shuffler.start()
+    app.shuffler.start()
+    assert app.screens.is_current(app.wheel) and app.engine.phase == WHEEL_READY
+
+
+def test_reset_after_the_pool_ran_out(tmp_path):
+    journal = str(tmp_path / "draws.jsonl")
+    app = make_app(remove_winners=True, journal=journal)
+    shuffler = app.shuffler
+    for _ in range(3):
+        shuffler.start()
+        shuffler.start()
+        app.engine.phase = IDLE  # The wheel's round is not played here
+    assert shuffler.start() == 1 and not shuffler.running
+
+    app.restore_prize(number=2)
+    assert list(app.engine.number_pool) == [2]
+    assert app.reset_prizes() == 0
+    assert sorted(app.engine.number_pool) == [1, 2, 3]
+    assert shuffler.start() == 0 and shuffler.running
+    shuffler.start()
+    app.close()
+
+    # A restart replays the reset from the journal
+    restarted = make_app(remove_winners=True, journal=journal)
+    assert sorted(restarted.engine.number_pool) == sorted({1, 2, 3} - {shuffler.chosen_number})
+    restarted.close()
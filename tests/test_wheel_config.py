@@ -0,0 +1,35 @@
+import json
+import os
+
+import headless
+from wheel_config import CACHE_ENTRIES, ConfigWatcher, load_plan
+
+
+def write_config(path, config):
+    with open(path, "w") as f:
+        json.dump(config, f)
+
+
+def test_plan_cache_keeps_the_newest_entries(tmp_path):
+    path = str(tmp_path / "wheel.json")
+    for segments in range(2, CACHE_ENTRIES + 12):
+        write_config(path, {"wheel": {"segments": segments}, "shuffle": {"pool": [1]}})
+        assert load_plan(path).segments == segments
+    assert len(os.listdir(tmp_path / ".wheel_cache")) == CACHE_ENTRIES
+
+
+def test_watcher_reports_sections_that_need_a_restart(tmp_path, capsys):
+    path = str(tmp_path / "wheel.json")
+    config = {"shuffle": {"pool": [1]}, "rounds": {"seed": 1}}
+    write_config(path, config)
+    plans = []
+    watcher = ConfigWatcher(headless.Root(), path, plans.append)
+
+    config["rounds"]["seed"] = 2
+    config["control"] = {"port": 9000}
+    config["wheel"] = {"segments": 8}
+    write_config(path, config)
+    os.utime(path, ns=(0, 0))  # A new signature even within the mtime granularity
+    watcher.poll()
+    assert plans[-1].segments == 8
+    assert "rounds.seed, control only change on a restart" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+from array import array
+
+
+class Trail:
+    """Ring buffer of the most recently highlighted segments.
+
+    Every push gets an increasing sequence number, and a per-segment array
+    remembers the sequence number of that segment's last push. Membership
+    and trail position are then a subtraction against the oldest live
+    sequence number, and both pushing and expiring are O(1) regardless of
+    how many segments the wheel has.
+    """
+
+    def __init__(self, segments, capacity=None):
+        self.segments = segments
+        self.capacity = capacity or segments
+        self.ring = array("l", [0]) * self.capacity
+        self.pushed = array("q", [-1]) * segments
+        self.start = 0  # Sequence number of the oldest entry
+        self.end = 0  # Sequence number of the next push
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __iter__(self):
+        ring, capacity = self.ring, self.capacity
+        for seq in range(self.start, self.end):
+            yield ring[seq % capacity]
+
+    def __contains__(self, segment):
+        return self.pushed[segment] >= self.start
+
+    @property
+    def last(self):
+        """The newest segment, or None if the trail is empty."""
+        if self.end == self.start:
+            return None
+        return self.ring[(self.end - 1) % self.capacity]
+
+    def position(self, segment):
+        """Index of segment in the trail, 0 being the oldest, or -1 if absent."""
+        seq = self.pushed[segment]
+        if seq < self.start:
+            return -1
+        return seq - self.start
+
+    def push(self, segment):
+        if self.end - self.start == self.capacity:  # Limit the trail length
+            self.start += 1
+        self.ring[self.end % self.capacity] = segment
+        self.pushed[segment] = self.end
+        self.end += 1
+
+    def expire(self, count=1):
+        """Drop up to count of the oldest segments."""
+        if count > 0:
+            self.start = min(self.end, self.start + count)
+
+    def clear(self):
+        self.start = self.end
+
+    def reset(self, segments):
+        """Replace the trail contents, oldest first."""
+        self.clear()
+        for segment in segments:
+            self.push(segment)
@@ -0,0 +1,473 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+from collections import namedtuple
+
+from asset_manager import asset_path
+from engine import WheelEngine
+from journal import write_atomic
+
+# Bump when WheelPlan or compile_plan changes, so stale cached plans are ignored
+PLAN_VERSION = 9
+
+CACHE_ENTRIES = 32  # Compiled plans kept in a cache directory, the newest first
+
+# Plan fields a running station only picks up on a restart, with their config keys
+RESTART_KEYS = {
+    "seed": "rounds.seed",
+    "journal": "rounds.journal",
+    "plugins": "plugins",
+    "plugin_max_ms": "plugins",
+    "control": "control",
+    "control_host": "control",
+    "control_port": "control",
+    "control_token": "control",
+    "publish": "publish",
+    "publish_name": "publish",
+    "publish_file": "publish",
+}
+
+COLOR = re.compile(r"#[0-9a-fA-F]{6}\Z")  # The palette blends colors channel by channel
+
+DEFAULTS = {
+    "wheel": {
+        "segments": 20,  # A count, or a list of labels / {"label", "weight"} objects
+        "weights": None,
+        "presets": [],  # 1-based winning segment of round 1, 2, ...
+        "wrap_presets": False,
+    },
+    "shuffle": {
+        "pool": [],  # A list of numbers, or {"range": [first, last]}; needed by the shuffle screen
+        "presets": [],
+        "rate": 30,  # Flicker frequency in Hz
+    },
+    "theme": {
+        "base_colors": ["#F5EEDC", "#ECB390"],
+        "highlight_color": "#DD4A48",
+        "wheel_margin": 130,  # Pixels between the wheel and the window edge
+    },
+    "rounds": {
+        "spin_rounds": 5,  # Fast rounds before the wheel slows down
+        "remove_winners": False,
+        "seed": None,
+        "shuffle_screen": True,  # False: wheel only, spin after spin
+        "confirm_number": False,  # Ask for confirmation before going to the wheel
+        "back_to_shuffle": True,  # Return to the shuffle once the wheel stopped
+        "journal": "draws.jsonl",  # Draw journal next to the config, null for none
+    },
+    "assets": {
+        "spin_sound": "assets/spin_sound.wav",
+        "logo": "assets/logo.png",
+        "logo_size": 100,
+        "sprites": False,
+    },
+    "plugins": {
+        "load": [],  # "module:Class" of every plugin, see hooks.py
+        "max_ms": None,  # Plugins averaging more per call are disabled
+    },
+    "instrumentation": {
+        "enabled": False,  # Record frame timings of every spin (see instrument.py)
+        "hud": False,  # Show them on the wheel; F3 toggles it at run time
+        "frames": 2048,  # Frames kept in the ring buffer
+        "trace_dir": None,  # Directory for a trace file per spin, null for none
+        "trace_format": "csv",  # "csv" or "json"
+    },
+    "control": {
+        "enabled": False,  # JSON-lines control server for an operator console (see control.py)
+        "host": "127.0.0.1",  # "0.0.0.0" to accept consoles on other machines
+        "port": 8765,
+        "token": None,  # Shared secret clients send with "auth" first, null for none
+    },
+    "publish": {
+        "enabled": False,  # Wheel state in shared memory for mirror displays (see shared_state.py)
+        "name": "lucky_wheel",  # Shared memory block; stations add _1, _2, ...
+        "file": None,  # Map this file instead of a shared memory block, null for none
+    },
+}
+
+
+class ConfigError(ValueError):
+    """The wheel config is not valid; the message names the offending key."""
+
+
+class WheelPlan(namedtuple("WheelPlan", [
+    "segments", "labels", "weights", "wheel_presets", "wrap_presets",
+    "shuffle_pool", "shuffle_presets", "shuffle_rate",
+    "base_colors", "highlight_color", "wheel_margin",
+    "spin_rounds", "remove_winners", "seed",
+    "shuffle_screen", "confirm_number", "back_to_shuffle", "journal",
+    "spin_sound", "logo", "logo_size", "sprites",
+    "plugins", "plugin_max_ms",
+    "instrument", "hud", "trace_frames", "trace_dir", "trace_format",
+    "control", "control_host", "control_port", "control_token",
+    "publish", "publish_name", "publish_file",
+    "source_hash",
+])):
+    """Validated, immutable runtime form of a wheel config.
+
+    Asset paths are absolute (resolved against the config's directory, see
+    asset_path) and every list is a tuple, so a plan can be shared and
+    cached freely.
+    """
+
+    __slots__ = ()
+
+    def create_engine(self, streams=None):
+        return WheelEngine(
+            segments=self.segments,
+            shuffle_pool=self.shuffle_pool,
+            shuffle_presets=self.shuffle_presets,
+            wheel_presets=self.wheel_presets,
+            wrap_presets=self.wrap_presets,
+            seed=self.seed,
+            weights=self.weights,
+            without_replacement=self.remove_winners,
+            streams=streams,
+        )
+
+
+def section(config, name):
+    """A config section merged over its defaults; unknown keys are errors."""
+    values = config.get(name, {})
+    if not isinstance(values, dict):
+        raise ConfigError(f"{name}: must be an object")
+    unknown = set(values) - set(DEFAULTS[name])
+    if unknown:
+        raise ConfigError(f"{name}: unknown key {sorted(unknown)[0]!r}")
+    return {**DEFAULTS[name], **values}
+
+
+def int_list(values, key, low=None, high=None):
+    if not isinstance(values, list):
+        raise ConfigError(f"{key}: must be a list")
+    for i, value in enumerate(values):
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ConfigError(f"{key}[{i}]: must be an integer, not {value!r}")
+        if (low is not None and value < low) or (high is not None and value > high):
+            raise ConfigError(f"{key}[{i}]: {value} is outside {low}..{high}")
+    return tuple(values)
+
+
+def positive_number(value, key):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ConfigError(f"{key}: must be a positive number, not {value!r}")
+    return value
+
+
+def compile_plan(config, base_dir=".", source_hash=None):
+    """Validate a parsed config and compile it into a WheelPlan."""
+    if not isinstance(config, dict):
+        raise ConfigError("the config must be a JSON object")
+    unknown = set(config) - set(DEFAULTS)
+    if unknown:
+        raise ConfigError(f"unknown section {sorted(unknown)[0]!r}")
+
+    wheel = section(config, "wheel")
+    segments = wheel["segments"]
+    labels = None
+    weights = wheel["weights"]
+    if isinstance(segments, list):
+        labels = []
+        entry_weights = []
+        for i, entry in enumerate(segments):
+            if isinstance(entry, dict):
+                if "label" not in entry:
+                    raise ConfigError(f"wheel.segments[{i}]: needs a label")
+                labels.append(str(entry["label"]))
+                entry_weights.append(entry.get("weight", 1))
+            else:
+                labels.append(str(entry))
+                entry_weights.append(1)
+        if weights is None and any(w != 1 for w in entry_weights):
+            weights = entry_weights
+        segments = len(labels)
+    if isinstance(segments, bool) or not isinstance(segments, int) or segments < 1:
+        raise ConfigError(f"wheel.segments: must be a positive integer or a list, not {segments!r}")
+    if labels is None:
+        labels = [str(i + 1) for i in range(segments)]
+
+    if weights is not None:
+        if not isinstance(weights, list) or len(weights) != segments:
+            raise ConfigError(f"wheel.weights: needs one weight per segment ({segments})")
+        for i, weight in enumerate(weights):
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0:
+                raise ConfigError(f"wheel.weights[{i}]: must be a non-negative number, not {weight!r}")
+        if not sum(weights) > 0:
+            raise ConfigError("wheel.weights: at least one weight must be positive")
+        weights = tuple(float(weight) for weight in weights)
+
+    shuffle = section(config, "shuffle")
+    pool = shuffle["pool"]
+    if isinstance(pool, dict):
+        if set(pool) != {"range"}:
+            raise ConfigError("shuffle.pool: an object pool needs exactly a 'range' key")
+        bounds = int_list(pool["range"], "shuffle.pool.range")
+        if len(bounds) != 2:
+            raise ConfigError("shuffle.pool.range: must be [first, last]")
+        pool = range(bounds[0], bounds[1] + 1)
+    else:
+        pool = int_list(pool, "shuffle.pool")
+
+    theme = section(config, "theme")
+    base_colors = theme["base_colors"]
+    if not isinstance(base_colors, list) or not base_colors:
+        raise ConfigError("theme.base_colors: must be a non-empty list of colors")
+    colors = {f"theme.base_colors[{i}]": color for i, color in enumerate(base_colors)}
+    colors["theme.highlight_color"] = theme["highlight_color"]
+    for key, color in colors.items():
+        if not isinstance(color, str) or not COLOR.match(color):
+            raise ConfigError(f"{key}: must be a #rrggbb color, not {color!r}")
+
+    rounds = section(config, "rounds")
+    seed = rounds["seed"]
+    if seed is not None and not isinstance(seed, (int, str)):
+        raise ConfigError(f"rounds.seed: must be an integer, a string or null, not {seed!r}")
+    spin_rounds = rounds["spin_rounds"]
+    if isinstance(spin_rounds, bool) or not isinstance(spin_rounds, int) or spin_rounds < 0:
+        raise ConfigError(f"rounds.spin_rounds: must be a non-negative integer, not {spin_rounds!r}")
+
+    if rounds["shuffle_screen"] and not pool:
+        raise ConfigError("shuffle.pool: the shuffle screen needs numbers to draw "
+                          "(or set rounds.shuffle_screen to false)")
+    if rounds["remove_winners"] and len(set(pool)) != len(pool):
+        raise ConfigError("shuffle.pool: numbers must be unique when rounds.remove_winners is on")
+
+    journal = rounds["journal"]
+    if journal is not None and not isinstance(journal, str):
+        raise ConfigError(f"rounds.journal: must be a file name or null, not {journal!r}")
+
+    assets = section(config, "assets")
+    for key in ("spin_sound", "logo"):
+        if not isinstance(assets[key], str):
+            raise ConfigError(f"assets.{key}: must be a file name, not {assets[key]!r}")
+
+    plugins = section(config, "plugins")
+    if not isinstance(plugins["load"], list) or not all(isinstance(spec, str) for spec in plugins["load"]):
+        raise ConfigError("plugins.load: must be a list of \"module:Class\" strings")
+    max_ms = plugins["max_ms"]
+    if max_ms is not None:
+        max_ms = positive_number(max_ms, "plugins.max_ms")
+
+    instrumentation = section(config, "instrumentation")
+    frames = instrumentation["frames"]
+    if isinstance(frames, bool) or not isinstance(frames, int) or frames < 1:
+        raise ConfigError(f"instrumentation.frames: must be a positive integer, not {frames!r}")
+    trace_dir = instrumentation["trace_dir"]
+    if trace_dir is not None and not isinstance(trace_dir, str):
+        raise ConfigError(f"instrumentation.trace_dir: must be a directory or null, not {trace_dir!r}")
+    if instrumentation["trace_format"] not in ("csv", "json"):
+        raise ConfigError(f"instrumentation.trace_format: must be \"csv\" or \"json\", not {instrumentation['trace_format']!r}")
+
+    control = section(config, "control")
+    if not isinstance(control["host"], str):
+        raise ConfigError(f"control.host: must be a host name or address, not {control['host']!r}")
+    port = control["port"]
+    if isinstance(port, bool) or not isinstance(port, int) or not 0 <= port <= 65535:
+        raise ConfigError(f"control.port: must be a port number, not {port!r}")
+    token = control["token"]
+    if token is not None and not isinstance(token, str):
+        raise ConfigError(f"control.token: must be a string or null, not {token!r}")
+
+    publish = section(config, "publish")
+    if not isinstance(publish["name"], str) or not publish["name"] or "/" in publish["name"]:
+        raise ConfigError(f"publish.name: must be a name without slashes, not {publish['name']!r}")
+    if publish["file"] is not None and not isinstance(publish["file"], str):
+        raise ConfigError(f"publish.file: must be a file name or null, not {publish['file']!r}")
+
+    return WheelPlan(
+        segments=segments,
+        labels=tuple(labels),
+        weights=weights,
+        wheel_presets=int_list(wheel["presets"], "wheel.presets", high=segments),
+        wrap_presets=bool(wheel["wrap_presets"]),
+        shuffle_pool=tuple(pool),
+        shuffle_presets=int_list(shuffle["presets"], "shuffle.presets"),
+        shuffle_rate=positive_number(shuffle["rate"], "shuffle.rate"),
+        base_colors=tuple(base_colors),
+        highlight_color=theme["highlight_color"],
+        wheel_margin=int(positive_number(theme["wheel_margin"], "theme.wheel_margin")),
+        spin_rounds=spin_rounds,
+        remove_winners=bool(rounds["remove_winners"]),
+        seed=seed,
+        shuffle_screen=bool(rounds["shuffle_screen"]),
+        confirm_number=bool(rounds["confirm_number"]),
+        back_to_shuffle=bool(rounds["back_to_shuffle"]),
+        journal=asset_path(base_dir, journal) if journal is not None else None,
+        spin_sound=asset_path(base_dir, assets["spin_sound"]),
+        logo=asset_path(base_dir, assets["logo"]),
+        logo_size=int(positive_number(assets["logo_size"], "assets.logo_size")),
+        sprites=bool(assets["sprites"]),
+        plugins=tuple(plugins["load"]),
+        plugin_max_ms=max_ms,
+        instrument=bool(instrumentation["enabled"]),
+        hud=bool(instrumentation["hud"]),
+        trace_frames=frames,
+        trace_dir=asset_path(base_dir, trace_dir) if trace_dir is not None else None,
+        trace_format=instrumentation["trace_format"],
+        control=bool(control["enabled"]),
+        control_host=control["host"],
+        control_port=port,
+        control_token=token,
+        publish=bool(publish["enabled"]),
+        publish_name=publish["name"],
+        publish_file=asset_path(base_dir, publish["file"]) if publish["file"] is not None else None,
+        source_hash=source_hash,
+    )
+
+
+def load_plan(path, cache_dir=None):
+    """Load the config at path, compiling it only if no cached plan matches its content.
+
+    Compiled plans are pickled into cache_dir (default: .wheel_cache next to
+    the config) under the SHA-256 of the config bytes; only the newest
+    CACHE_ENTRIES are kept, so edits and PLAN_VERSION bumps do not pile up.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    base_dir = os.path.dirname(os.path.abspath(path))
+    digest = hashlib.sha256(b"%d\0%s\0" % (PLAN_VERSION, base_dir.encode()) + data).hexdigest()
+
+    if cache_dir is None:
+        cache_dir = os.path.join(base_dir, ".wheel_cache")
+    cache_path = os.path.join(cache_dir, digest + ".pickle")
+    try:
+        with open(cache_path, "rb") as f:
+            plan = pickle.load(f)
+        if isinstance(plan, WheelPlan) and plan.source_hash == digest:
+            return plan
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+        pass
+
+    try:
+        config = json.loads(data)
+    except ValueError as e:
+        raise ConfigError(f"{path}: {e}") from None
+    plan = compile_plan(config, base_dir, digest)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_atomic(cache_path, pickle.dumps(plan, protocol=pickle.HIGHEST_PROTOCOL))
+        prune_cache(cache_dir)
+    except OSError:  # A read-only install still works, it just compiles every time
+        pass
+    return plan
+
+
+def prune_cache(cache_dir, keep=CACHE_ENTRIES):
+    """Delete all but the keep most recently written plans of cache_dir."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pickle"):
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+            except OSError:  # Pruned by another station meanwhile
+                pass
+    entries.sort(reverse=True)
+    for _, path in entries[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+StationsConfig = namedtuple("StationsConfig", "configs plans columns toplevels")
+
+
+def load_stations(path):
+    """Load a multi-station file: {"stations": [config paths], "columns": n, "toplevels": bool}.
+
+    Config paths are relative to the stations file. Stations that would
+    share a journal or a fixed seed get their own (named after the station
+    number), so every wheel keeps its own results and random streams.
+    """
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except ValueError as e:
+        raise ConfigError(f"{path}: {e}") from None
+    if not isinstance(config, dict):
+        raise ConfigError("the stations file must be a JSON object")
+    unknown = set(config) - {"stations", "columns", "toplevels"}
+    if unknown:
+        raise ConfigError(f"unknown key {sorted(unknown)[0]!r}")
+    names = config.get("stations")
+    if not isinstance(names, list) or not names or not all(isinstance(name, str) for name in names):
+        raise ConfigError("stations: must be a non-empty list of config file names")
+    columns = config.get("columns")
+    if columns is not None:
+        columns = int(positive_number(columns, "columns"))
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    configs = [asset_path(base_dir, name) for name in names]
+    plans = []
+    journals = set()
+    seeds = set()
+    for number, config_path in enumerate(configs, 1):
+        try:
+            plan = load_plan(config_path)
+        except ConfigError as e:
+            raise ConfigError(f"{config_path}: {e}") from None
+        if plan.journal is not None:
+            if plan.journal in journals:
+                root, ext = os.path.splitext(plan.journal)
+                plan = plan._replace(journal=f"{root}-{number}{ext}")
+            journals.add(plan.journal)
+        if plan.seed is not None:
+            if plan.seed in seeds:
+                plan = plan._replace(seed=f"{plan.seed}:station{number}")
+            seeds.add(plan.seed)
+        plans.append(plan)
+    return StationsConfig(tuple(configs), tuple(plans), columns, bool(config.get("toplevels", False)))
+
+
+class ConfigWatcher:
+    """Polls the config file with after() and hands every valid new plan to callback.
+
+    An invalid edit is reported and ignored, the running plan stays. Edits
+    of sections a running station cannot switch to (RESTART_KEYS) are
+    reported as needing a restart.
+    """
+
+    def __init__(self, master, path, callback, interval=0.5):
+        self.master = master
+        self.path = path
+        self.callback = callback
+        self.interval_ms = max(1, round(interval * 1000))
+        self.signature = self.stat()
+        try:
+            self.plan = load_plan(path)  # What the file said last, from the plan cache
+        except (ConfigError, OSError):
+            self.plan = None
+        self.job = self.master.after(self.interval_ms, self.poll)
+
+    def stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self):
+        self.job = self.master.after(self.interval_ms, self.poll)
+        signature = self.stat()
+        if signature is None or signature == self.signature:
+            return
+        self.signature = signature
+        try:
+            plan = load_plan(self.path)
+        except (ConfigError, OSError) as e:
+            print(f"config not reloaded: {e}")
+            return
+        if self.plan is not None:
+            changed = [key for field, key in RESTART_KEYS.items() if getattr(plan, field) != getattr(self.plan, field)]
+            if changed:
+                print(f"config reloaded, but {', '.join(dict.fromkeys(changed))} only change on a restart")
+        self.plan = plan
+        self.callback(plan)
+
+    def cancel(self):
+        if self.job is not None:
+            self.master.after_cancel(self.job)
+        self.job = None
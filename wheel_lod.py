@@ -0,0 +1,242 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # The large wheel still works without NumPy, only slower
+    np = None
+
+from wheel_scene import WheelScene, arc_boundaries
+
+# Wheels with more segments than this use the level-of-detail scene
+LARGE_WHEEL_SEGMENTS = 120
+
+
+def create_scene(canvas, segments, image=None, label_offset=30, sprites=False, labels=None):
+    """Scene suited to the number of segments on the wheel.
+
+    With sprites=True the wheel is rasterized off-screen with PIL and shown
+    as a single cached image per frame. labels are the segment texts,
+    "1", "2", ... by default.
+    """
+    if sprites:
+        from sprite_cache import SpriteWheelScene  # Only the sprite renderer needs ImageDraw
+        return SpriteWheelScene(canvas, segments, image, label_offset, labels=labels)
+    if segments > LARGE_WHEEL_SEGMENTS:
+        return LodWheelScene(canvas, segments, image, label_offset, labels=labels)
+    return WheelScene(canvas, segments, image, label_offset, labels)
+
+
+class LodWheelScene:
+    """Level-of-detail drawing for wheels with thousands of segments.
+
+    Neighbouring segments narrower than min_segment_px are merged into one
+    polygon per bucket, and a bucket takes the color of its newest trail
+    segment. Only a small pool of labels is kept, placed around the current
+    segment and spaced so they stay readable. Per-frame work is a handful
+    of array operations plus one itemconfig per bucket whose color changed.
+    """
+
+    TAG = "wheel"
+
+    def __init__(self, canvas, segments, image=None, label_offset=30,
+                 min_segment_px=3, arc_step_px=8, label_pool=7, min_label_px=36, labels=None):
+        self.canvas = canvas
+        self.segments = segments
+        self.image = image
+        self.label_offset = label_offset
+        self.min_segment_px = min_segment_px
+        self.arc_step_px = arc_step_px
+        self.label_count = label_pool
+        self.texts = list(labels) if labels is not None else [str(i + 1) for i in range(segments)]
+        self.min_label_px = min_label_px
+        self.extents = None  # Per-segment arc extents of a weighted wheel
+
+        self.geometry = None
+        self.bucket_size = 1
+        self.buckets = 0
+        self.bucket_ids = []
+        self.label_ids = []
+        self.image_id = None
+
+        # Fill last pushed to each bucket polygon
+        self.fills = []
+        self.drawn_labels = []
+        self.color_tables = None
+        self.color_tables_for = None
+
+    def layout(self, center_x, center_y, radius, angle_offset=0):
+        """Build the bucket polygons and label pool for this geometry."""
+        geometry = (center_x, center_y, radius, angle_offset)
+        if geometry == self.geometry:
+            return False
+
+        self.canvas.delete(self.TAG)
+        self.geometry = geometry
+
+        # Merge segments until a bucket is at least min_segment_px wide on the rim
+        segment_px = 2 * math.pi * max(radius, 1) / self.segments
+        self.bucket_size = max(1, math.ceil(self.min_segment_px / segment_px))
+        self.buckets = math.ceil(self.segments / self.bucket_size)
+        self.segment_px = segment_px
+
+        points = max(1, math.ceil(segment_px * self.bucket_size / self.arc_step_px))
+        outline = "black" if segment_px * self.bucket_size >= 6 else ""
+        self.bucket_ids = [
+            self.canvas.create_polygon(*coords, fill="", outline=outline, tags=self.TAG)
+            for coords in self.bucket_coords(center_x, center_y, radius, angle_offset, points)
+        ]
+
+        if self.image is not None:
+            self.image_id = self.canvas.create_image(center_x, center_y, image=self.image, tags=self.TAG)
+
+        self.label_ids = [
+            self.canvas.create_text(center_x, center_y, text="", state="hidden", tags=self.TAG)
+            for _ in range(self.label_count)
+        ]
+        self.drawn_labels = [None] * self.label_count
+        self.fills = [None] * self.buckets
+        return True
+
+    def bucket_coords(self, center_x, center_y, radius, angle_offset, points):
+        """Polygon coordinates (center, then points along the rim) of every bucket."""
+        boundaries = arc_boundaries(self.segments, self.extents)
+        size = self.bucket_size
+
+        if np is not None:
+            starts = np.arange(self.buckets) * size
+            ends = np.minimum(starts + size, self.segments)
+            steps = np.linspace(0, 1, points + 1)
+            edges = np.asarray(boundaries)
+            first = edges[starts][:, None]
+            angles = np.radians(angle_offset + first + (edges[ends][:, None] - first) * steps)
+            coords = np.empty((self.buckets, points + 2, 2))
+            coords[:, 0] = (center_x, center_y)
+            coords[:, 1:, 0] = center_x + radius * np.cos(angles)
+            coords[:, 1:, 1] = center_y - radius * np.sin(angles)
+            return coords.reshape(self.buckets, -1).tolist()
+
+        all_coords = []
+        for b in range(self.buckets):
+            start = b * size
+            end = min(start + size, self.segments)
+            first = boundaries[start]
+            span = boundaries[end] - first
+            coords = [center_x, center_y]
+            for k in range(points + 1):
+                angle = math.radians(angle_offset + first + span * k / points)
+                coords.append(center_x + radius * math.cos(angle))
+                coords.append(center_y - radius * math.sin(angle))
+            all_coords.append(coords)
+        return all_coords
+
+    def draw(self, palette, trail, current_segment, label_style, current_label_style):
+        """Recolor the buckets whose style changed and place the labels."""
+        if self.geometry is None:
+            return 0
+
+        # Style code per bucket: a trail position, base_code or highlight_code
+        base_code = palette.trail_length
+        highlight_code = base_code + 1
+        if self.color_tables_for is not palette.trail_colors:
+            # Per base color: trail positions, then the base and highlight colors
+            self.color_tables = [
+                row + (base, palette.highlight_color)
+                for row, base in zip(palette.trail_colors, palette.base_colors)
+            ]
+            self.color_tables_for = palette.trail_colors
+
+        codes = self.bucket_codes(trail, base_code)
+        last_segment = trail.last
+        if last_segment is not None:
+            codes[last_segment // self.bucket_size] = highlight_code
+
+        # Many trail positions share a color once the dimming saturates, so
+        # compare the resolved colors rather than the codes
+        calls = 0
+        color_tables = self.color_tables
+        drawn = self.fills
+        for b, code in enumerate(codes):
+            fill = color_tables[b % len(color_tables)][code]
+            if drawn[b] != fill:
+                self.canvas.itemconfig(self.bucket_ids[b], fill=fill)
+                drawn[b] = fill
+                calls += 1
+
+        return calls + self.draw_labels(current_segment, label_style, current_label_style)
+
+    def bucket_codes(self, trail, base_code):
+        """Newest trail position per bucket, or base_code for buckets not in the trail."""
+        start = trail.start
+        size = self.bucket_size
+
+        if np is not None:
+            pushed = np.frombuffer(trail.pushed, dtype=np.int64)
+            positions = np.full(self.buckets * size, -1, dtype=np.int64)
+            positions[:self.segments] = pushed - start
+            newest = positions.reshape(self.buckets, size).max(axis=1)
+            return np.where(newest >= 0, newest, base_code).tolist()
+
+        codes = [base_code] * self.buckets
+        pushed = trail.pushed
+        for i in range(self.segments):
+            position = pushed[i] - start
+            if position >= 0:
+                b = i // size
+                if codes[b] == base_code or position > codes[b]:
+                    codes[b] = position
+        return codes
+
+    def draw_labels(self, current_segment, label_style, current_label_style):
+        """Labels for the current segment and evenly spaced neighbours."""
+        center_x, center_y, radius, angle_offset = self.geometry
+        boundaries = arc_boundaries(self.segments, self.extents)
+        spacing = max(1, math.ceil(self.min_label_px / self.segment_px))
+        half = self.label_count // 2
+
+        calls = 0
+        for slot in range(self.label_count):
+            offset = (slot - half) * spacing
+            if abs(offset) * 2 >= self.segments and offset != 0:
+                label = None
+            else:
+                segment = (current_segment + offset) % self.segments
+                font, text_color = current_label_style if offset == 0 else label_style
+                label = (segment, font, text_color)
+
+            if label == self.drawn_labels[slot]:
+                continue
+            self.drawn_labels[slot] = label
+            calls += 1
+
+            item = self.label_ids[slot]
+            if label is None:
+                self.canvas.itemconfig(item, state="hidden")
+                continue
+
+            segment, font, text_color = label
+            text_angle = math.radians((boundaries[segment] + boundaries[segment + 1]) / 2 + angle_offset)
+            x = center_x + (radius + self.label_offset) * math.cos(text_angle)
+            y = center_y - (radius + self.label_offset) * math.sin(text_angle)
+            self.canvas.coords(item, x, y)
+            self.canvas.itemconfig(item, text=self.texts[segment], font=font, fill=text_color, state="normal")
+        return calls
+
+    def set_extents(self, extents):
+        """Use new per-segment arc extents (None for equal arcs) from the next layout on."""
+        extents = tuple(extents) if extents is not None else None
+        if extents != self.extents:
+            self.extents = extents
+            self.invalidate()
+        return 0
+
+    def set_image(self, image):
+        """Show image (the logo) in the center; it may arrive after the first layout."""
+        self.image = image
+        if self.image_id is not None:
+            self.canvas.itemconfig(self.image_id, image=image)
+        else:
+            self.invalidate()  # It goes between the arcs and the labels
+
+    def invalidate(self):
+        """Forget the current geometry so the next layout rebuilds every item."""
+        self.geometry = None
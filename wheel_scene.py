@@ -0,0 +1,206 @@
+import math
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def arc_boundaries(segments, extents=None):
+    """Angle where every segment starts, plus 360 at the end, before the angle offset.
+
+    extents gives the arc of every segment in degrees (weighted wheels);
+    without it all segments are equally wide.
+    """
+    if extents is None:
+        angle_per_segment = 360 / segments
+        return tuple(i * angle_per_segment for i in range(segments + 1))
+    boundaries = [0.0]
+    for extent in extents:
+        boundaries.append(boundaries[-1] + extent)
+    return tuple(boundaries)
+
+
+@lru_cache(maxsize=32)
+def segment_layout(segments, center_x, center_y, radius, angle_offset=0, label_offset=30, extents=None):
+    """Arc bounding box, start angles, extents and label positions of every segment.
+
+    Cached per geometry, so going back to a size seen before is free.
+    """
+    boundaries = arc_boundaries(segments, extents)
+    bbox = (center_x - radius, center_y - radius, center_x + radius, center_y + radius)
+    start_angles = tuple(angle + angle_offset for angle in boundaries[:-1])
+    if extents is None:
+        extents = (360 / segments,) * segments
+
+    label_positions = []
+    for start_angle, extent in zip(start_angles, extents):
+        text_angle = math.radians(start_angle + extent / 2)
+        label_positions.append((
+            center_x + (radius + label_offset) * math.cos(text_angle),
+            center_y - (radius + label_offset) * math.sin(text_angle),
+        ))
+    return bbox, start_angles, extents, tuple(label_positions)
+
+
+class WheelScene:
+    """Retained-mode drawing of the wheel.
+
+    The arc, label and logo items are created once per geometry and their
+    item IDs are kept. After that, a frame only restyles the segments whose
+    fill or label actually changed, so a frame where two segments change
+    costs about two Tk calls instead of recreating every item.
+    """
+
+    TAG = "wheel"
+
+    def __init__(self, canvas, segments, image=None, label_offset=30, labels=None):
+        self.canvas = canvas
+        self.segments = segments
+        self.image = image
+        self.label_offset = label_offset
+        self.texts = list(labels) if labels is not None else [str(i + 1) for i in range(segments)]
+        self.extents = None  # Per-segment arc extents of a weighted wheel
+
+        # Item IDs, one per segment, valid for the current geometry
+        self.arc_ids = []
+        self.text_ids = []
+        self.image_id = None
+        self.geometry = None
+
+        # Last style pushed to Tk and the style wanted for the next flush
+        self.drawn_fills = [None] * segments
+        self.drawn_labels = [None] * segments
+        self.fills = [None] * segments
+        self.labels = [None] * segments
+        self.dirty = set()
+
+    def layout(self, center_x, center_y, radius, angle_offset=0):
+        """Build the items for this geometry, reusing them if nothing moved."""
+        geometry = (center_x, center_y, radius, angle_offset)
+        if geometry == self.geometry:
+            return False
+
+        self.canvas.delete(self.TAG)
+        self.geometry = geometry
+        self.arc_ids = []
+        self.text_ids = []
+
+        bbox, start_angles, extents, label_positions = segment_layout(
+            self.segments, center_x, center_y, radius, angle_offset, self.label_offset, self.extents
+        )
+
+        # Segments without an arc (prizes already drawn) are hidden
+        states = ["normal" if extent else "hidden" for extent in extents]
+        for i in range(self.segments):
+            self.arc_ids.append(self.canvas.create_arc(
+                *bbox, start=start_angles[i], extent=extents[i],
+                fill=self.fills[i] or "", state=states[i], tags=self.TAG
+            ))
+
+        # The logo sits above the arcs and below the labels, as before
+        if self.image is not None:
+            self.image_id = self.canvas.create_image(center_x, center_y, image=self.image, tags=self.TAG)
+
+        for i, (x, y) in enumerate(label_positions):
+            text, font, fill = self.labels[i] or (self.texts[i], None, "gray")
+            options = {"text": text, "fill": fill, "state": states[i], "tags": self.TAG}
+            if font is not None:
+                options["font"] = font
+            self.text_ids.append(self.canvas.create_text(x, y, **options))
+
+        # Everything was just created with the wanted style
+        self.drawn_fills = list(self.fills)
+        self.drawn_labels = list(self.labels)
+        self.dirty.clear()
+        return True
+
+    def set_extents(self, extents):
+        """Resize the arcs to new per-segment extents (None for equal arcs).
+
+        The existing items are moved in place; only arcs and labels whose
+        position changed cost a Tk call. Returns the number of calls.
+        """
+        extents = tuple(extents) if extents is not None else None
+        if extents == self.extents:
+            return 0
+        old_extents, self.extents = self.extents, extents
+        if self.geometry is None:
+            return 0
+
+        geometry = (self.segments, *self.geometry, self.label_offset)
+        _, old_starts, old_arcs, old_labels = segment_layout(*geometry, old_extents)
+        _, starts, arcs, labels = segment_layout(*geometry, extents)
+
+        calls = 0
+        for i in range(self.segments):
+            if starts[i] != old_starts[i] or arcs[i] != old_arcs[i]:
+                state = "normal" if arcs[i] else "hidden"
+                self.canvas.itemconfig(self.arc_ids[i], start=starts[i], extent=arcs[i], state=state)
+                calls += 1
+                if bool(arcs[i]) != bool(old_arcs[i]):
+                    self.canvas.itemconfig(self.text_ids[i], state=state)
+                    calls += 1
+            if labels[i] != old_labels[i]:
+                self.canvas.coords(self.text_ids[i], *labels[i])
+                calls += 1
+        return calls
+
+    def draw(self, palette, trail, current_segment, label_style, current_label_style):
+        """Restyle every segment from the trail and push the changes to Tk."""
+        trail_colors = palette.trail_colors
+        base_colors = palette.base_colors
+        highlight_color = palette.highlight_color
+        trail_position = trail.position
+        last_segment = trail.last
+
+        for i in range(self.segments):
+            # Apply the trail effect: previous segments use the dimmed brightened color
+            trail_index = trail_position(i)
+            if i == last_segment:  # Highlight the current segment
+                color = highlight_color
+            elif trail_index >= 0:
+                color = trail_colors[i % len(trail_colors)][trail_index]
+            else:
+                color = base_colors[i % len(base_colors)]
+
+            font, text_color = current_label_style if i == current_segment else label_style
+            self.style(i, color, self.texts[i], font, text_color)
+
+        return self.flush()
+
+    def style(self, i, fill, text, font, text_color):
+        """Set the wanted style of segment i, marking it dirty if it changed."""
+        label = (text, font, text_color)
+        if self.fills[i] != fill or self.labels[i] != label:
+            self.fills[i] = fill
+            self.labels[i] = label
+            self.dirty.add(i)
+
+    def flush(self):
+        """Push the dirty segments to the canvas. Returns the number of Tk calls."""
+        if self.geometry is None:
+            return 0
+
+        calls = 0
+        for i in self.dirty:
+            if self.drawn_fills[i] != self.fills[i]:
+                self.canvas.itemconfig(self.arc_ids[i], fill=self.fills[i])
+                self.drawn_fills[i] = self.fills[i]
+                calls += 1
+            if self.drawn_labels[i] != self.labels[i]:
+                text, font, fill = self.labels[i]
+                self.canvas.itemconfig(self.text_ids[i], text=text, font=font, fill=fill)
+                self.drawn_labels[i] = self.labels[i]
+                calls += 1
+        self.dirty.clear()
+        return calls
+
+    def set_image(self, image):
+        """Show image (the logo) in the center; it may arrive after the first layout."""
+        self.image = image
+        if self.image_id is not None:
+            self.canvas.itemconfig(self.image_id, image=image)
+        else:
+            self.invalidate()  # It goes between the arcs and the labels
+
+    def invalidate(self):
+        """Forget the current geometry so the next layout rebuilds every item."""
+        self.geometry = None